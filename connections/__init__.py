@@ -1,14 +1,50 @@
+import importlib
+
 from connections.connections_factory import ConnectionsFactory
 from connections.connections_parser import ConnectionsConfigurationParser
-from connections.my_sql_connection import MySQLConnection
-from connections.redis_connection import RedisConnection
+
+# Public names re-exported by the package. They're imported on first access (PEP 562), so importing the package
+# doesn't import SQLAlchemy, redis or pymongo until a connection class that needs them is used.
+_LAZY_EXPORTS = {
+    'ConnectionResult': 'connections.connections_connector',
+    'connect_all': 'connections.connections_connector',
+    'HealthMonitor': 'connections.health_monitor',
+    'HealthStatus': 'connections.health_monitor',
+    'MySQLConnection': 'connections.my_sql_connection',
+    'RedisConnection': 'connections.redis_connection',
+    'AsyncMySQLConnection': 'connections.async_my_sql_connection',
+    'AsyncPostgreConnection': 'connections.async_postgres_connection',
+    'AsyncSQLiteConnection': 'connections.async_sqlite_connection',
+    'AsyncRedisConnection': 'connections.async_redis_connection',
+    'AsyncMongoDBConnection': 'connections.async_mongo_db_connection',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
+
 
 # Initialize a factory
 factory = ConnectionsFactory()
 
-# Register types
-factory.register_type('mysql', MySQLConnection)
-factory.register_type('redis', RedisConnection)
+# Register types - the connection classes are imported when the first connection of their type is created
+factory.register_type('mysql', 'connections.my_sql_connection.MySQLConnection')
+factory.register_type('redis', 'connections.redis_connection.RedisConnection')
+factory.register_type('async_mysql', 'connections.async_my_sql_connection.AsyncMySQLConnection')
+factory.register_type('async_postgres', 'connections.async_postgres_connection.AsyncPostgreConnection')
+factory.register_type('async_sqlite', 'connections.async_sqlite_connection.AsyncSQLiteConnection')
+factory.register_type('async_redis', 'connections.async_redis_connection.AsyncRedisConnection')
+factory.register_type('async_mongodb', 'connections.async_mongo_db_connection.AsyncMongoDBConnection')
 
 # Initialize an yaml configuration parser
 parser = ConnectionsConfigurationParser(factory)
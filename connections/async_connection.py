@@ -0,0 +1,46 @@
+from abc import ABC
+
+
+class AsyncConnection(ABC):
+    """
+    AsyncConnection is a mixin for connections whose connect, disconnect and health check methods are coroutines.
+
+    It replaces the synchronous context manager protocol of Connection with the asynchronous one, so instances are
+    used with Python's async with statement:
+
+        async with AsyncMySQLConnection(...) as connection:
+            ...
+
+    It must be listed before the synchronous connection class in the bases of a concrete async connection.
+    """
+
+    async def __aenter__(self):
+        """Open the connection when entering an async with statement."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close the connection when exiting an async with statement."""
+        await self.disconnect()
+
+    async def check_health(self):
+        """
+        Check whether the connection is healthy. Async connections always probe, they aren't monitored.
+
+        Returns:
+        - True if the connection is healthy, False otherwise.
+        """
+        return await self.probe_health()
+
+    def __enter__(self):
+        raise TypeError(f"{type(self).__name__} is asynchronous, use 'async with' instead of 'with'.")
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def __del__(self):
+        """
+        Async connections can't be closed from a finalizer, as no event loop is guaranteed to be running.
+        They must be closed explicitly with disconnect() or an async with statement.
+        """
+        pass
@@ -0,0 +1,47 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+
+from connections.async_connection import AsyncConnection
+from connections.mongo_db_connection import MongoDBConnection
+
+
+class AsyncMongoDBConnection(AsyncConnection, MongoDBConnection):
+    """
+    AsyncMongoDBConnection is a concrete asyncio connection to a MongoDB database, using the Motor driver.
+
+    It's configured exactly like MongoDBConnection (see MongoDBConnection.MongoDBConfigKeys).
+
+    Attributes:
+    - _connection_engine: An AsyncIOMotorClient object representing the connection to the MongoDB database.
+
+    The following methods are implemented in this class:
+    - connect: Opens the connection to the MongoDB database (coroutine).
+    - disconnect: Closes the connection to the MongoDB database (coroutine).
+    - probe_health: Checks whether the connection to the MongoDB database is healthy (coroutine).
+    """
+
+    async def connect(self):
+        """
+        Opens the connection to the MongoDB database using the configuration provided during instantiation.
+        """
+        self._connection_engine = AsyncIOMotorClient(self.create_connection_string())
+
+    async def disconnect(self):
+        """
+        Closes the connection to the MongoDB database.
+        """
+        if self._connection_engine is not None:
+            self._connection_engine.close()
+
+    async def probe_health(self):
+        """
+        Checks whether the connection to the MongoDB database is healthy.
+
+        Returns:
+        - A boolean value representing the health of the connection. True indicates a healthy connection.
+        """
+        try:
+            await self._connection_engine.admin.command('ping')
+            return True
+        except PyMongoError:
+            return False
@@ -0,0 +1,28 @@
+from connections.async_sql_connection import AsyncSQLConnection
+from connections.my_sql_connection import MySQLConnection
+
+
+class AsyncMySQLConnection(AsyncSQLConnection, MySQLConnection):
+    """
+    AsyncMySQLConnection is a concrete asyncio connection to a MySQL database, using the aiomysql driver.
+
+    It's configured exactly like MySQLConnection (see MySQLConnection.MySQLConfigKeys).
+
+    The following methods are implemented in this class:
+    - create_connection_string: Returns the connection string for connecting to the MySQL database with aiomysql.
+    """
+
+    def create_connection_string(self, host=None, port=None):
+        """
+        Create the connection string for connecting to the MySQL database with aiomysql.
+
+        Args:
+        - host: (Optional) The host to connect to. Defaults to the primary's host.
+        - port: (Optional) The port to connect to. Defaults to the primary's port.
+
+        Returns:
+        - The connection string.
+        """
+        host = host or self._host
+        port = port or self._port
+        return f"mysql+aiomysql://{self._username}:{self._password}@{host}:{port}/{self._database}"
@@ -0,0 +1,28 @@
+from connections.async_sql_connection import AsyncSQLConnection
+from connections.postgres_connection import PostgreConnection
+
+
+class AsyncPostgreConnection(AsyncSQLConnection, PostgreConnection):
+    """
+    AsyncPostgreConnection is a concrete asyncio connection to a PostgreSQL database, using the asyncpg driver.
+
+    It's configured exactly like PostgreConnection (see PostgreConnection.PostgreSQLConfigKeys).
+
+    The following methods are implemented in this class:
+    - create_connection_string: Returns the connection string for connecting to the PostgreSQL database with asyncpg.
+    """
+
+    def create_connection_string(self, host=None, port=None):
+        """
+        Create the connection string for connecting to the PostgreSQL database with asyncpg.
+
+        Args:
+        - host: (Optional) The host to connect to. Defaults to the primary's host.
+        - port: (Optional) The port to connect to. Defaults to the primary's port.
+
+        Returns:
+        - The connection string.
+        """
+        host = host or self._host
+        port = port or self._port
+        return f"postgresql+asyncpg://{self._username}:{self._password}@{host}:{port}/{self._database}"
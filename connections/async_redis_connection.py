@@ -0,0 +1,76 @@
+from redis.asyncio import BlockingConnectionPool, ConnectionPool, Redis, SSLConnection
+
+from connections.async_connection import AsyncConnection
+from connections.redis_connection import RedisConnection
+
+
+class AsyncRedisConnection(AsyncConnection, RedisConnection):
+    """
+    AsyncRedisConnection is a concrete asyncio connection to a Redis database, built on redis.asyncio.
+
+    It's configured exactly like RedisConnection (see RedisConnection.RedisConfigKeys), including the shared
+    connection pool settings.
+
+    The following methods are implemented in this class:
+    - connect: Opens the connection to the Redis database (coroutine).
+    - disconnect: Closes the connection to the Redis database (coroutine).
+    - probe_health: Checks whether the connection to the Redis database is healthy (coroutine).
+    - pool_stats: Returns the connection pool usage statistics.
+    """
+
+    client_class = Redis
+    connection_pool_class = ConnectionPool
+    blocking_connection_pool_class = BlockingConnectionPool
+    ssl_connection_class = SSLConnection
+
+    async def connect(self, **connection_addit_kwargs):
+        """
+        Open the connection to the Redis database.
+
+        The connection pool is created on the first call and reused afterwards.
+
+        Args:
+        - connection_addit_kwargs: (Optional) Additional keyword arguments passed to the connection pool.
+        """
+        # Creating the pool doesn't perform any I/O, the connections are opened on first use.
+        super().connect(**connection_addit_kwargs)
+
+    async def disconnect(self):
+        """
+        Close the connection to the Redis database.
+        """
+        if self._connection_pool:
+            await self._connection_pool.disconnect()
+
+    async def probe_health(self):
+        """
+        Check whether the connection to the Redis database is healthy.
+
+        Returns:
+        - True if the connection is healthy, False otherwise.
+        """
+        try:
+            await self._connection_engine.ping()
+            return True
+        except Exception:
+            return False
+
+    def pool_stats(self):
+        """
+        Get the connection pool usage statistics.
+
+        Returns:
+        - A dictionary with the pool's max connections, and the created, in-use and available connection counts.
+        """
+        pool = self._connection_pool
+        if pool is None:
+            return {'max_connections': self._max_connections, 'created': 0, 'in_use': 0, 'available': 0}
+
+        in_use = len(pool._in_use_connections)
+        available = len(pool._available_connections)
+        return {
+            'max_connections': pool.max_connections,
+            'created': in_use + available,
+            'in_use': in_use,
+            'available': available,
+        }
@@ -0,0 +1,135 @@
+import asyncio
+import ssl
+from abc import ABC
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.automap import automap_base
+from sqlalchemy.orm import sessionmaker
+
+from connections.async_connection import AsyncConnection
+from connections.sql_connection import SQLConnection
+
+
+class AsyncSQLConnection(AsyncConnection, SQLConnection, ABC):
+    """
+    AsyncSQLConnection is an abstract base class that represents an asyncio connection to a SQL database, built on
+    SQLAlchemy's asyncio engine.
+
+    It shares its configuration (pool settings, reflection cache, lazy reflection) with SQLConnection. Concrete
+    classes combine it with the matching synchronous connection class and return an async driver URL from
+    create_connection_string.
+
+    Attributes:
+    - _async_reflection_lock: An asyncio lock serializing the lazy reflection of tables.
+
+    The following methods are implemented in this class:
+    - connect: Opens the connection to the database (coroutine).
+    - disconnect: Closes the connection to the database (coroutine).
+    - probe_health: Checks whether the connection to the database is healthy (coroutine).
+    - get_model: Returns the model mapped to a table (coroutine).
+    - get_new_session: Returns a new SQLAlchemy AsyncSession, bound to a read replica for read-only sessions.
+    - create_all_user_defined_models: Creates tables for all user-defined models (coroutine).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._async_reflection_lock = None
+
+    def _create_engine(self, host=None, port=None):
+        """
+        Create a SQLAlchemy asyncio engine, including SSL configuration if applicable.
+
+        The async drivers (aiomysql, asyncpg) expect an SSLContext, which is built from the configured SSL files.
+
+        Args:
+        - host: (Optional) The host to connect to, e.g. a read replica's. Defaults to the primary's host.
+        - port: (Optional) The port to connect to. Defaults to the primary's port.
+
+        Returns:
+        - The SQLAlchemy AsyncEngine.
+        """
+        connect_args = {}
+        if self._ssl:
+            ssl_context = ssl.create_default_context(cafile=self._ssl_ca_certs)
+            ssl_context.load_cert_chain(certfile=self._ssl_certfile_path, keyfile=self._ssl_keyfile_path)
+            connect_args['ssl'] = ssl_context
+
+        return create_async_engine(self.create_connection_string(host, port), connect_args=connect_args,
+                                   **self._pool_args(poolclass=None))
+
+    async def connect(self):
+        """
+        Open the connection to the SQL database, and to its read replicas if any are configured.
+        """
+        self._connection_engine = self._create_engine()
+        self._connect_replicas()
+        self._session_maker = sessionmaker(bind=self._connection_engine, class_=AsyncSession,
+                                           expire_on_commit=False)
+        self._async_reflection_lock = asyncio.Lock()
+
+        if self._lazy_reflection:
+            self._initiate_lazy_base_model()
+        else:
+            async with self._connection_engine.connect() as connection:
+                metadata = await connection.run_sync(self._reflect_metadata)
+
+            self._automap_base_model = automap_base(metadata=metadata)
+            self._automap_base_model.prepare()
+
+    async def get_model(self, table_name):
+        """
+        Get the SQLAlchemy model for the given table name, reflecting the table on first use in lazy mode.
+
+        Args:
+        - table_name: The name of the table.
+
+        Returns:
+        - The SQLAlchemy model for the table, or None if no such table exists or it has no primary key.
+        """
+        if not self._lazy_reflection:
+            return self._automap_base_model.classes.get(table_name)
+
+        model = self._lazy_models.get(table_name)
+        if model is not None:
+            return model
+
+        async with self._async_reflection_lock:
+            model = self._lazy_models.get(table_name)
+            if model is None:
+                async with self._connection_engine.connect() as connection:
+                    model = await connection.run_sync(
+                        lambda sync_connection: self._reflect_model(table_name, sync_connection))
+                if model is not None:
+                    self._lazy_models[table_name] = model
+            return model
+
+    async def create_all_user_defined_models(self):
+        """
+        Create tables for all user-defined models that have been registered.
+        """
+        async with self._connection_engine.begin() as connection:
+            await connection.run_sync(self._declarative_base_model.metadata.create_all)
+
+    async def disconnect(self):
+        """
+        Close the connection to the SQL database, closing all pooled connections of the primary and the replicas.
+        """
+        if self._connection_engine is not None:
+            await self._connection_engine.dispose()
+        for replica_engine in self._replica_engines:
+            await replica_engine.dispose()
+
+    async def probe_health(self):
+        """
+        Check whether the connection to the SQL database is healthy.
+
+        Returns:
+        - True if the connection is healthy, False otherwise.
+        """
+        try:
+            async with self._connection_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+            return True
+        except exc.DBAPIError:
+            return False
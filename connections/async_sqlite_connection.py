@@ -0,0 +1,80 @@
+from connections.async_sql_connection import AsyncSQLConnection
+from connections.connection import Connection
+
+
+class AsyncSQLiteConnection(AsyncSQLConnection):
+    """
+    AsyncSQLiteConnection is a concrete asyncio connection to a SQLite database file, using the aiosqlite driver.
+
+    It's mostly meant for running the asyncio stack locally, without a database server.
+
+    Attributes:
+    - _database: A string representing the path of the database file, or ':memory:'.
+
+    The following methods are implemented in this class:
+    - from_config: A class method that creates an instance of AsyncSQLiteConnection from a configuration dictionary.
+    - create_connection_string: Returns the connection string for connecting to the SQLite database with aiosqlite.
+    """
+
+    class SQLiteConfigKeys(Connection.ConfigKeys):
+        NAME = 'name'
+        DATABASE = 'database'
+        REFLECTION = 'reflection'
+        REFLECTION_CACHE_DIRECTORY = 'cache_directory'
+        REFLECTION_LAZY = 'lazy'
+
+        @classmethod
+        def optional_keys(cls):
+            return [cls.REFLECTION.value, cls.REFLECTION_CACHE_DIRECTORY.value, cls.REFLECTION_LAZY.value]
+
+        @classmethod
+        def required_keys(cls):
+            return [member.value for member in cls if member.value not in cls.optional_keys()]
+
+    def __init__(self, name, database, reflection_cache_directory=None, lazy_reflection=False):
+        super().__init__(name, None, None, database, None, None,
+                         reflection_cache_directory=reflection_cache_directory, lazy_reflection=lazy_reflection)
+
+    @classmethod
+    def from_dict(cls, config):
+        """
+        Create an instance of AsyncSQLiteConnection from a configuration dictionary.
+
+        Args:
+        - config: A dictionary containing the configuration parameters.
+
+        Returns:
+        - An instance of AsyncSQLiteConnection.
+
+        Raises:
+        - MissingConfigurationKey: If any required configuration keys are missing.
+        """
+
+        # Initiate config keys class
+        required_config_keys = cls.SQLiteConfigKeys.required_keys()
+
+        # Validate configuration keys
+        cls.validate_dict_keys(config, required_config_keys)
+
+        # Extract the keys specific to SQLite from the config
+        reflection_config = config.get(cls.SQLiteConfigKeys.REFLECTION.value, {})
+        return cls(
+            config[cls.SQLiteConfigKeys.NAME.value],
+            config[cls.SQLiteConfigKeys.DATABASE.value],
+            reflection_config.get(cls.SQLiteConfigKeys.REFLECTION_CACHE_DIRECTORY.value),
+            reflection_config.get(cls.SQLiteConfigKeys.REFLECTION_LAZY.value, False)
+        )
+
+    def create_connection_string(self, host=None, port=None):
+        """
+        Create the connection string for connecting to the SQLite database with aiosqlite.
+        SQLite has no server, so the host and port are ignored.
+
+        Args:
+        - host: (Optional) Ignored.
+        - port: (Optional) Ignored.
+
+        Returns:
+        - The connection string.
+        """
+        return f"sqlite+aiosqlite:///{self._database}"
@@ -0,0 +1,76 @@
+import threading
+
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+
+class CompiledCacheStatistics:
+    """
+    CompiledCacheStatistics counts how the statements run by an engine were compiled: served from SQLAlchemy's
+    compiled cache, compiled and added to it, or compiled without caching (raw SQL strings, or constructs without a
+    cache key).
+
+    Statements whose values are bound parameters compile to the same SQL whatever the values, so a high hit rate
+    shows that queries are parameterized rather than built with inlined literals.
+
+    Attributes:
+    - _hits: The number of statements served from the compiled cache.
+    - _misses: The number of statements compiled and added to the compiled cache.
+    - _uncached: The number of statements compiled or run without the compiled cache.
+    - _lock: A lock guarding the counters, as statements run from many threads.
+
+    The following methods are implemented in this class:
+    - record: Records the compilation of a single statement.
+    - snapshot: Returns a consistent copy of the collected statistics.
+    - reset: Clears all collected statistics.
+    """
+
+    def __init__(self):
+        """
+        Initialize the CompiledCacheStatistics.
+        """
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Clear all collected statistics.
+        """
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._uncached = 0
+
+    def record(self, cache_hit):
+        """
+        Record the compilation of a single statement.
+
+        Args:
+        - cache_hit: The cache_hit status of the statement's execution context, e.g. CACHE_HIT or CACHE_MISS.
+        """
+        with self._lock:
+            if cache_hit is CACHE_HIT:
+                self._hits += 1
+            elif cache_hit is CACHE_MISS:
+                self._misses += 1
+            else:
+                self._uncached += 1
+
+    def snapshot(self):
+        """
+        Get a consistent copy of the collected statistics.
+
+        Returns:
+        - A dictionary with the hit, miss and uncached statement counts, and the hit rate of the cacheable statements
+          (None before any was run).
+        """
+        with self._lock:
+            hits = self._hits
+            misses = self._misses
+            uncached = self._uncached
+
+        return {
+            'hits': hits,
+            'misses': misses,
+            'uncached': uncached,
+            'hit_rate': hits / (hits + misses) if hits + misses else None,
+        }
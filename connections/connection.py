@@ -20,14 +20,18 @@ class Connection(ABC):
     - _ssl_certfile_path: (Optional) A string that represents the path to the SSL certificate file.
     - _ssl_ca_certs: (Optional) A string that represents the path to the SSL CA certificate file.
     - _connection_engine: The object responsible for maintaining the actual connection. Specific to the child class's implementation.
+    - _health_monitor: (Optional) The HealthMonitor caching this connection's health status.
+    - _resilience_policy: (Optional) The ResiliencePolicy applied by datasources to operations on this connection.
 
     The following methods must be implemented in any child class:
     - from_config: A class method that creates an instance of the connection from a configuration dictionary.
     - connect: Opens the connection.
     - disconnect: Closes the connection.
-    - check_health: Checks whether the connection is healthy.
+    - probe_health: Probes the backend to check whether the connection is healthy.
     - create_connection_string: Returns a connection string specific to the type of connection.
 
+    check_health returns the status cached by a HealthMonitor when one is attached, and probes otherwise.
+
     The class also includes __enter__ and __exit__ methods to allow its instances to be used with Python's with statement.
     """
 
@@ -42,7 +46,7 @@ class Connection(ABC):
             pass
 
     def __init__(self, name, host, port, username, password, ssl_keyfile_path=None, ssl_certfile_path=None,
-                 ssl_ca_certs=None):
+                 ssl_ca_certs=None, resilience_policy=None):
         self._name = name
         self._host = host
         self._port = port
@@ -53,17 +57,29 @@ class Connection(ABC):
         self._ssl_certfile_path = ssl_certfile_path
         self._ssl_ca_certs = ssl_ca_certs
         self._connection_engine = None
+        self._health_monitor = None
+        self._resilience_policy = resilience_policy
 
     @property
     def name(self):
         """Get the name of the connection."""
         return self._name
 
+    @property
+    def resilience_policy(self):
+        """Get the ResiliencePolicy of the connection, or None."""
+        return self._resilience_policy
+
     @property
     def connection_engine(self):
         """Get the connection engine."""
         return self._connection_engine
 
+    @property
+    def in_transaction(self):
+        """Get whether a transaction scope spanning several operations is open. Only SQL connections have them."""
+        return False
+
     @classmethod
     def from_dict(cls, conf_dict):
         """
@@ -107,14 +123,39 @@ class Connection(ABC):
         pass
 
     @abstractmethod
+    def probe_health(self):
+        """
+        Probe the backend to check whether the connection is healthy.
+
+        Returns:
+        - True if the connection is healthy, False otherwise.
+        """
+        pass
+
+    def attach_health_monitor(self, health_monitor):
+        """
+        Attach the HealthMonitor caching this connection's health status. Called by HealthMonitor.register.
+
+        Args:
+        - health_monitor: A HealthMonitor, or None to detach.
+        """
+        self._health_monitor = health_monitor
+
     def check_health(self):
         """
         Check whether the connection is healthy.
 
+        When a HealthMonitor is attached, this returns the cached result of its last probe. Otherwise, or before the
+        first probe completed or once the cached status is stale, the backend is probed.
+
         Returns:
         - True if the connection is healthy, False otherwise.
         """
-        pass
+        if self._health_monitor is not None:
+            status = self._health_monitor.get_status(self._name)
+            if status is not None and not self._health_monitor.is_stale(status):
+                return status.healthy
+        return self.probe_health()
 
     @abstractmethod
     @cached_property
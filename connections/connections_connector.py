@@ -0,0 +1,95 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+class ConnectionResult:
+    """
+    ConnectionResult describes the outcome of opening a single connection with connect_all.
+
+    Attributes:
+    - connection: The connection object.
+    - connected: True if the connection was opened successfully.
+    - latency: The number of seconds connect() took, or None if it didn't finish before the deadline.
+    - error: The exception raised by connect(), or None.
+    - timed_out: True if connect() didn't finish before the deadline.
+    """
+
+    def __init__(self, connection, connected=False, latency=None, error=None, timed_out=False):
+        """
+        Initialize the ConnectionResult.
+
+        Args:
+        - connection: The connection object.
+        - connected: True if the connection was opened successfully.
+        - latency: The number of seconds connect() took.
+        - error: The exception raised by connect().
+        - timed_out: True if connect() didn't finish before the deadline.
+        """
+        self.connection = connection
+        self.connected = connected
+        self.latency = latency
+        self.error = error
+        self.timed_out = timed_out
+
+    @property
+    def name(self):
+        """Get the name of the connection."""
+        return self.connection.name
+
+    def __repr__(self):
+        if self.connected:
+            status = f"connected in {self.latency:.3f}s"
+        elif self.timed_out:
+            status = "timed out"
+        else:
+            status = f"failed: {self.error!r}"
+        return f"ConnectionResult({self.name}, {status})"
+
+
+def _timed_connect(connection):
+    start = time.perf_counter()
+    try:
+        connection.connect()
+    except Exception as error:
+        return ConnectionResult(connection, latency=time.perf_counter() - start, error=error)
+    return ConnectionResult(connection, connected=True, latency=time.perf_counter() - start)
+
+
+def connect_all(connections, max_workers=None, timeout=None):
+    """
+    Open several connections concurrently on a thread pool.
+
+    Each connect() may include a TLS handshake and a schema reflection, so opening connections in parallel makes the
+    startup time roughly that of the slowest connection instead of the sum of all of them.
+
+    The call returns as soon as every connection is ready or failed, or when the deadline hits. Connections that are
+    still opening at the deadline are reported as timed out. Their connect() keeps running in the background (a
+    thread can't be interrupted), so they may still become usable later.
+
+    Args:
+    - connections: An iterable of connection objects (e.g. as returned by parse_connections_config).
+    - max_workers: (Optional) The maximum number of connections opened at the same time. Defaults to one per connection.
+    - timeout: (Optional) The deadline in seconds. None waits for every connection.
+
+    Returns:
+    - A dictionary mapping each connection name to its ConnectionResult, in the order the connections were given.
+    """
+    connections = list(connections)
+    if not connections:
+        return {}
+
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(connections),
+                                  thread_name_prefix='ionify-connect')
+    try:
+        futures = {executor.submit(_timed_connect, connection): connection for connection in connections}
+        wait(futures, timeout=timeout)
+
+        results = {}
+        for future, connection in futures.items():
+            if future.done():
+                results[connection.name] = future.result()
+            else:
+                results[connection.name] = ConnectionResult(connection, timed_out=True)
+        return results
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
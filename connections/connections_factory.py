@@ -1,3 +1,5 @@
+import importlib
+
 from connections.exceptions.connection import UnknownConnectionType
 
 
@@ -5,6 +7,10 @@ class ConnectionsFactory:
     """
     ConnectionsFactory is responsible for creating connection objects based on the connection type.
 
+    A creator can be registered as a dotted import path (e.g. 'connections.my_sql_connection.MySQLConnection'). It's
+    only imported when the first connection of its type is created, so registering many types doesn't import the
+    drivers of the ones that are never used.
+
     The following methods are implemented in this class:
     - register_type: Registers a connection type with its corresponding creator.
     - create: Creates a connection object based on the connection type and configuration.
@@ -22,7 +28,8 @@ class ConnectionsFactory:
 
         Args:
         - connection_type: The type of the connection.
-        - creator: The creator function for creating the connection object.
+        - creator: The creator for creating the connection object (a class providing from_dict), or the dotted
+          import path of the creator, resolved on first use.
         """
         self._creators[connection_type] = creator
 
@@ -44,4 +51,22 @@ class ConnectionsFactory:
         if not creator:
             raise UnknownConnectionType(f"Connection type {connection_type} is unknown.")
 
+        if isinstance(creator, str):
+            creator = self._resolve_creator(creator)
+            self._creators[connection_type] = creator
+
         return creator.from_dict(config)
+
+    @staticmethod
+    def _resolve_creator(import_path):
+        """
+        Import a creator from its dotted import path.
+
+        Args:
+        - import_path: The dotted import path of the creator, e.g. 'connections.my_sql_connection.MySQLConnection'.
+
+        Returns:
+        - The creator.
+        """
+        module_name, _, attribute_name = import_path.rpartition('.')
+        return getattr(importlib.import_module(module_name), attribute_name)
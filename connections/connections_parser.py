@@ -1,6 +1,3 @@
-import yaml
-
-
 class ConnectionsConfigurationParser:
     """
     ConnectionsConfigurationParser is responsible for parsing the connections configuration from a YAML file.
@@ -34,6 +31,9 @@ class ConnectionsConfigurationParser:
         Raises:
         - FileNotFoundError: If the connections YAML file is not found.
         """
+        # PyYAML is only needed when a configuration file is actually parsed.
+        import yaml
+
         with open(connections_yaml_file_path, 'r') as file:
             connections_config = yaml.safe_load(file)
 
@@ -44,3 +44,33 @@ class MissingConfigurationKey(ConnectionException):
         - message: The error message.
         """
         self.message = message
+
+
+class CircuitBreakerOpen(ConnectionException):
+    """
+    Exception raised when a circuit breaker rejects a call because the backend is considered down.
+    """
+
+    def __init__(self, message):
+        """
+        Initialize the CircuitBreakerOpen exception.
+
+        Args:
+        - message: The error message.
+        """
+        self.message = message
+
+
+class LocalInfileDisabled(ConnectionException):
+    """
+    Exception raised when a MySQL bulk load needs LOAD DATA LOCAL INFILE but the connection doesn't allow it.
+    """
+
+    def __init__(self, message):
+        """
+        Initialize the LocalInfileDisabled exception.
+
+        Args:
+        - message: The error message.
+        """
+        self.message = message
@@ -0,0 +1,274 @@
+import concurrent.futures
+import inspect
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class HealthStatus:
+    """
+    HealthStatus is the result of the last health probe of a connection.
+
+    Attributes:
+    - healthy: True if the last probe succeeded.
+    - latency: The number of seconds the last probe took.
+    - error: The exception raised by the last probe, or None.
+    - checked_at: The time (seconds since the epoch) the last probe finished.
+    - consecutive_failures: The number of failed probes in a row, 0 when healthy.
+    """
+
+    def __init__(self, healthy, latency, error=None, checked_at=None, consecutive_failures=0):
+        """
+        Initialize the HealthStatus.
+
+        Args:
+        - healthy: True if the probe succeeded.
+        - latency: The number of seconds the probe took.
+        - error: (Optional) The exception raised by the probe.
+        - checked_at: (Optional) The time the probe finished. Defaults to now.
+        - consecutive_failures: (Optional) The number of failed probes in a row.
+        """
+        self.healthy = healthy
+        self.latency = latency
+        self.error = error
+        self.checked_at = checked_at if checked_at is not None else time.time()
+        self.consecutive_failures = consecutive_failures
+
+    def __repr__(self):
+        return (f"HealthStatus(healthy={self.healthy}, latency={self.latency:.4f}, error={self.error!r}, "
+                f"consecutive_failures={self.consecutive_failures})")
+
+
+class HealthMonitor:
+    """
+    HealthMonitor probes registered connections on a background thread and caches their health status.
+
+    Once a connection is registered, its check_health() returns the cached status of the last probe instead of
+    probing the backend on every call, so frequent health polling (e.g. by a load balancer) doesn't take pool
+    capacity. Until the first probe completes, or once the cached status is older than stale_after (e.g. after the
+    monitor was stopped), check_health() falls back to a live probe.
+
+    Listeners are called whenever a connection's health flips (including its first probe), with the connection, the
+    previous HealthStatus (None on the first probe) and the new HealthStatus. This is the hook for circuit breakers
+    and alerting. Listeners run on the monitor thread and must return quickly.
+
+    Probes run concurrently on a small thread pool, so one hung backend doesn't delay the others. A probe that doesn't
+    finish within probe_timeout is recorded as a failure, and the connection isn't probed again until it returns.
+
+    Only synchronous connections can be monitored.
+
+    Attributes:
+    - _interval: The number of seconds between two probe rounds.
+    - _stale_after: The age (in seconds) after which a cached status is no longer trusted.
+    - _probe_timeout: The number of seconds a probe may take before it is recorded as a failure.
+    - _max_workers: The maximum number of probes running at the same time.
+    - _executor: The ThreadPoolExecutor running the probes, or None until the first round.
+    - _in_flight: The names of the connections whose probe is still running.
+    - _connections: A dictionary mapping connection names to the registered connections.
+    - _statuses: A dictionary mapping connection names to their last HealthStatus.
+    - _listeners: A list of state-change callbacks.
+    - _lock: A lock guarding the registrations, the statuses and the probes in flight.
+    - _stop_event: An event used to wake up and stop the monitor thread.
+    - _thread: The monitor thread, or None when the monitor isn't running.
+
+    The following methods are implemented in this class:
+    - register: Registers a connection to be monitored.
+    - unregister: Stops monitoring a connection.
+    - add_listener: Registers a state-change callback.
+    - get_status: Returns the last HealthStatus of a connection.
+    - is_stale: Returns whether a HealthStatus is too old to be trusted.
+    - probe_all: Probes all registered connections once.
+    - start: Starts the background thread.
+    - stop: Stops the background thread.
+    """
+
+    def __init__(self, interval=5.0, stale_after=None, probe_timeout=None, max_workers=4):
+        """
+        Initialize the HealthMonitor.
+
+        Args:
+        - interval: (Optional) The number of seconds between two probe rounds.
+        - stale_after: (Optional) The age (in seconds) after which a cached status is no longer trusted. Defaults to
+          twice the interval.
+        - probe_timeout: (Optional) The number of seconds a probe may take before it is recorded as a failure.
+          Defaults to the interval.
+        - max_workers: (Optional) The maximum number of probes running at the same time.
+        """
+        self._interval = interval
+        self._stale_after = stale_after if stale_after is not None else 2 * interval
+        self._probe_timeout = probe_timeout if probe_timeout is not None else interval
+        self._max_workers = max_workers
+        self._executor = None
+        self._in_flight = set()
+        self._connections = {}
+        self._statuses = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def register(self, connection):
+        """
+        Register a connection to be monitored. Its check_health() starts returning the cached status.
+
+        Args:
+        - connection: A synchronous Connection object.
+
+        Raises:
+        - TypeError: If the connection's health probe is a coroutine.
+        """
+        if inspect.iscoroutinefunction(connection.probe_health):
+            raise TypeError(f"Connection {connection.name} is asynchronous and can't be monitored by a HealthMonitor.")
+
+        with self._lock:
+            self._connections[connection.name] = connection
+        connection.attach_health_monitor(self)
+
+    def unregister(self, connection):
+        """
+        Stop monitoring a connection. Its check_health() goes back to probing on every call.
+
+        Args:
+        - connection: A registered Connection object.
+        """
+        with self._lock:
+            self._connections.pop(connection.name, None)
+            self._statuses.pop(connection.name, None)
+        connection.attach_health_monitor(None)
+
+    def add_listener(self, callback):
+        """
+        Register a state-change callback.
+
+        Args:
+        - callback: A callable taking (connection, previous_status, status).
+        """
+        self._listeners.append(callback)
+
+    def get_status(self, connection_name):
+        """
+        Get the last HealthStatus of a connection. This is a dictionary lookup, it never probes.
+
+        Args:
+        - connection_name: The name of the connection.
+
+        Returns:
+        - The last HealthStatus, or None if the connection wasn't probed yet.
+        """
+        return self._statuses.get(connection_name)
+
+    def is_stale(self, status):
+        """
+        Check whether a HealthStatus is too old to be trusted, e.g. because the monitor was stopped or is stuck.
+
+        Args:
+        - status: A HealthStatus returned by get_status.
+
+        Returns:
+        - True if the status is older than stale_after, False otherwise.
+        """
+        return time.time() - status.checked_at > self._stale_after
+
+    def probe_all(self):
+        """
+        Probe all registered connections once, update their cached status and notify the listeners of changes.
+
+        The probes run concurrently, this returns once they all finished or probe_timeout elapsed. Connections whose
+        previous probe is still running aren't probed again, they are recorded as timed out.
+        """
+        with self._lock:
+            connections = [connection for name, connection in self._connections.items()
+                           if name not in self._in_flight]
+            hung_connections = [connection for name, connection in self._connections.items()
+                                if name in self._in_flight]
+            self._in_flight.update(connection.name for connection in connections)
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix='ionify-health-probe')
+            executor = self._executor
+
+        futures = {executor.submit(self._probe, connection): connection for connection in connections}
+        done, not_done = concurrent.futures.wait(futures, timeout=self._probe_timeout)
+
+        for future in done:
+            healthy, latency, error = future.result()
+            self._record(futures[future], healthy, latency, error)
+        for connection in hung_connections + [futures[future] for future in not_done]:
+            error = TimeoutError(f"Health probe of connection {connection.name} timed out after "
+                                 f"{self._probe_timeout} seconds.")
+            self._record(connection, False, self._probe_timeout, error)
+
+    def _probe(self, connection):
+        start = time.perf_counter()
+        error = None
+        try:
+            healthy = bool(connection.probe_health())
+        except Exception as probe_error:
+            healthy = False
+            error = probe_error
+        finally:
+            with self._lock:
+                self._in_flight.discard(connection.name)
+        return healthy, time.perf_counter() - start, error
+
+    def _record(self, connection, healthy, latency, error):
+        with self._lock:
+            # The connection may have been unregistered (or replaced) while it was probed.
+            if self._connections.get(connection.name) is not connection:
+                return
+            previous_status = self._statuses.get(connection.name)
+            consecutive_failures = 0
+            if not healthy:
+                consecutive_failures = (previous_status.consecutive_failures if previous_status else 0) + 1
+            status = HealthStatus(healthy, latency, error, consecutive_failures=consecutive_failures)
+            self._statuses[connection.name] = status
+
+        if previous_status is None or previous_status.healthy != healthy:
+            for listener in list(self._listeners):
+                try:
+                    listener(connection, previous_status, status)
+                except Exception:
+                    logger.exception("Health monitor listener failed for connection %s", connection.name)
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.probe_all()
+            self._stop_event.wait(self._interval)
+
+    def start(self):
+        """
+        Start probing the registered connections on a background (daemon) thread.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='ionify-health-monitor', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop the background thread and the probe thread pool. The connections stay registered, but their cached
+        status goes stale after stale_after seconds, from then on check_health() probes the backend again.
+
+        Args:
+        - timeout: (Optional) The number of seconds to wait for the thread to finish its current round.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def __enter__(self):
+        """Start the monitor when entering a with statement."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Stop the monitor when exiting a with statement."""
+        self.stop()
@@ -15,7 +15,7 @@ class MongoDBConnection(Connection):
     - from_config: A class method that creates an instance of MongoDBConnection from a configuration dictionary.
     - connect: Opens the connection to the MongoDB database.
     - disconnect: Closes the connection to the MongoDB database.
-    - check_health: Checks whether the connection to the MongoDB database is healthy.
+    - probe_health: Probes whether the connection to the MongoDB database is healthy.
     - create_connection_string: Returns the connection string for connecting to the MongoDB database.
     """
 
@@ -81,7 +81,7 @@ class MongoDBConnection(Connection):
         """
         self._connection_engine.close()
 
-    def check_health(self):
+    def probe_health(self):
         """
         Checks whether the connection to the MongoDB database is healthy.
 
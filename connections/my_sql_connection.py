@@ -1,6 +1,8 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 
 from connections.connection import Connection
+from connections.replica_router import ReplicaRouter
+from connections.resilience import ResiliencePolicy
 from connections.sql_connection import SQLConnection
 
 
@@ -10,12 +12,13 @@ class MySQLConnection(SQLConnection):
 
     Attributes:
     - _database: A string representing the name of the database.
+    - _local_infile: Whether the client allows LOAD DATA LOCAL INFILE, used by MySQLDataSource.bulk_load.
 
     The following methods are implemented in this class:
     - from_config: A class method that creates an instance of MySQLConnection from a configuration dictionary.
     - connect: Opens the connection to the MySQL database.
     - disconnect: Closes the connection to the MySQL database.
-    - check_health: Checks whether the connection to the MySQL database is healthy.
+    - probe_health: Probes whether the connection to the MySQL database is healthy.
     - create_connection_string: Returns the connection string for connecting to the MySQL database.
     """
 
@@ -30,16 +33,51 @@ class MySQLConnection(SQLConnection):
         SSL_KEY = 'key'
         SSL_CERT = 'cert'
         SSL_CA = 'ca'
+        POOL = 'pool'
+        POOL_SIZE = 'size'
+        POOL_MAX_OVERFLOW = 'max_overflow'
+        POOL_TIMEOUT = 'timeout'
+        POOL_RECYCLE = 'recycle'
+        POOL_PRE_PING = 'pre_ping'
+        POOL_USE_LIFO = 'use_lifo'
+        REFLECTION = 'reflection'
+        REFLECTION_CACHE_DIRECTORY = 'cache_directory'
+        REFLECTION_LAZY = 'lazy'
+        RESILIENCE = 'resilience'
+        REPLICAS = 'replicas'
+        REPLICAS_HOSTS = 'hosts'
+        REPLICAS_ROUTING = 'routing'
+        REPLICAS_READ_YOUR_WRITES = 'read_your_writes'
+        LOCAL_INFILE = 'local_infile'
+
+        @classmethod
+        def optional_keys(cls):
+            return [cls.SSL.value, cls.SSL_KEY.value, cls.SSL_CERT.value, cls.SSL_CA.value,
+                    cls.POOL.value, cls.POOL_SIZE.value, cls.POOL_MAX_OVERFLOW.value, cls.POOL_TIMEOUT.value,
+                    cls.POOL_RECYCLE.value, cls.POOL_PRE_PING.value, cls.POOL_USE_LIFO.value,
+                    cls.REFLECTION.value, cls.REFLECTION_CACHE_DIRECTORY.value, cls.REFLECTION_LAZY.value,
+                    cls.RESILIENCE.value, cls.REPLICAS.value, cls.REPLICAS_HOSTS.value,
+                    cls.REPLICAS_ROUTING.value, cls.REPLICAS_READ_YOUR_WRITES.value, cls.LOCAL_INFILE.value]
 
         @classmethod
         def required_keys(cls):
-            return [member.value for member in cls if
-                    member.value not in [cls.SSL.value, cls.SSL_KEY.value, cls.SSL_CERT.value, cls.SSL_CA.value]]
+            return [member.value for member in cls if member.value not in cls.optional_keys()]
 
     def __init__(self, name, host, port, database, username, password, ssl_keyfile_path=None, ssl_certfile_path=None,
-                 ssl_ca_certs=None):
+                 ssl_ca_certs=None, pool_size=None, max_overflow=None, pool_timeout=None, pool_recycle=None,
+                 pool_pre_ping=False, pool_use_lifo=False, reflection_cache_directory=None,
+                 lazy_reflection=False, resilience_policy=None, replicas=None, read_routing=ReplicaRouter.ROUND_ROBIN,
+                 read_your_writes=0, local_infile=False):
         super().__init__(name, host, port, database, username, password, ssl_keyfile_path, ssl_certfile_path,
-                         ssl_ca_certs)
+                         ssl_ca_certs, pool_size, max_overflow, pool_timeout, pool_recycle, pool_pre_ping,
+                         pool_use_lifo, reflection_cache_directory, lazy_reflection, resilience_policy, replicas,
+                         read_routing, read_your_writes)
+        self._local_infile = local_infile
+
+    @property
+    def local_infile(self):
+        """Get whether the client allows LOAD DATA LOCAL INFILE."""
+        return self._local_infile
 
     @classmethod
     def from_dict(cls, config):
@@ -63,6 +101,9 @@ class MySQLConnection(SQLConnection):
         cls.validate_dict_keys(config, required_config_keys)
 
         # Extract the keys specific to MySQL from the config
+        pool_config = config.get(cls.MySQLConfigKeys.POOL.value, {})
+        reflection_config = config.get(cls.MySQLConfigKeys.REFLECTION.value, {})
+        replicas_config = config.get(cls.MySQLConfigKeys.REPLICAS.value, {})
         return cls(
             config[cls.MySQLConfigKeys.NAME.value],
             config[cls.MySQLConfigKeys.HOST.value],
@@ -72,10 +113,24 @@ class MySQLConnection(SQLConnection):
             config[cls.MySQLConfigKeys.PASSWORD.value],
             config.get(cls.MySQLConfigKeys.SSL.value, {}).get(cls.MySQLConfigKeys.SSL.SSL_KEY.value),
             config.get(cls.MySQLConfigKeys.SSL.value, {}).get(cls.MySQLConfigKeys.SSL.SSL_CERT.value),
-            config.get(cls.MySQLConfigKeys.SSL.value, {}).get(cls.MySQLConfigKeys.SSL.SSL_CA.value)
+            config.get(cls.MySQLConfigKeys.SSL.value, {}).get(cls.MySQLConfigKeys.SSL.SSL_CA.value),
+            pool_config.get(cls.MySQLConfigKeys.POOL_SIZE.value),
+            pool_config.get(cls.MySQLConfigKeys.POOL_MAX_OVERFLOW.value),
+            pool_config.get(cls.MySQLConfigKeys.POOL_TIMEOUT.value),
+            pool_config.get(cls.MySQLConfigKeys.POOL_RECYCLE.value),
+            pool_config.get(cls.MySQLConfigKeys.POOL_PRE_PING.value, False),
+            pool_config.get(cls.MySQLConfigKeys.POOL_USE_LIFO.value, False),
+            reflection_config.get(cls.MySQLConfigKeys.REFLECTION_CACHE_DIRECTORY.value),
+            reflection_config.get(cls.MySQLConfigKeys.REFLECTION_LAZY.value, False),
+            ResiliencePolicy.from_dict(config.get(cls.MySQLConfigKeys.RESILIENCE.value)),
+            [(replica[cls.MySQLConfigKeys.HOST.value], replica[cls.MySQLConfigKeys.PORT.value])
+             for replica in replicas_config.get(cls.MySQLConfigKeys.REPLICAS_HOSTS.value, [])],
+            replicas_config.get(cls.MySQLConfigKeys.REPLICAS_ROUTING.value, ReplicaRouter.ROUND_ROBIN),
+            replicas_config.get(cls.MySQLConfigKeys.REPLICAS_READ_YOUR_WRITES.value, 0),
+            config.get(cls.MySQLConfigKeys.LOCAL_INFILE.value, False)
         )
 
-    def _create_engine(self):
+    def _create_engine(self, host=None, port=None):
         """
         Create the SQLAlchemy engine for a MySQL database connection, including SSL configuration if applicable.
 
@@ -90,6 +145,17 @@ class MySQLConnection(SQLConnection):
 
         If SSL parameters are not provided, no SSL encryption will be used.
 
+        LOAD DATA LOCAL INFILE is enabled on the client side when local_infile is set (the server must allow it too,
+        with local_infile=ON).
+
+        Pool Configuration:
+        The pool settings given in the configuration (size, max_overflow, timeout, recycle, pre_ping, use_lifo) are
+        passed to the engine's pool. Settings that were not configured keep SQLAlchemy's defaults.
+
+        Args:
+        - host: (Optional) The host to connect to, e.g. a read replica's. Defaults to the primary's host.
+        - port: (Optional) The port to connect to. Defaults to the primary's port.
+
         Returns:
         - The SQLAlchemy engine object.
 
@@ -107,14 +173,50 @@ class MySQLConnection(SQLConnection):
                 }
             }
 
-        self._connection_engine = create_engine(self.create_connection_string(), connect_args=ssl_args)
+        connect_args = dict(ssl_args)
+        if self._local_infile:
+            connect_args['local_infile'] = True
 
+        return create_engine(self.create_connection_string(host, port), connect_args=connect_args,
+                             **self._pool_args())
 
-    def create_connection_string(self):
+
+    def _schema_fingerprint(self, connection):
+        """
+        Compute a cheap fingerprint of the MySQL database schema from information_schema.
+
+        The fingerprint combines the count and the CRC32 checksum sum of the column definitions and of the key column
+        usages (primary and foreign keys, including their referenced tables) of the current database.
+
+        Args:
+        - connection: An open SQLAlchemy connection to the database.
+
+        Returns:
+        - A string fingerprint of the schema.
+        """
+        columns_count, columns_checksum = connection.execute(text(
+            "SELECT COUNT(*), COALESCE(SUM(CRC32(CONCAT_WS('|', table_name, column_name, ordinal_position, "
+            "column_type, is_nullable, column_key, COALESCE(column_default, '')))), 0) "
+            "FROM information_schema.columns WHERE table_schema = DATABASE()"
+        )).one()
+        keys_count, keys_checksum = connection.execute(text(
+            "SELECT COUNT(*), COALESCE(SUM(CRC32(CONCAT_WS('|', table_name, constraint_name, column_name, "
+            "COALESCE(referenced_table_name, ''), COALESCE(referenced_column_name, '')))), 0) "
+            "FROM information_schema.key_column_usage WHERE table_schema = DATABASE()"
+        )).one()
+        return f"{columns_count}:{columns_checksum}:{keys_count}:{keys_checksum}"
+
+    def create_connection_string(self, host=None, port=None):
         """
         Create the connection string for connecting to the MySQL database.
 
+        Args:
+        - host: (Optional) The host to connect to. Defaults to the primary's host.
+        - port: (Optional) The port to connect to. Defaults to the primary's port.
+
         Returns:
         - The connection string.
         """
-        return f"mysql+pymysql://{self._username}:{self._password}@{self._host}:{self._port}/{self._database}"
+        host = host or self._host
+        port = port or self._port
+        return f"mysql+pymysql://{self._username}:{self._password}@{host}:{port}/{self._database}"
@@ -0,0 +1,118 @@
+import threading
+import time
+
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStatistics:
+    """
+    PoolStatistics collects the time spent by callers waiting to check a connection out of a pool.
+
+    Wait times are accumulated into a fixed set of (non-cumulative) histogram buckets (upper bounds, in milliseconds),
+    so recording a sample is O(1) and the memory footprint doesn't grow with traffic.
+
+    Attributes:
+    - _bucket_bounds: A tuple of bucket upper bounds in milliseconds. The last bucket catches everything above.
+    - _bucket_counts: A list holding the number of samples recorded in each bucket.
+    - _wait_count: The total number of recorded checkouts.
+    - _wait_time_total: The total time spent waiting, in seconds.
+    - _wait_time_max: The longest recorded wait, in seconds.
+    - _lock: A lock guarding the counters, as checkouts happen from many threads.
+
+    The following methods are implemented in this class:
+    - record: Records a single checkout wait time.
+    - snapshot: Returns a consistent copy of the collected statistics.
+    - reset: Clears all collected statistics.
+    """
+
+    DEFAULT_BUCKET_BOUNDS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+    def __init__(self, bucket_bounds=DEFAULT_BUCKET_BOUNDS):
+        """
+        Initialize the PoolStatistics.
+
+        Args:
+        - bucket_bounds: An ascending sequence of histogram bucket upper bounds, in milliseconds.
+        """
+        self._bucket_bounds = tuple(bucket_bounds)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Clear all collected statistics.
+        """
+        with self._lock:
+            self._bucket_counts = [0] * (len(self._bucket_bounds) + 1)
+            self._wait_count = 0
+            self._wait_time_total = 0.0
+            self._wait_time_max = 0.0
+
+    def record(self, wait_time):
+        """
+        Record a single checkout wait time.
+
+        Args:
+        - wait_time: The time spent waiting for a connection, in seconds.
+        """
+        wait_time_ms = wait_time * 1000
+        bucket_index = len(self._bucket_bounds)
+        for index, bound in enumerate(self._bucket_bounds):
+            if wait_time_ms <= bound:
+                bucket_index = index
+                break
+
+        with self._lock:
+            self._bucket_counts[bucket_index] += 1
+            self._wait_count += 1
+            self._wait_time_total += wait_time
+            self._wait_time_max = max(self._wait_time_max, wait_time)
+
+    def snapshot(self):
+        """
+        Get a consistent copy of the collected statistics.
+
+        Returns:
+        - A dictionary with the wait count, total and max wait time (seconds) and the wait time histogram. The
+          histogram maps a bucket label ('<=N ms' or '>N ms') to the number of samples in that bucket.
+        """
+        with self._lock:
+            bucket_counts = list(self._bucket_counts)
+            wait_count = self._wait_count
+            wait_time_total = self._wait_time_total
+            wait_time_max = self._wait_time_max
+
+        histogram = {f"<={bound} ms": count for bound, count in zip(self._bucket_bounds, bucket_counts)}
+        histogram[f">{self._bucket_bounds[-1]} ms"] = bucket_counts[-1]
+
+        return {
+            'wait_count': wait_count,
+            'wait_time_total': wait_time_total,
+            'wait_time_max': wait_time_max,
+            'wait_time_histogram': histogram,
+        }
+
+
+class TimedQueuePool(QueuePool):
+    """
+    TimedQueuePool is a QueuePool that reports how long each checkout waited for a connection.
+
+    Attributes:
+    - wait_statistics: (Optional) A PoolStatistics instance that receives the checkout wait times.
+    """
+
+    wait_statistics = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.wait_statistics is not None:
+                self.wait_statistics.record(time.perf_counter() - start)
+
+    def recreate(self):
+        # Engine.dispose() replaces the pool - carry the statistics over to the new one.
+        pool = super().recreate()
+        pool.wait_statistics = self.wait_statistics
+        return pool
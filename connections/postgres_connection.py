@@ -1,6 +1,8 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 
 from connections.connection import Connection
+from connections.replica_router import ReplicaRouter
+from connections.resilience import ResiliencePolicy
 from connections.sql_connection import SQLConnection
 
 
@@ -15,7 +17,7 @@ class PostgreConnection(SQLConnection):
     - from_config: A class method that creates an instance of PostgreConnection from a configuration dictionary.
     - connect: Opens the connection to the PostgreSQL database.
     - disconnect: Closes the connection to the PostgreSQL database.
-    - check_health: Checks whether the connection to the PostgreSQL database is healthy.
+    - probe_health: Probes whether the connection to the PostgreSQL database is healthy.
     - create_connection_string: Returns the connection string for connecting to the PostgreSQL database.
     """
 
@@ -30,16 +32,44 @@ class PostgreConnection(SQLConnection):
         SSL_KEY = 'key'
         SSL_CERT = 'cert'
         SSL_CA = 'ca'
+        POOL = 'pool'
+        POOL_SIZE = 'size'
+        POOL_MAX_OVERFLOW = 'max_overflow'
+        POOL_TIMEOUT = 'timeout'
+        POOL_RECYCLE = 'recycle'
+        POOL_PRE_PING = 'pre_ping'
+        POOL_USE_LIFO = 'use_lifo'
+        REFLECTION = 'reflection'
+        REFLECTION_CACHE_DIRECTORY = 'cache_directory'
+        REFLECTION_LAZY = 'lazy'
+        RESILIENCE = 'resilience'
+        REPLICAS = 'replicas'
+        REPLICAS_HOSTS = 'hosts'
+        REPLICAS_ROUTING = 'routing'
+        REPLICAS_READ_YOUR_WRITES = 'read_your_writes'
+
+        @classmethod
+        def optional_keys(cls):
+            return [cls.SSL.value, cls.SSL_KEY.value, cls.SSL_CERT.value, cls.SSL_CA.value,
+                    cls.POOL.value, cls.POOL_SIZE.value, cls.POOL_MAX_OVERFLOW.value, cls.POOL_TIMEOUT.value,
+                    cls.POOL_RECYCLE.value, cls.POOL_PRE_PING.value, cls.POOL_USE_LIFO.value,
+                    cls.REFLECTION.value, cls.REFLECTION_CACHE_DIRECTORY.value, cls.REFLECTION_LAZY.value,
+                    cls.RESILIENCE.value, cls.REPLICAS.value, cls.REPLICAS_HOSTS.value,
+                    cls.REPLICAS_ROUTING.value, cls.REPLICAS_READ_YOUR_WRITES.value]
 
         @classmethod
         def required_keys(cls):
-            return [member.value for member in cls if
-                    member.value not in [cls.SSL.value, cls.SSL_KEY.value, cls.SSL_CERT.value, cls.SSL_CA.value]]
+            return [member.value for member in cls if member.value not in cls.optional_keys()]
 
     def __init__(self, name, host, port, database, username, password, ssl_keyfile_path=None, ssl_certfile_path=None,
-                 ssl_ca_certs=None):
+                 ssl_ca_certs=None, pool_size=None, max_overflow=None, pool_timeout=None, pool_recycle=None,
+                 pool_pre_ping=False, pool_use_lifo=False, reflection_cache_directory=None,
+                 lazy_reflection=False, resilience_policy=None, replicas=None, read_routing=ReplicaRouter.ROUND_ROBIN,
+                 read_your_writes=0):
         super().__init__(name, host, port, database, username, password, ssl_keyfile_path, ssl_certfile_path,
-                         ssl_ca_certs)
+                         ssl_ca_certs, pool_size, max_overflow, pool_timeout, pool_recycle, pool_pre_ping,
+                         pool_use_lifo, reflection_cache_directory, lazy_reflection, resilience_policy, replicas,
+                         read_routing, read_your_writes)
 
     @classmethod
     def from_dict(cls, config):
@@ -63,6 +93,9 @@ class PostgreConnection(SQLConnection):
         cls.validate_dict_keys(config, required_config_keys)
 
         # Extract the keys specific to PostgreSQL from the config
+        pool_config = config.get(cls.PostgreSQLConfigKeys.POOL.value, {})
+        reflection_config = config.get(cls.PostgreSQLConfigKeys.REFLECTION.value, {})
+        replicas_config = config.get(cls.PostgreSQLConfigKeys.REPLICAS.value, {})
         return cls(
             config[cls.PostgreSQLConfigKeys.NAME.value],
             config[cls.PostgreSQLConfigKeys.HOST.value],
@@ -72,10 +105,23 @@ class PostgreConnection(SQLConnection):
             config[cls.PostgreSQLConfigKeys.PASSWORD.value],
             config.get(cls.PostgreSQLConfigKeys.SSL.value, {}).get(cls.PostgreSQLConfigKeys.SSL.SSL_KEY.value),
             config.get(cls.PostgreSQLConfigKeys.SSL.value, {}).get(cls.PostgreSQLConfigKeys.SSL.SSL_CERT.value),
-            config.get(cls.PostgreSQLConfigKeys.SSL.value, {}).get(cls.PostgreSQLConfigKeys.SSL.SSL_CA.value)
+            config.get(cls.PostgreSQLConfigKeys.SSL.value, {}).get(cls.PostgreSQLConfigKeys.SSL.SSL_CA.value),
+            pool_config.get(cls.PostgreSQLConfigKeys.POOL_SIZE.value),
+            pool_config.get(cls.PostgreSQLConfigKeys.POOL_MAX_OVERFLOW.value),
+            pool_config.get(cls.PostgreSQLConfigKeys.POOL_TIMEOUT.value),
+            pool_config.get(cls.PostgreSQLConfigKeys.POOL_RECYCLE.value),
+            pool_config.get(cls.PostgreSQLConfigKeys.POOL_PRE_PING.value, False),
+            pool_config.get(cls.PostgreSQLConfigKeys.POOL_USE_LIFO.value, False),
+            reflection_config.get(cls.PostgreSQLConfigKeys.REFLECTION_CACHE_DIRECTORY.value),
+            reflection_config.get(cls.PostgreSQLConfigKeys.REFLECTION_LAZY.value, False),
+            ResiliencePolicy.from_dict(config.get(cls.PostgreSQLConfigKeys.RESILIENCE.value)),
+            [(replica[cls.PostgreSQLConfigKeys.HOST.value], replica[cls.PostgreSQLConfigKeys.PORT.value])
+             for replica in replicas_config.get(cls.PostgreSQLConfigKeys.REPLICAS_HOSTS.value, [])],
+            replicas_config.get(cls.PostgreSQLConfigKeys.REPLICAS_ROUTING.value, ReplicaRouter.ROUND_ROBIN),
+            replicas_config.get(cls.PostgreSQLConfigKeys.REPLICAS_READ_YOUR_WRITES.value, 0)
         )
 
-    def _create_engine(self):
+    def _create_engine(self, host=None, port=None):
         """
         Create the SQLAlchemy engine for a PostgreSQL database connection, including SSL configuration if applicable.
 
@@ -89,6 +135,14 @@ class PostgreConnection(SQLConnection):
 
         If SSL parameters are not provided, no SSL encryption will be used.
 
+        Pool Configuration:
+        The pool settings given in the configuration (size, max_overflow, timeout, recycle, pre_ping, use_lifo) are
+        passed to the engine's pool. Settings that were not configured keep SQLAlchemy's defaults.
+
+        Args:
+        - host: (Optional) The host to connect to, e.g. a read replica's. Defaults to the primary's host.
+        - port: (Optional) The port to connect to. Defaults to the primary's port.
+
         Returns:
         - The SQLAlchemy engine object.
 
@@ -106,13 +160,44 @@ class PostgreConnection(SQLConnection):
                 'sslkey': self._ssl_keyfile_path,
             }
 
-        self._connection_engine = create_engine(self.create_connection_string(), connect_args=ssl_args)
+        return create_engine(self.create_connection_string(host, port), connect_args=ssl_args, **self._pool_args())
+
+    def _schema_fingerprint(self, connection):
+        """
+        Compute a cheap fingerprint of the PostgreSQL database schema from the catalogs.
+
+        The fingerprint is an MD5 digest of the column definitions (information_schema.columns) and of the constraint
+        definitions (pg_constraint, including foreign key targets) of the current schema.
+
+        Args:
+        - connection: An open SQLAlchemy connection to the database.
 
-    def create_connection_string(self):
+        Returns:
+        - A string fingerprint of the schema.
+        """
+        columns_checksum = connection.execute(text(
+            "SELECT md5(COALESCE(string_agg(table_name || '.' || column_name || ':' || data_type || ':' "
+            "|| is_nullable || ':' || COALESCE(column_default, ''), ',' ORDER BY table_name, ordinal_position), '')) "
+            "FROM information_schema.columns WHERE table_schema = current_schema()"
+        )).scalar()
+        constraints_checksum = connection.execute(text(
+            "SELECT md5(COALESCE(string_agg(conrelid::regclass::text || ':' || conname || ':' "
+            "|| pg_get_constraintdef(oid), ',' ORDER BY conrelid::regclass::text, conname), '')) "
+            "FROM pg_constraint WHERE connamespace = current_schema()::regnamespace"
+        )).scalar()
+        return f"{columns_checksum}:{constraints_checksum}"
+
+    def create_connection_string(self, host=None, port=None):
         """
         Create the connection string for connecting to the PostgreSQL database.
 
+        Args:
+        - host: (Optional) The host to connect to. Defaults to the primary's host.
+        - port: (Optional) The port to connect to. Defaults to the primary's port.
+
         Returns:
         - The connection string.
         """
-        return f"postgresql://{self._username}:{self._password}@{self._host}:{self._port}/{self._database}"
+        host = host or self._host
+        port = port or self._port
+        return f"postgresql://{self._username}:{self._password}@{host}:{port}/{self._database}"
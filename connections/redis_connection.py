@@ -1,6 +1,7 @@
-from redis import Redis
+from redis import BlockingConnectionPool, ConnectionPool, Redis, SSLConnection
 
 from connections.connection import Connection
+from connections.resilience import ResiliencePolicy
 
 
 class RedisConnection(Connection):
@@ -9,13 +10,26 @@ class RedisConnection(Connection):
 
     Attributes:
     - _database_index: An integer representing the index of the Redis database.
+    - _max_connections: (Optional) The maximum number of connections the pool may open.
+    - _blocking: Whether a checkout should wait for a free connection (BlockingConnectionPool) instead of failing.
+    - _pool_timeout: (Optional) The number of seconds a blocking checkout waits for a free connection.
+    - _socket_timeout: (Optional) The number of seconds a socket operation may take.
+    - _socket_connect_timeout: (Optional) The number of seconds establishing a socket connection may take.
+    - _socket_keepalive: Whether TCP keepalive is enabled on the pooled sockets.
+    - _health_check_interval: The number of idle seconds after which a pooled connection is pinged before use.
+    - _connection_pool: The redis-py connection pool shared by every client of this connection.
+
+    A RedisConnection owns a single connection pool. Every RedisDataSource built on the same RedisConnection
+    shares that pool, so the number of open sockets is bounded by the pool size rather than by the number of
+    datasources.
 
     The following methods are implemented in this class:
     - from_config: A class method that creates an instance of RedisConnection from a configuration dictionary.
     - connect: Opens the connection to the Redis database.
     - disconnect: Closes the connection to the Redis database.
-    - check_health: Checks whether the connection to the Redis database is healthy.
+    - probe_health: Probes whether the connection to the Redis database is healthy.
     - create_connection_string: Returns the connection string for connecting to the Redis database.
+    - pool_stats: Returns the connection pool usage statistics.
     """
 
     class RedisConfigKeys(Connection.ConfigKeys):
@@ -28,16 +42,54 @@ class RedisConnection(Connection):
         SSL_KEY = 'key'
         SSL_CERT = 'cert'
         SSL_CA = 'ca'
+        POOL = 'pool'
+        POOL_MAX_CONNECTIONS = 'max_connections'
+        POOL_BLOCKING = 'blocking'
+        POOL_TIMEOUT = 'timeout'
+        POOL_SOCKET_TIMEOUT = 'socket_timeout'
+        POOL_SOCKET_CONNECT_TIMEOUT = 'socket_connect_timeout'
+        POOL_SOCKET_KEEPALIVE = 'socket_keepalive'
+        POOL_HEALTH_CHECK_INTERVAL = 'health_check_interval'
+        RESILIENCE = 'resilience'
+
+        @classmethod
+        def optional_keys(cls):
+            return [cls.SSL.value, cls.SSL_KEY.value, cls.SSL_CERT.value, cls.SSL_CA.value,
+                    cls.POOL.value, cls.POOL_MAX_CONNECTIONS.value, cls.POOL_BLOCKING.value, cls.POOL_TIMEOUT.value,
+                    cls.POOL_SOCKET_TIMEOUT.value, cls.POOL_SOCKET_CONNECT_TIMEOUT.value,
+                    cls.POOL_SOCKET_KEEPALIVE.value, cls.POOL_HEALTH_CHECK_INTERVAL.value,
+                    cls.RESILIENCE.value]
 
         @classmethod
         def required_keys(cls):
-            return [member.value for member in cls if
-                    member.value not in [cls.SSL.value, cls.SSL_KEY.value, cls.SSL_CERT.value, cls.SSL_CA.value]]
+            return [member.value for member in cls if member.value not in cls.optional_keys()]
+
+    # The redis-py classes used to build the client and its pool.
+    client_class = Redis
+    connection_pool_class = ConnectionPool
+    blocking_connection_pool_class = BlockingConnectionPool
+    ssl_connection_class = SSLConnection
 
     def __init__(self, name, host, port, database_index, password, ssl_keyfile_path=None, ssl_certfile_path=None,
-                 ssl_ca_certs=None):
-        super().__init__(name, host, port, None, password, ssl_keyfile_path, ssl_certfile_path, ssl_ca_certs)
+                 ssl_ca_certs=None, max_connections=None, blocking=False, pool_timeout=None, socket_timeout=None,
+                 socket_connect_timeout=None, socket_keepalive=False, health_check_interval=0,
+                 resilience_policy=None):
+        super().__init__(name, host, port, None, password, ssl_keyfile_path, ssl_certfile_path, ssl_ca_certs,
+                         resilience_policy)
         self._database_index = database_index
+        self._max_connections = max_connections
+        self._blocking = blocking
+        self._pool_timeout = pool_timeout
+        self._socket_timeout = socket_timeout
+        self._socket_connect_timeout = socket_connect_timeout
+        self._socket_keepalive = socket_keepalive
+        self._health_check_interval = health_check_interval
+        self._connection_pool = None
+
+    @property
+    def connection_pool(self):
+        """Get the redis-py connection pool shared by the clients of this connection."""
+        return self._connection_pool
 
     @classmethod
     def from_dict(cls, config):
@@ -60,7 +112,8 @@ class RedisConnection(Connection):
         # Validate configuration keys
         cls.validate_dict_keys(config, config_keys)
 
-        # Extract the keys specific to MySQL from the config
+        # Extract the keys specific to Redis from the config
+        pool_config = config.get(cls.RedisConfigKeys.POOL.value, {})
         return cls(
             config[cls.RedisConfigKeys.NAME.value],
             config[cls.RedisConfigKeys.HOST.value],
@@ -69,31 +122,112 @@ class RedisConnection(Connection):
             config[cls.RedisConfigKeys.PASSWORD.value],
             config.get(cls.RedisConfigKeys.SSL.value, {}).get(cls.RedisConfigKeys.SSL_KEY.value),
             config.get(cls.RedisConfigKeys.SSL.value, {}).get(cls.RedisConfigKeys.SSL_CERT.value),
-            config.get(cls.RedisConfigKeys.SSL.value, {}).get(cls.RedisConfigKeys.SSL_CA.value)
+            config.get(cls.RedisConfigKeys.SSL.value, {}).get(cls.RedisConfigKeys.SSL_CA.value),
+            pool_config.get(cls.RedisConfigKeys.POOL_MAX_CONNECTIONS.value),
+            pool_config.get(cls.RedisConfigKeys.POOL_BLOCKING.value, False),
+            pool_config.get(cls.RedisConfigKeys.POOL_TIMEOUT.value),
+            pool_config.get(cls.RedisConfigKeys.POOL_SOCKET_TIMEOUT.value),
+            pool_config.get(cls.RedisConfigKeys.POOL_SOCKET_CONNECT_TIMEOUT.value),
+            pool_config.get(cls.RedisConfigKeys.POOL_SOCKET_KEEPALIVE.value, False),
+            pool_config.get(cls.RedisConfigKeys.POOL_HEALTH_CHECK_INTERVAL.value, 0),
+            ResiliencePolicy.from_dict(config.get(cls.RedisConfigKeys.RESILIENCE.value))
         )
 
     def connect(self, **connection_addit_kwargs):
         """
         Open the connection to the Redis database.
+
+        The connection pool is created on the first call and reused afterwards, so calling connect from several
+        datasources that share this connection doesn't open additional pools.
+
+        Args:
+        - connection_addit_kwargs: (Optional) Additional keyword arguments passed to the connection pool.
+        """
+        if self._connection_pool is None:
+            self._connection_pool = self._create_connection_pool(**connection_addit_kwargs)
+            self._connection_engine = self.client_class(connection_pool=self._connection_pool)
+
+    def _create_connection_pool(self, **connection_addit_kwargs):
         """
-        ssl = all([self._ssl_keyfile_path, self._ssl_certfile_path, self._ssl_ca_certs])
-        self._connection_engine = Redis(host=self._host,
-                                        port=self._port,
-                                        password=self._password,
-                                        ssl=ssl,
-                                        ssl_keyfile=self._ssl_keyfile_path,
-                                        ssl_certfile=self._ssl_certfile_path,
-                                        ssl_ca_certs=self._ssl_ca_certs,
-                                        **connection_addit_kwargs)
+        Create the connection pool for the Redis database, including SSL configuration if applicable.
+
+        A BlockingConnectionPool is used when blocking checkout is configured, so bursts wait (up to the pool
+        timeout) for a free connection instead of failing once max_connections is reached.
+
+        Args:
+        - connection_addit_kwargs: (Optional) Additional keyword arguments passed to the connection pool.
+
+        Returns:
+        - The redis-py connection pool.
+        """
+        pool_kwargs = {
+            'host': self._host,
+            'port': self._port,
+            'db': self._database_index,
+            'password': self._password,
+            'socket_timeout': self._socket_timeout,
+            'socket_connect_timeout': self._socket_connect_timeout,
+            'socket_keepalive': self._socket_keepalive,
+            'health_check_interval': self._health_check_interval,
+        }
+
+        if self._ssl:
+            pool_kwargs.update({
+                'connection_class': self.ssl_connection_class,
+                'ssl_keyfile': self._ssl_keyfile_path,
+                'ssl_certfile': self._ssl_certfile_path,
+                'ssl_ca_certs': self._ssl_ca_certs,
+            })
+
+        if self._blocking:
+            pool_kwargs['max_connections'] = self._max_connections or 50
+            if self._pool_timeout is not None:
+                pool_kwargs['timeout'] = self._pool_timeout
+            pool_class = self.blocking_connection_pool_class
+        else:
+            if self._max_connections is not None:
+                pool_kwargs['max_connections'] = self._max_connections
+            pool_class = self.connection_pool_class
+
+        pool_kwargs.update(connection_addit_kwargs)
+        return pool_class(**pool_kwargs)
 
     def disconnect(self):
         """
         Close the connection to the Redis database.
+
+        All pooled sockets are closed. The pool itself is kept, so clients sharing it reconnect on their next command.
         """
-        if self._connection_engine:
-            self._connection_engine.close()
+        if self._connection_pool:
+            self._connection_pool.disconnect()
 
-    def check_health(self):
+    def pool_stats(self):
+        """
+        Get the connection pool usage statistics.
+
+        Returns:
+        - A dictionary with the pool's max connections, and the created, in-use and available connection counts.
+        """
+        pool = self._connection_pool
+        if pool is None:
+            return {'max_connections': self._max_connections, 'created': 0, 'in_use': 0, 'available': 0}
+
+        if isinstance(pool, self.blocking_connection_pool_class):
+            # The blocking pool pre-fills its queue with None placeholders for connections not yet created.
+            created = len(pool._connections)
+            available = sum(1 for connection in list(pool.pool.queue) if connection is not None)
+        else:
+            created = pool._created_connections
+            available = len(pool._available_connections)
+
+        return {
+            'max_connections': pool.max_connections,
+            'created': created,
+            'in_use': created - available,
+            'available': available,
+        }
+
+    def probe_health(self):
         """
         Check whether the connection to the Redis database is healthy.
 
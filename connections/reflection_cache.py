@@ -0,0 +1,133 @@
+import logging
+import os
+import pickle
+import re
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+class ReflectionCache:
+    """
+    ReflectionCache persists reflected SQLAlchemy MetaData on the local disk, so later processes can skip reflecting
+    the database schema.
+
+    Every connection gets its own cache file, named after the connection. The file stores the reflected MetaData
+    together with the schema fingerprint it was reflected for. A cached MetaData is only returned when the caller's
+    current fingerprint matches the stored one, so a schema change invalidates the cache automatically.
+
+    The cache is a best-effort speed-up: a cache file that can't be read or written is logged and ignored, and the
+    schema is reflected from the database instead.
+
+    The cache files are pickles. They must only be read from a directory that is not writable by untrusted users.
+
+    Attributes:
+    - _directory: The path of the directory holding the cache files.
+
+    The following methods are implemented in this class:
+    - load: Loads the cached MetaData of a connection, if it matches the given fingerprint.
+    - store: Stores the reflected MetaData of a connection together with its fingerprint.
+    - invalidate: Removes the cached MetaData of a connection.
+    """
+
+    FILE_SUFFIX = '.reflection'
+
+    def __init__(self, directory):
+        """
+        Initialize the ReflectionCache.
+
+        Args:
+        - directory: The path of the directory holding the cache files. It's created if it doesn't exist.
+        """
+        self._directory = directory
+
+    @property
+    def directory(self):
+        """Get the path of the directory holding the cache files."""
+        return self._directory
+
+    def _cache_file_path(self, connection_name):
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', connection_name)
+        return os.path.join(self._directory, f"{safe_name}{self.FILE_SUFFIX}")
+
+    def load(self, connection_name, fingerprint):
+        """
+        Load the cached MetaData of a connection.
+
+        Args:
+        - connection_name: The name of the connection.
+        - fingerprint: The current schema fingerprint of the connection's database.
+
+        Returns:
+        - The cached MetaData, or None if nothing is cached, the cache is unreadable or the fingerprint doesn't match.
+        """
+        path = self._cache_file_path(connection_name)
+        try:
+            with open(path, 'rb') as file:
+                cached = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as error:
+            # A corrupt or truncated pickle can raise about any exception.
+            logger.warning("Ignoring the unreadable reflection cache file %s: %r", path, error)
+            return None
+
+        if not isinstance(cached, dict) or cached.get('fingerprint') != fingerprint:
+            return None
+
+        return cached.get('metadata')
+
+    def store(self, connection_name, fingerprint, metadata):
+        """
+        Store the reflected MetaData of a connection together with its schema fingerprint.
+
+        The file is written to a temporary name first and then moved into place, so concurrent readers (e.g. other
+        worker processes) never see a partially written cache.
+
+        Args:
+        - connection_name: The name of the connection.
+        - fingerprint: The schema fingerprint the MetaData was reflected for.
+        - metadata: The reflected SQLAlchemy MetaData.
+
+        Returns:
+        - True if the MetaData was stored, False if the cache couldn't be written (the error is logged).
+        """
+        temporary_path = None
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            file_descriptor, temporary_path = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+            with os.fdopen(file_descriptor, 'wb') as file:
+                pickle.dump({'fingerprint': fingerprint, 'metadata': metadata}, file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self._cache_file_path(connection_name))
+            return True
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as error:
+            # Unpicklable objects raise PicklingError, TypeError or AttributeError depending on the object.
+            self._remove_temporary_file(temporary_path)
+            logger.warning("Couldn't write the reflection cache of connection %s to %s: %r", connection_name,
+                           self._directory, error)
+            return False
+        except BaseException:
+            self._remove_temporary_file(temporary_path)
+            raise
+
+    @staticmethod
+    def _remove_temporary_file(path):
+        if path is None:
+            return
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def invalidate(self, connection_name):
+        """
+        Remove the cached MetaData of a connection.
+
+        Args:
+        - connection_name: The name of the connection.
+        """
+        try:
+            os.remove(self._cache_file_path(connection_name))
+        except FileNotFoundError:
+            pass
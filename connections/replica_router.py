@@ -0,0 +1,93 @@
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+
+
+class ReplicaRouter:
+    """
+    ReplicaRouter picks the engine that serves a read, among the read replicas of a SQL connection.
+
+    Two routing strategies are supported:
+    - round_robin: Replicas are used in turn.
+    - least_outstanding: The replica with the fewest checked-out pool connections (i.e. in-flight requests) is used.
+
+    With a read-your-writes window, reads issued within that many seconds of a write from the same thread (or asyncio
+    task) are served by the primary instead, so they observe the write despite the replication lag.
+
+    Attributes:
+    - _primary_engine: The SQLAlchemy engine of the primary.
+    - _replica_engines: The SQLAlchemy engines of the replicas.
+    - _strategy: The routing strategy, ROUND_ROBIN or LEAST_OUTSTANDING.
+    - _read_your_writes: The read-your-writes window in seconds, or 0 to disable it.
+    - _round_robin: An iterator cycling over the replica indexes.
+    - _lock: A lock guarding the round robin iterator.
+    - _last_write: A context variable holding the monotonic time of the last write of the current thread or task.
+
+    The following methods are implemented in this class:
+    - record_write: Records that the current thread or task is writing to the primary.
+    - engine_for_read: Returns the engine that should serve a read.
+    """
+
+    ROUND_ROBIN = 'round_robin'
+    LEAST_OUTSTANDING = 'least_outstanding'
+
+    def __init__(self, primary_engine, replica_engines, strategy=ROUND_ROBIN, read_your_writes=0):
+        """
+        Initialize the ReplicaRouter.
+
+        Args:
+        - primary_engine: The SQLAlchemy engine of the primary.
+        - replica_engines: The SQLAlchemy engines of the replicas.
+        - strategy: (Optional) The routing strategy, 'round_robin' or 'least_outstanding'.
+        - read_your_writes: (Optional) The read-your-writes window in seconds, or 0 to disable it.
+
+        Raises:
+        - ValueError: If the strategy is unknown.
+        """
+        if strategy not in (self.ROUND_ROBIN, self.LEAST_OUTSTANDING):
+            raise ValueError(f"Unknown read routing strategy: {strategy}")
+
+        self._primary_engine = primary_engine
+        self._replica_engines = list(replica_engines)
+        self._strategy = strategy
+        self._read_your_writes = read_your_writes or 0
+        self._round_robin = itertools.cycle(range(len(self._replica_engines)))
+        self._lock = threading.Lock()
+        self._last_write = ContextVar(f"replica_router_last_write_{id(self)}", default=None)
+
+    def record_write(self):
+        """
+        Record that the current thread or task is writing to the primary, opening its read-your-writes window.
+        """
+        if self._read_your_writes:
+            self._last_write.set(time.monotonic())
+
+    def _within_read_your_writes_window(self):
+        last_write = self._last_write.get()
+        return last_write is not None and time.monotonic() - last_write < self._read_your_writes
+
+    def engine_for_read(self):
+        """
+        Get the engine that should serve a read.
+
+        Returns:
+        - The primary engine if there are no replicas or the read-your-writes window is open, a replica engine
+          picked by the routing strategy otherwise.
+        """
+        if not self._replica_engines or self._within_read_your_writes_window():
+            return self._primary_engine
+
+        with self._lock:
+            start = next(self._round_robin)
+        candidates = self._replica_engines[start:] + self._replica_engines[:start]
+
+        if self._strategy == self.LEAST_OUTSTANDING:
+            # Starting from the round robin position breaks ties between equally loaded replicas.
+            return min(candidates, key=self._outstanding_requests)
+        return candidates[0]
+
+    @staticmethod
+    def _outstanding_requests(engine):
+        checkedout = getattr(engine.pool, 'checkedout', None)
+        return checkedout() if callable(checkedout) else 0
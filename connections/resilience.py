@@ -0,0 +1,302 @@
+import functools
+import random
+import threading
+import time
+from enum import Enum
+
+from connections.exceptions.connection import CircuitBreakerOpen
+
+
+class RetryPolicy:
+    """
+    RetryPolicy describes how transient failures are retried: a bounded number of attempts separated by an
+    exponential backoff with full jitter, so clients that failed together don't retry together.
+
+    Attributes:
+    - max_attempts: The total number of attempts, including the first one.
+    - base_delay: The backoff before the first retry, in seconds (before jitter).
+    - max_delay: The upper bound of the backoff, in seconds.
+    - multiplier: The backoff growth factor between two retries.
+    """
+
+    def __init__(self, max_attempts=3, base_delay=0.1, max_delay=2.0, multiplier=2.0):
+        """
+        Initialize the RetryPolicy.
+
+        Args:
+        - max_attempts: (Optional) The total number of attempts, including the first one.
+        - base_delay: (Optional) The backoff before the first retry, in seconds.
+        - max_delay: (Optional) The upper bound of the backoff, in seconds.
+        - multiplier: (Optional) The backoff growth factor between two retries.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+
+    def backoff(self, attempt):
+        """
+        Get the delay before the next attempt.
+
+        Args:
+        - attempt: The number of the attempt that just failed, starting at 1.
+
+        Returns:
+        - The number of seconds to sleep, drawn uniformly between 0 and the exponential backoff.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    CircuitBreaker stops calling a backend that keeps failing, and probes it again after a cool-down.
+
+    - CLOSED: Calls go through. After failure_threshold consecutive failures, the breaker opens.
+    - OPEN: Calls fail fast with CircuitBreakerOpen. After recovery_timeout seconds, the breaker half-opens.
+    - HALF_OPEN: Up to half_open_max_calls probe calls go through. A success closes the breaker, a failure re-opens it.
+
+    Attributes:
+    - failure_threshold: The number of consecutive failures that opens the breaker.
+    - recovery_timeout: The number of seconds the breaker stays open before half-opening.
+    - half_open_max_calls: The number of concurrent probe calls allowed while half-open.
+    - _state: The current state.
+    - _failures: The number of consecutive failures.
+    - _opened_at: The monotonic time the breaker opened at.
+    - _half_open_calls: The number of probe calls in flight while half-open.
+    - _lock: A lock guarding the state.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0, half_open_max_calls=1):
+        """
+        Initialize the CircuitBreaker.
+
+        Args:
+        - failure_threshold: (Optional) The number of consecutive failures that opens the breaker.
+        - recovery_timeout: (Optional) The number of seconds the breaker stays open before half-opening.
+        - half_open_max_calls: (Optional) The number of concurrent probe calls allowed while half-open.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """Get the current state of the breaker, half-opening it if its recovery timeout elapsed."""
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    def _refresh_state(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+
+    def before_call(self):
+        """
+        Ask the breaker for permission to call the backend.
+
+        Raises:
+        - CircuitBreakerOpen: If the breaker is open, or half-open with all probe calls in flight.
+        """
+        with self._lock:
+            self._refresh_state()
+            if self._state == self.OPEN:
+                raise CircuitBreakerOpen("Circuit breaker is open, failing fast.")
+            if self._state == self.HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    raise CircuitBreakerOpen("Circuit breaker is half-open and already probing the backend.")
+                self._half_open_calls += 1
+
+    def record_success(self):
+        """
+        Record a successful call, closing the breaker.
+        """
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._half_open_calls = 0
+
+    def record_failure(self):
+        """
+        Record a failed call, opening the breaker if the threshold is reached or if it was half-open.
+        """
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._half_open_calls = 0
+
+    def record_release(self):
+        """
+        Record a call that neither succeeded nor failed transiently (e.g. a constraint violation), releasing its
+        half-open probe slot without changing the state.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+
+class ResiliencePolicy:
+    """
+    ResiliencePolicy wraps datasource operations with retries and a circuit breaker. It's configured per connection,
+    under the connection's 'resilience' key:
+
+        resilience:
+          retry:
+            max_attempts: 3
+            base_delay: 0.1
+            max_delay: 2
+          circuit_breaker:
+            failure_threshold: 5
+            recovery_timeout: 30
+            half_open_max_calls: 1
+
+    Only transient errors (as classified by the datasource) are retried and counted by the circuit breaker, and only
+    operations marked idempotent are retried.
+
+    Attributes:
+    - retry_policy: (Optional) The RetryPolicy, or None to disable retries.
+    - circuit_breaker: (Optional) The CircuitBreaker, or None to disable it.
+
+    The following methods are implemented in this class:
+    - from_dict: A class method that creates a ResiliencePolicy from a configuration dictionary.
+    - execute: Runs an operation under the policy.
+    """
+
+    class ResilienceConfigKeys(Enum):
+        RETRY = 'retry'
+        RETRY_MAX_ATTEMPTS = 'max_attempts'
+        RETRY_BASE_DELAY = 'base_delay'
+        RETRY_MAX_DELAY = 'max_delay'
+        RETRY_MULTIPLIER = 'multiplier'
+        CIRCUIT_BREAKER = 'circuit_breaker'
+        CIRCUIT_BREAKER_FAILURE_THRESHOLD = 'failure_threshold'
+        CIRCUIT_BREAKER_RECOVERY_TIMEOUT = 'recovery_timeout'
+        CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS = 'half_open_max_calls'
+
+    def __init__(self, retry_policy=None, circuit_breaker=None):
+        """
+        Initialize the ResiliencePolicy.
+
+        Args:
+        - retry_policy: (Optional) The RetryPolicy.
+        - circuit_breaker: (Optional) The CircuitBreaker.
+        """
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+
+    @classmethod
+    def from_dict(cls, config):
+        """
+        Create a ResiliencePolicy from a configuration dictionary.
+
+        Args:
+        - config: The 'resilience' section of a connection configuration, or None.
+
+        Returns:
+        - A ResiliencePolicy, or None if the configuration is empty.
+        """
+        if not config:
+            return None
+
+        keys = cls.ResilienceConfigKeys
+        retry_policy = None
+        retry_config = config.get(keys.RETRY.value)
+        if retry_config is not None:
+            retry_policy = RetryPolicy(
+                retry_config.get(keys.RETRY_MAX_ATTEMPTS.value, 3),
+                retry_config.get(keys.RETRY_BASE_DELAY.value, 0.1),
+                retry_config.get(keys.RETRY_MAX_DELAY.value, 2.0),
+                retry_config.get(keys.RETRY_MULTIPLIER.value, 2.0)
+            )
+
+        circuit_breaker = None
+        circuit_breaker_config = config.get(keys.CIRCUIT_BREAKER.value)
+        if circuit_breaker_config is not None:
+            circuit_breaker = CircuitBreaker(
+                circuit_breaker_config.get(keys.CIRCUIT_BREAKER_FAILURE_THRESHOLD.value, 5),
+                circuit_breaker_config.get(keys.CIRCUIT_BREAKER_RECOVERY_TIMEOUT.value, 30.0),
+                circuit_breaker_config.get(keys.CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS.value, 1)
+            )
+
+        return cls(retry_policy, circuit_breaker)
+
+    def execute(self, operation, is_transient_error, idempotent):
+        """
+        Run an operation under the policy.
+
+        Args:
+        - operation: A callable without arguments performing the operation.
+        - is_transient_error: A callable classifying an exception as transient (True) or not.
+        - idempotent: Whether the operation may be retried after a transient error.
+
+        Returns:
+        - The result of the operation.
+
+        Raises:
+        - CircuitBreakerOpen: If the circuit breaker doesn't allow calling the backend.
+        - The error of the last attempt, if every attempt failed.
+        """
+        max_attempts = self.retry_policy.max_attempts if self.retry_policy is not None and idempotent else 1
+
+        attempt = 1
+        while True:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_call()
+
+            try:
+                result = operation()
+            except Exception as error:
+                if not is_transient_error(error):
+                    if self.circuit_breaker is not None:
+                        self.circuit_breaker.record_release()
+                    raise
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+                if attempt >= max_attempts:
+                    raise
+                time.sleep(self.retry_policy.backoff(attempt))
+                attempt += 1
+                continue
+
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_success()
+            return result
+
+
+def resilient(idempotent):
+    """
+    Decorate a datasource method so it runs under its connection's ResiliencePolicy, if one is configured.
+
+    The datasource classifies errors through its _is_transient_error method. Operations running inside a
+    transaction scope aren't retried, as the rest of the transaction can't be replayed.
+
+    Args:
+    - idempotent: Whether the operation may safely be retried after a transient error.
+
+    Returns:
+    - The method decorator.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            policy = self._connection.resilience_policy
+            if policy is None:
+                return method(self, *args, **kwargs)
+            return policy.execute(lambda: method(self, *args, **kwargs), self._is_transient_error,
+                                  idempotent and not self._connection.in_transaction)
+
+        return wrapper
+
+    return decorator
@@ -1,11 +1,47 @@
+import contextlib
+import threading
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
 
-from sqlalchemy import exc, text
+from sqlalchemy import MetaData, Table, event, exc, text
 from sqlalchemy.ext.automap import automap_base
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from connections.compiled_cache_statistics import CompiledCacheStatistics
 from connections.connection import Connection
+from connections.pool_statistics import PoolStatistics, TimedQueuePool
+from connections.reflection_cache import ReflectionCache
+from connections.replica_router import ReplicaRouter
+
+
+class _TransactionSession:
+    """
+    _TransactionSession is the session handed out by get_new_session inside a transaction scope.
+
+    It proxies the scope's session, so that datasource methods written as "open a session, commit, close" join the
+    scope's transaction instead: commit only flushes, and close does nothing. Flushing on every commit sends each
+    call's changes right away, so their errors are raised by the call that made them, and later statements of the
+    scope (including Core and raw SQL ones, which don't autoflush) see them. A flush without pending changes costs
+    nothing.
+
+    Attributes:
+    - session: The SQLAlchemy session of the scope.
+    - callbacks: The callables to run once the outermost scope has ended.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.callbacks = []
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    def commit(self):
+        self.session.flush()
+
+    def close(self):
+        pass
 
 
 class SQLConnection(Connection, ABC):
@@ -18,23 +54,78 @@ class SQLConnection(Connection, ABC):
     - _automap_base_model: An SQLAlchemy AutomapBase instance for automatically generating ORM classes from database tables.
     - _declarative_base_model: An SQLAlchemy declarative base class for declaring new models.
     - _user_defined_models: A list of user-defined SQLAlchemy model classes.
+    - _pool_size: (Optional) The number of connections to keep open inside the connection pool.
+    - _max_overflow: (Optional) The number of connections that can be opened beyond the pool size.
+    - _pool_timeout: (Optional) The number of seconds to wait for a connection before giving up.
+    - _pool_recycle: (Optional) The number of seconds after which a pooled connection is replaced.
+    - _pool_pre_ping: Whether to test connections for liveness upon each checkout.
+    - _pool_use_lifo: Whether to use LIFO (instead of FIFO) when retrieving connections from the pool.
+    - _pool_statistics: A PoolStatistics instance collecting the pool checkout wait times.
+    - _compiled_cache_statistics: A CompiledCacheStatistics instance counting the compiled cache hits and misses of
+      the statements run on the primary and the replicas.
+    - _reflection_cache: (Optional) A ReflectionCache instance persisting the reflected schema between processes.
+    - _lazy_reflection: Whether tables are reflected on demand by get_model instead of eagerly on connect.
+    - _lazy_metadata: The MetaData holding the tables reflected so far in lazy mode.
+    - _lazy_base_model: The declarative base class the lazily reflected tables are mapped onto.
+    - _lazy_models: A dictionary mapping table names to the models mapped so far in lazy mode.
+    - _reflection_lock: A lock serializing the lazy reflection of tables.
+    - _replicas: A list of (host, port) tuples of the read replicas.
+    - _read_routing: The strategy routing reads among the replicas, 'round_robin' or 'least_outstanding'.
+    - _read_your_writes: The number of seconds after a write during which reads of the same thread stay on the primary.
+    - _replica_engines: The SQLAlchemy engines of the read replicas.
+    - _replica_router: The ReplicaRouter picking the engine that serves each read.
+    - _transaction_session: A ContextVar holding the session of the transaction scope open in the current thread or
+      task, if any.
 
     The following methods are implemented in this class:
     - connect: Opens the connection to the database.
     - disconnect: Closes the connection to the database.
-    - check_health: Checks whether the connection to the database is healthy.
+    - probe_health: Probes whether the connection to the database is healthy.
     - register_model: Registers a user-defined model.
     - create_all_user_defined_models: Creates tables for all user-defined models.
     - declarative_base_model: Property that returns the declarative_base_model.
+    - pool_stats: Returns the connection pool usage statistics.
+    - compiled_cache_stats: Returns the hit rate of SQLAlchemy's compiled statement cache.
+    - get_model: Returns the model mapped to a table, reflecting the table on first use in lazy mode.
+    - get_new_session: Returns a new session, bound to a read replica for read-only sessions.
+    - transaction: Opens a transaction scope shared by the sessions requested inside it.
+    - after_transaction: Registers a callable to run once the current transaction scope has ended.
 
     The following methods are required to be implemented in any child class:
     - create_connection_string: Returns the connection string specific to the type of SQL database.
+
+    The following methods may be overridden by child classes:
+    - _schema_fingerprint: Returns a cheap fingerprint of the database schema, enabling the reflection cache.
     """
 
     def __init__(self, name, host, port, database, username, password, ssl_keyfile_path=None, ssl_certfile_path=None,
-                 ssl_ca_certs=None):
-        super().__init__(name, host, port, username, password, ssl_keyfile_path, ssl_certfile_path, ssl_ca_certs)
+                 ssl_ca_certs=None, pool_size=None, max_overflow=None, pool_timeout=None, pool_recycle=None,
+                 pool_pre_ping=False, pool_use_lifo=False, reflection_cache_directory=None,
+                 lazy_reflection=False, resilience_policy=None, replicas=None, read_routing=ReplicaRouter.ROUND_ROBIN,
+                 read_your_writes=0):
+        super().__init__(name, host, port, username, password, ssl_keyfile_path, ssl_certfile_path, ssl_ca_certs,
+                         resilience_policy)
         self._database = database
+        self._pool_size = pool_size
+        self._max_overflow = max_overflow
+        self._pool_timeout = pool_timeout
+        self._pool_recycle = pool_recycle
+        self._pool_pre_ping = pool_pre_ping
+        self._pool_use_lifo = pool_use_lifo
+        self._pool_statistics = PoolStatistics()
+        self._compiled_cache_statistics = CompiledCacheStatistics()
+        self._reflection_cache = ReflectionCache(reflection_cache_directory) if reflection_cache_directory else None
+        self._lazy_reflection = lazy_reflection
+        self._lazy_metadata = None
+        self._lazy_base_model = None
+        self._lazy_models = {}
+        self._reflection_lock = threading.Lock()
+        self._replicas = list(replicas or [])
+        self._read_routing = read_routing
+        self._read_your_writes = read_your_writes
+        self._replica_engines = []
+        self._replica_router = None
+        self._transaction_session = ContextVar(f"sql_transaction_{name}_{id(self)}", default=None)
         self._session_maker = None
         self._automap_base_model = None
         self._declarative_base_model = None
@@ -48,33 +139,335 @@ class SQLConnection(Connection, ABC):
 
     @property
     def automap_base_model(self):
-        """Get the SQLAlchemy declarative automap base model class instance."""
+        """Get the SQLAlchemy declarative automap base model class instance. It's None in lazy reflection mode."""
         return self._automap_base_model
 
     @abstractmethod
-    def _create_engine(self):
+    def _create_engine(self, host=None, port=None):
+        """
+        Create a SQLAlchemy engine.
+
+        Args:
+        - host: (Optional) The host to connect to. Defaults to the primary's host.
+        - port: (Optional) The port to connect to. Defaults to the primary's port.
+
+        Returns:
+        - The SQLAlchemy engine.
+        """
         pass
 
-    def get_new_session(self):
-        """Get new SQLAlchemy session"""
+    def _pool_args(self, poolclass=TimedQueuePool):
+        """
+        Build the connection pool arguments for SQLAlchemy's create_engine.
+        Only the settings that were configured are passed, so SQLAlchemy's defaults apply to the rest.
+
+        Args:
+        - poolclass: (Optional) The pool class to use. Pass None to let SQLAlchemy pick the dialect's default.
+
+        Returns:
+        - A dictionary of keyword arguments for create_engine.
+        """
+        pool_args = {}
+        if poolclass is not None:
+            pool_args['poolclass'] = poolclass
+        if self._pool_size is not None:
+            pool_args['pool_size'] = self._pool_size
+        if self._max_overflow is not None:
+            pool_args['max_overflow'] = self._max_overflow
+        if self._pool_timeout is not None:
+            pool_args['pool_timeout'] = self._pool_timeout
+        if self._pool_recycle is not None:
+            pool_args['pool_recycle'] = self._pool_recycle
+        if self._pool_pre_ping:
+            pool_args['pool_pre_ping'] = True
+        if self._pool_use_lifo:
+            pool_args['pool_use_lifo'] = True
+        return pool_args
+
+    def _attach_pool_statistics(self):
+        """
+        Attach the pool statistics collector to the engine's connection pool.
+        """
+        pool = self._connection_engine.pool
+        if isinstance(pool, TimedQueuePool):
+            pool.wait_statistics = self._pool_statistics
+
+    def pool_stats(self):
+        """
+        Get the connection pool usage statistics.
+
+        Returns:
+        - A dictionary with the pool size, the checked-out, idle and overflow connection counts, and the checkout
+          wait time statistics (see PoolStatistics.snapshot). Counts the pool doesn't support are reported as None.
+        """
+        pool = self._connection_engine.pool if self._connection_engine is not None else None
+
+        def pool_count(method_name):
+            method = getattr(pool, method_name, None)
+            return method() if callable(method) else None
+
+        overflow = pool_count('overflow')
+
+        stats = {
+            'size': pool_count('size'),
+            'checked_out': pool_count('checkedout'),
+            'idle': pool_count('checkedin'),
+            # QueuePool reports a negative overflow while the pool itself isn't full.
+            'overflow': max(overflow, 0) if overflow is not None else None,
+        }
+        stats.update(self._pool_statistics.snapshot())
+        return stats
+
+    def _attach_compiled_cache_statistics(self, engine):
+        """
+        Attach the compiled cache statistics collector to an engine, recording the cache status of every statement.
+
+        Args:
+        - engine: The SQLAlchemy engine.
+        """
+        statistics = self._compiled_cache_statistics
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def record(connection, cursor, statement, parameters, context, executemany):
+            statistics.record(getattr(context, 'cache_hit', None))
+
+    def compiled_cache_stats(self):
+        """
+        Get the hit rate of SQLAlchemy's compiled statement cache, over the statements run since connect.
+
+        Statements whose conditions are bound parameters compile to the same SQL for every value and are hits after
+        their first run, while inlined literals make every distinct value a miss.
+
+        Returns:
+        - A dictionary with the hit, miss and uncached statement counts and the hit rate (see
+          CompiledCacheStatistics.snapshot), and the number of entries of the primary engine's compiled cache.
+        """
+        stats = self._compiled_cache_statistics.snapshot()
+        engine = self._connection_engine
+        cache = getattr(engine, '_compiled_cache', None) if engine is not None else None
+        stats['entries'] = len(cache) if cache is not None else None
+        return stats
+
+    @property
+    def in_transaction(self):
+        """Get whether a transaction scope is open in the current thread or task."""
+        return self._transaction_session.get() is not None
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Open a transaction scope. Until it ends, get_new_session returns the scope's session in the current thread
+        or task, so the datasource calls made inside it share one session, one connection and one transaction.
+
+        The scope commits when it exits normally and rolls back if it raises. Nested scopes are savepoints: an error
+        raised inside a nested scope only rolls back the nested scope's changes. Resilient datasource methods aren't
+        retried inside a scope, as a retry can't replay the rest of the transaction.
+
+        Returns:
+        - A context manager yielding the scope's session.
+        """
+        transaction_session = self._transaction_session.get()
+        if transaction_session is not None:
+            savepoint = transaction_session.session.begin_nested()
+            try:
+                yield transaction_session
+            except BaseException:
+                savepoint.rollback()
+                raise
+            savepoint.commit()
+            return
+
+        self._replica_router.record_write()
+        transaction_session = _TransactionSession(self._session_maker())
+        token = self._transaction_session.set(transaction_session)
+        try:
+            try:
+                yield transaction_session
+            except BaseException:
+                transaction_session.session.rollback()
+                raise
+            transaction_session.session.commit()
+        finally:
+            self._transaction_session.reset(token)
+            transaction_session.session.close()
+            for callback in transaction_session.callbacks:
+                callback()
+
+    def after_transaction(self, callback):
+        """
+        Register a callable to run once the current transaction scope has ended, committed or rolled back. It's not
+        called if there's no transaction scope.
+
+        Args:
+        - callback: A callable taking no arguments.
+        """
+        transaction_session = self._transaction_session.get()
+        if transaction_session is not None:
+            transaction_session.callbacks.append(callback)
+
+    def get_new_session(self, read_only=False):
+        """
+        Get new SQLAlchemy session.
+
+        Read-only sessions are bound to the engine picked by the replica router, which is the primary when no replicas
+        are configured. Other sessions are bound to the primary, and open the read-your-writes window. Inside a
+        transaction scope, the scope's session is returned instead (see transaction).
+
+        Args:
+        - read_only: (Optional) Whether the session only reads, and may be served by a replica.
+
+        Returns:
+        - The SQLAlchemy session.
+        """
+        transaction_session = self._transaction_session.get()
+        if transaction_session is not None:
+            return transaction_session
+
+        if read_only:
+            return self._session_maker(bind=self._replica_router.engine_for_read())
+
+        self._replica_router.record_write()
         return self._session_maker()
 
+    def _connect_replicas(self):
+        """
+        Create the engines of the read replicas and the router distributing reads among them.
+        """
+        self._replica_engines = [self._create_engine(host, port) for host, port in self._replicas]
+        self._replica_router = ReplicaRouter(self._connection_engine, self._replica_engines, self._read_routing,
+                                             self._read_your_writes)
+
     def connect(self):
         """
-        Open the connection to the SQL database.
+        Open the connection to the SQL database, and to its read replicas if any are configured.
         """
-        self._create_engine()
+        self._connection_engine = self._create_engine()
+        self._attach_pool_statistics()
+        self._connect_replicas()
+        for engine in [self._connection_engine, *self._replica_engines]:
+            self._attach_compiled_cache_statistics(engine)
         self._session_maker = sessionmaker(bind=self._connection_engine)
 
-        # Auto map base - Initiate models for the existing tables in the database.
-        self._initiate_automap_base_model()
+        if self._lazy_reflection:
+            # Lazy reflection - Tables are reflected and mapped on their first get_model call.
+            self._initiate_lazy_base_model()
+        else:
+            # Auto map base - Initiate models for the existing tables in the database.
+            self._initiate_automap_base_model()
 
     def _initiate_automap_base_model(self):
         """
         Prepare AutomapBase model.
         """
-        self._automap_base_model = automap_base()
-        self._automap_base_model.prepare(self._connection_engine, reflect=True)
+        with self._connection_engine.connect() as connection:
+            metadata = self._reflect_metadata(connection)
+
+        self._automap_base_model = automap_base(metadata=metadata)
+        self._automap_base_model.prepare()
+
+    def _initiate_lazy_base_model(self):
+        """
+        Prepare an empty MetaData and base model for lazy, per-table reflection.
+        """
+        self._lazy_metadata = MetaData()
+        self._lazy_base_model = declarative_base(metadata=self._lazy_metadata)
+        self._lazy_models = {}
+
+    def get_model(self, table_name):
+        """
+        Get the SQLAlchemy model for the given table name.
+
+        In lazy reflection mode, the first call for a table reflects only that table (and the tables its foreign keys
+        refer to), maps it and memoizes the model. Later calls are served from the memoized models.
+
+        Args:
+        - table_name: The name of the table.
+
+        Returns:
+        - The SQLAlchemy model for the table, or None if no such table exists or it has no primary key.
+        """
+        if not self._lazy_reflection:
+            return self._automap_base_model.classes.get(table_name)
+
+        model = self._lazy_models.get(table_name)
+        if model is not None:
+            return model
+
+        with self._reflection_lock:
+            model = self._lazy_models.get(table_name)
+            if model is None:
+                model = self._reflect_model(table_name, self._connection_engine)
+                if model is not None:
+                    self._lazy_models[table_name] = model
+            return model
+
+    def _reflect_model(self, table_name, bind):
+        """
+        Reflect a single table and map it onto the lazy base model. Must be called with the reflection lock held.
+
+        Args:
+        - table_name: The name of the table.
+        - bind: The SQLAlchemy engine or connection used for the reflection.
+
+        Returns:
+        - The SQLAlchemy model for the table, or None if no such table exists or it has no primary key.
+        """
+        try:
+            # Foreign key targets are reflected along with the table, so the mapping can resolve them.
+            table = Table(table_name, self._lazy_metadata, autoload_with=bind)
+        except exc.NoSuchTableError:
+            return None
+
+        if not table.primary_key:
+            return None
+
+        return type(str(table_name), (self._lazy_base_model,), {'__table__': table})
+
+    def _reflect_metadata(self, connection):
+        """
+        Reflect the database schema into a MetaData instance.
+
+        When a reflection cache is configured and the dialect provides a schema fingerprint, the MetaData is loaded
+        from the cache as long as the fingerprint is unchanged. Otherwise, the schema is reflected from the database
+        and the cache is refreshed.
+
+        Args:
+        - connection: An open SQLAlchemy connection to the database.
+
+        Returns:
+        - The reflected SQLAlchemy MetaData.
+        """
+        fingerprint = None
+        if self._reflection_cache is not None:
+            fingerprint = self._schema_fingerprint(connection)
+
+        if fingerprint is not None:
+            metadata = self._reflection_cache.load(self._name, fingerprint)
+            if metadata is not None:
+                return metadata
+
+        metadata = MetaData()
+        metadata.reflect(bind=connection)
+
+        if fingerprint is not None:
+            self._reflection_cache.store(self._name, fingerprint, metadata)
+
+        return metadata
+
+    def _schema_fingerprint(self, connection):
+        """
+        Compute a cheap fingerprint of the database schema, used to validate the reflection cache.
+        The fingerprint must change whenever a table, column or key constraint changes.
+
+        The base implementation doesn't support fingerprinting, which disables the reflection cache.
+
+        Args:
+        - connection: An open SQLAlchemy connection to the database.
+
+        Returns:
+        - A string fingerprint of the schema, or None if fingerprinting isn't supported.
+        """
+        return None
 
     def _initiate_declarative_base_model(self):
         """
@@ -105,7 +498,7 @@ class SQLConnection(Connection, ABC):
         """
         pass
 
-    def check_health(self):
+    def probe_health(self):
         """
         Check whether the connection to the SQL database is healthy.
 
@@ -113,18 +506,22 @@ class SQLConnection(Connection, ABC):
         - True if the connection is healthy, False otherwise.
         """
         try:
-            session = self.get_new_session()  # Using the get_new_session method in SQLConnection
-            session.execute(text("SELECT 1"))
-            session.close()
+            # The primary is probed directly, so the probe doesn't count as a write for read-your-writes.
+            with self._connection_engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
             return True
         except exc.DBAPIError:
             return False
 
     @abstractmethod
-    def create_connection_string(self):
+    def create_connection_string(self, host=None, port=None):
         """
         Create a connection string specific to the type of SQL database.
 
+        Args:
+        - host: (Optional) The host to connect to. Defaults to the primary's host.
+        - port: (Optional) The port to connect to. Defaults to the primary's port.
+
         Returns:
         - The connection string.
         """
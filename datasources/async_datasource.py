@@ -0,0 +1,71 @@
+from abc import ABC
+
+from connections.connection import Connection
+
+
+class AsyncDataSource(ABC):
+    """
+    AsyncDataSource is the asyncio counterpart of DataSource. It handles an async connection (see AsyncConnection)
+    and is used with Python's async with statement.
+
+    Attributes:
+    - _connection: An async Connection object that manages the connection to the database.
+
+    The following methods are implemented in this class:
+    - connect: Opens the connection to the database (coroutine).
+    - disconnect: Closes the connection to the database (coroutine).
+    - check_health: Checks whether the connection to the database is healthy (coroutine).
+    """
+
+    def __init__(self, connection: Connection):
+        """
+        Construct a new AsyncDataSource instance.
+
+        Args:
+        - connection: An async Connection object that manages the connection to the database.
+        """
+        self._connection = connection
+
+    @property
+    def _connection_engine(self):
+        return self._connection.connection_engine
+
+    @property
+    def connection_engine(self):
+        """
+        Get the connection engine that is used to interact with the database.
+
+        Returns:
+        - The connection engine.
+        """
+        return self._connection_engine
+
+    async def connect(self):
+        """
+        Open the connection to the database.
+        """
+        await self._connection.connect()
+
+    async def disconnect(self):
+        """
+        Close the connection to the database.
+        """
+        await self._connection.disconnect()
+
+    async def check_health(self):
+        """
+        Check whether the connection to the database is healthy.
+
+        Returns:
+        - True if the connection is healthy, False otherwise.
+        """
+        return await self._connection.check_health()
+
+    async def __aenter__(self):
+        """Open the datasource connection when entering an async with statement."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close the datasource connection when exiting an async with statement."""
+        await self.disconnect()
@@ -0,0 +1,208 @@
+import json
+from typing import TYPE_CHECKING
+
+from datasources.async_datasource import AsyncDataSource
+
+if TYPE_CHECKING:
+    from connections.async_redis_connection import AsyncRedisConnection
+
+
+class AsyncRedisDataSource(AsyncDataSource):
+    """
+    AsyncRedisDataSource is the asyncio counterpart of RedisDataSource. It interfaces with a Redis database through
+    an AsyncRedisConnection, and every method is a coroutine.
+
+    This class is designed to work with redis.asyncio, the asyncio interface of redis-py.
+
+    Methods:
+    - connect: Establishes a connection to the Redis server.
+    - disconnect: Disconnects from the Redis server.
+    - set_key: Sets the value of a key in Redis.
+    - get_key: Retrieves the value of a key from Redis.
+    - delete_key: Deletes a key from Redis.
+    - key_exists: Checks if a key exists in Redis.
+    - set_hash_field: Sets the value of a field in a Redis hash.
+    - get_hash_field: Retrieves the value of a field from a Redis hash.
+    - delete_hash_field: Deletes a field from a Redis hash.
+    - set_set_value: Adds one or more values to a Redis set.
+    - get_set_values: Retrieves all values from a Redis set.
+    - remove_set_value: Removes one or more values from a Redis set.
+    - set_json_value: Sets the value of a key in Redis as a JSON object using RedisJSON.
+    - get_json_value: Retrieves the value of a key from Redis as a JSON object using RedisJSON.
+
+    Note: This implementation assumes the availability of appropriate Redis commands in the underlying connection engine.
+    """
+
+    def __init__(self, connection: 'AsyncRedisConnection'):
+        super().__init__(connection)
+
+    async def set_key(self, key: str, value: str, ttl=None):
+        """
+        Set the value of a key in Redis.
+
+        Args:
+        - key: The key to set.
+        - value: The value to set.
+        - ttl: (Optional) The time to live of the key, in seconds. Defaults to no expiry.
+
+        Returns:
+        - True if the operation was successful, False otherwise.
+        """
+        return await self._connection_engine.set(key, value, ex=ttl)
+
+    async def get_key(self, key: str):
+        """
+        Retrieve the value of a key from Redis.
+
+        Args:
+        - key: The key to retrieve.
+
+        Returns:
+        - The value of the key if it exists, None otherwise.
+        """
+        return await self._connection_engine.get(key)
+
+    async def delete_key(self, key: str):
+        """
+        Delete a key from Redis.
+
+        Args:
+        - key: The key to delete.
+
+        Returns:
+        - The number of keys deleted.
+        """
+        return await self._connection_engine.delete(key)
+
+    async def key_exists(self, key: str):
+        """
+        Check if a key exists in Redis.
+
+        Args:
+        - key: The key to check.
+
+        Returns:
+        - True if the key exists, False otherwise.
+        """
+        return await self._connection_engine.exists(key)
+
+    async def set_hash_field(self, key: str, field: str, value: str):
+        """
+        Set the value of a field in a Redis hash.
+
+        Args:
+        - key: The key of the hash.
+        - field: The field to set.
+        - value: The value to set.
+
+        Returns:
+        - True if the operation was successful, False otherwise.
+        """
+        return await self._connection_engine.hset(key, field, value)
+
+    async def get_hash_field(self, key: str, field: str):
+        """
+        Retrieve the value of a field from a Redis hash.
+
+        Args:
+        - key: The key of the hash.
+        - field: The field to retrieve.
+
+        Returns:
+        - The value of the field if it exists, None otherwise.
+        """
+        return await self._connection_engine.hget(key, field)
+
+    async def delete_hash_field(self, key: str, field: str):
+        """
+        Delete a field from a Redis hash.
+
+        Args:
+        - key: The key of the hash.
+        - field: The field to delete.
+
+        Returns:
+        - The number of fields deleted.
+        """
+        return await self._connection_engine.hdel(key, field)
+
+    async def set_set_value(self, key: str, *values, ttl=None):
+        """
+        Add one or more values to a Redis set.
+
+        Args:
+        - key: The key of the set.
+        - values: The values to add.
+        - ttl: (Optional) The time to live of the set, in seconds, reset by every call. Defaults to leaving the
+          set's expiry as it is.
+
+        Returns:
+        - The number of elements added to the set.
+        """
+        if not values:
+            return 0
+        if ttl is None:
+            return await self._connection_engine.sadd(key, *values)
+        pipeline = self._connection_engine.pipeline(transaction=False)
+        pipeline.sadd(key, *values)
+        pipeline.expire(key, ttl)
+        return (await pipeline.execute())[0]
+
+    async def get_set_values(self, key: str):
+        """
+        Retrieve all values from a Redis set.
+
+        Args:
+        - key: The key of the set.
+
+        Returns:
+        - A set containing all values in the set.
+        """
+        return await self._connection_engine.smembers(key)
+
+    async def remove_set_value(self, key: str, *values):
+        """
+        Remove one or more values from a Redis set.
+
+        Args:
+        - key: The key of the set.
+        - values: The values to remove.
+
+        Returns:
+        - The number of elements removed from the set.
+        """
+        if not values:
+            return 0
+        return await self._connection_engine.srem(key, *values)
+
+    async def set_json_value(self, key: str, value):
+        """
+        Sets the value of a key in Redis as a JSON object using RedisJSON.
+
+        Args:
+        - key: The key to set.
+        - value: The JSON object to set.
+
+        Returns:
+        - True if the operation was successful, False otherwise.
+        """
+        json_value = json.dumps(value)
+        return await self._connection_engine.execute_command('JSON.SET', key, '.', json_value)
+
+    async def get_json_value(self, key: str):
+        """
+        Retrieves the value of a key from Redis as a JSON object using RedisJSON.
+
+        Args:
+        - key: The key to retrieve.
+
+        Returns:
+        - The JSON object value if the key exists and is a valid JSON, None otherwise.
+        """
+        json_response = await self._connection_engine.execute_command('JSON.GET', key)
+        if json_response is not None:
+            try:
+                return json.loads(json_response)
+            except json.JSONDecodeError:
+                pass
+        return None
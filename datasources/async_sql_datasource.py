@@ -0,0 +1,166 @@
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import aliased
+
+from connections.async_sql_connection import AsyncSQLConnection
+from datasources.async_datasource import AsyncDataSource
+
+
+class AsyncSQLDataSource(AsyncDataSource):
+    """
+    AsyncSQLDataSource is the asyncio counterpart of the SQL datasources. It works with any AsyncSQLConnection
+    (MySQL, PostgreSQL, SQLite) through SQLAlchemy's AsyncSession.
+
+    Every method is a coroutine that opens its own session and closes it before returning. Returned ORM instances are
+    detached from the session and their attributes are already loaded.
+
+    Methods:
+    - insert: Inserts a new record into a table.
+    - update: Updates an existing record in a table.
+    - remove: Deletes an existing record from a table.
+    - query: Executes a SQL query.
+    - find_by_id: Fetches a record by its id from a table.
+    - find_all: Fetches all records from a table. An optional condition can be applied.
+    - count: Counts all records in a table. An optional condition can be applied.
+    - exists: Checks if a record exists in a table.
+    - inner_join: Performs an inner join operation between two tables. An optional condition can be applied.
+    - left_join: Performs a left outer join operation between two tables. An optional condition can be applied.
+    - right_join: Performs a right outer join operation between two tables. An optional condition can be applied.
+    """
+
+    def __init__(self, connection: AsyncSQLConnection):
+        super().__init__(connection)
+
+    def _apply_condition(self, statement, condition):
+        if condition:
+            statement = statement.filter(text(condition))
+        return statement
+
+    def register_model(self, model):
+        """
+        Register a user-defined model with the SQL database.
+
+        Args:
+        - model: A SQLAlchemy model class.
+        """
+        self._connection.register_model(model)
+
+    async def create_all_user_defined_models(self):
+        """
+        Create tables for all user-defined models that have been registered with the SQL database.
+        """
+        await self._connection.create_all_user_defined_models()
+
+    async def get_model(self, table_name):
+        """
+        Get the SQLAlchemy model for the given table name.
+
+        Args:
+        - table_name: The name of the table.
+
+        Returns:
+        - The SQLAlchemy model for the table, or None if no such table exists.
+        """
+        return await self._connection.get_model(table_name)
+
+    def get_new_session(self, read_only=False):
+        """
+        Get new SQLAlchemy AsyncSession
+
+        Args:
+        - read_only: (Optional) Whether the session only reads, and may be served by a read replica.
+        """
+        return self._connection.get_new_session(read_only)
+
+    @property
+    def declarative_base_model(self):
+        """Get the SQLAlchemy declarative base model class instance."""
+        return self._connection.declarative_base_model
+
+    @property
+    def automap_base_model(self):
+        """Get the SQLAlchemy declarative automap base model class instance."""
+        return self._connection.automap_base_model
+
+    async def insert(self, data_entity_key: str, data: dict):
+        model = await self.get_model(data_entity_key)
+        async with self.get_new_session() as session:
+            instance = model(**data)
+            session.add(instance)
+            await session.commit()
+            return instance.id
+
+    async def update(self, data_entity_key: str, data_entity_id, data: dict):
+        model = await self.get_model(data_entity_key)
+        async with self.get_new_session() as session:
+            instance = await session.get(model, data_entity_id)
+            for key, value in data.items():
+                setattr(instance, key, value)
+            await session.commit()
+            return True
+
+    async def remove(self, data_entity_key: str, data_entity_id):
+        model = await self.get_model(data_entity_key)
+        async with self.get_new_session() as session:
+            instance = await session.get(model, data_entity_id)
+            await session.delete(instance)
+            await session.commit()
+            return True
+
+    async def query(self, query_string: str):
+        async with self.get_new_session() as session:
+            result = await session.execute(text(query_string))
+            rows = result.fetchall() if result.returns_rows else None
+            await session.commit()
+            return rows
+
+    async def find_by_id(self, data_entity_key: str, data_entity_id):
+        model = await self.get_model(data_entity_key)
+        async with self.get_new_session(read_only=True) as session:
+            return await session.get(model, data_entity_id)
+
+    async def find_all(self, data_entity_key: str, condition=None):
+        model = await self.get_model(data_entity_key)
+        async with self.get_new_session(read_only=True) as session:
+            statement = self._apply_condition(select(model), condition)
+            result = await session.execute(statement)
+            return result.scalars().all()
+
+    async def count(self, data_entity_key: str, condition=None):
+        model = await self.get_model(data_entity_key)
+        async with self.get_new_session(read_only=True) as session:
+            statement = self._apply_condition(select(func.count()).select_from(model), condition)
+            result = await session.execute(statement)
+            return result.scalar()
+
+    async def exists(self, data_entity_key: str, data_entity_id):
+        return await self.find_by_id(data_entity_key, data_entity_id) is not None
+
+    async def inner_join(self, primary_entity_key: str, secondary_entity_key: str, on_field: str, condition=None):
+        primary = await self.get_model(primary_entity_key)
+        secondary = aliased(await self.get_model(secondary_entity_key))
+        async with self.get_new_session(read_only=True) as session:
+            statement = select(primary, secondary).join(
+                secondary, getattr(primary, on_field) == getattr(secondary, on_field))
+            statement = self._apply_condition(statement, condition)
+            result = await session.execute(statement)
+            return result.all()
+
+    async def left_join(self, primary_entity_key: str, secondary_entity_key: str, on_field: str, condition=None):
+        primary = await self.get_model(primary_entity_key)
+        secondary = aliased(await self.get_model(secondary_entity_key))
+        async with self.get_new_session(read_only=True) as session:
+            statement = select(primary, secondary).outerjoin(
+                secondary, getattr(primary, on_field) == getattr(secondary, on_field))
+            statement = self._apply_condition(statement, condition)
+            result = await session.execute(statement)
+            return result.all()
+
+    async def right_join(self, primary_entity_key: str, secondary_entity_key: str, on_field: str, condition=None):
+        primary = aliased(await self.get_model(primary_entity_key))
+        secondary = await self.get_model(secondary_entity_key)
+        async with self.get_new_session(read_only=True) as session:
+            statement = select(secondary, primary).outerjoin(
+                primary, getattr(primary, on_field) == getattr(secondary, on_field))
+            statement = self._apply_condition(statement, condition)
+            result = await session.execute(statement)
+            return result.all()
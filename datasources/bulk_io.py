@@ -0,0 +1,71 @@
+import io
+
+
+def _quote(text):
+    return '"' + text.replace('"', '""') + '"'
+
+
+def encode_csv_rows(rows, columns, null, format_value=str, rows_per_chunk=1000):
+    """
+    Encode rows as CSV text, lazily, for the native bulk loaders.
+
+    Every value is quoted, with quotes doubled, so that the unquoted null marker is the only way to write a NULL:
+    an empty quoted field is an empty string.
+
+    Args:
+    - rows: An iterable of dictionaries mapping column names to values, or of sequences of values in the order
+      of columns.
+    - columns: The names of the columns, in the order of the CSV fields.
+    - null: The unquoted marker of NULL values, e.g. '' for PostgreSQL and 'NULL' for MySQL.
+    - format_value: (Optional) A callable formatting a non-None value as a string.
+    - rows_per_chunk: (Optional) The number of rows encoded per chunk.
+
+    Returns:
+    - A generator of CSV text chunks, of rows_per_chunk lines each.
+    """
+    lines = []
+    for row in rows:
+        values = [row.get(column) for column in columns] if isinstance(row, dict) else row
+        lines.append(','.join(null if value is None else _quote(format_value(value)) for value in values) + '\n')
+        if len(lines) >= rows_per_chunk:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+class IterableReader(io.RawIOBase):
+    """
+    IterableReader is a read-only binary file over an iterable of bytes chunks, so that drivers reading a file (e.g.
+    psycopg2's copy_expert) can consume a generator. Chunks are pulled only as the driver reads.
+
+    Attributes:
+    - _chunks: The iterator of the remaining chunks.
+    - _buffer: A memoryview of the part of the current chunk that hasn't been read yet.
+    """
+
+    def __init__(self, chunks):
+        """
+        Initialize the IterableReader.
+
+        Args:
+        - chunks: An iterable of bytes chunks.
+        """
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._buffer = memoryview(b'')
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = memoryview(chunk)
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
@@ -0,0 +1,497 @@
+import functools
+import logging
+import threading
+import time
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from datasources import codec
+from datasources.compact_row import compact_row_class
+from datasources.datasource import DataSource
+from datasources.redis_datasource import is_transient_redis_error
+
+logger = logging.getLogger(__name__)
+
+
+class CachedSQLDataSource(DataSource):
+    """
+    CachedSQLDataSource puts a Redis read-through cache in front of the primary key lookups of a SQLDataSource.
+
+    find_by_id and find_by_ids are served from Redis when the records are cached. Records that aren't cached are
+    loaded from the database and added to the cache. Each record is stored under its own key, as a JSON array of
+    its column values in mapper order (without the column names), and expires after the TTL of its entity.
+
+    The write methods run on the SQL datasource and then invalidate the cached records they changed. Writes that
+    can't tell which rows they changed (update_where, remove_where, bulk_load, and upserts whose rows lack the
+    primary key) invalidate every cached record of the entity. Each entity keeps the keys of its cached records in a Redis
+    set for this. Invalidated keys are removed from the set, and the set expires with the records it indexes, as its
+    TTL is reset by every load. Raw SQL run with query isn't tracked. A read racing with a write may still cache the previous
+    version of a record until its TTL expires. Inside a transaction scope, lookups bypass the cache, and the
+    invalidations are repeated when the scope ends.
+
+    Redis is a best-effort layer: if a lookup fails with a transient error, the records are loaded from the
+    database. If an invalidation fails, a warning is logged and the write's result is still returned.
+
+    Every other attribute (find_all, count, joins, get_model...) is delegated to the SQL datasource.
+
+    Attributes:
+    - _datasource: The SQLDataSource whose lookups are cached.
+    - _cache: The RedisDataSource (or ShardedRedisDataSource) holding the cache.
+    - _ttl: The default time to live of cached records, in seconds, or None for no expiry.
+    - _ttls: A dictionary mapping entity names to their own time to live.
+    - _key_prefix: The prefix of the cache keys.
+    - _stats: A dictionary of the hit, miss, error and invalidation counters, and of the time spent on the cache
+      and on the database.
+    - _stats_lock: A lock guarding the counters.
+
+    Methods:
+    - connect: Opens the connections to the database and to Redis.
+    - disconnect: Closes the connections to the database and to Redis.
+    - check_health: Checks whether the database and Redis are healthy.
+    - find_by_id: Fetches a record by its id, from the cache when possible.
+    - find_by_ids: Fetches many records by id, from the cache when possible.
+    - insert, insert_many, update, update_many, upsert_many, remove, update_where, remove_where, bulk_load: Write to
+      the database, then invalidate the changed records.
+    - invalidate: Removes records from the cache.
+    - invalidate_entity: Removes every cached record of an entity.
+    - cache_stats: Returns the cache counters and timings.
+    - reset_cache_stats: Clears the cache counters and timings.
+    """
+
+    def __init__(self, datasource, cache, ttl=300, ttls=None, key_prefix='entity'):
+        """
+        Construct a new CachedSQLDataSource instance.
+
+        Args:
+        - datasource: The SQLDataSource whose lookups are cached.
+        - cache: The RedisDataSource (or ShardedRedisDataSource) holding the cache.
+        - ttl: (Optional) The default time to live of cached records, in seconds, or None for no expiry.
+        - ttls: (Optional) A dictionary mapping entity names to their own time to live.
+        - key_prefix: (Optional) The prefix of the cache keys.
+        """
+        super().__init__(datasource._connection)
+        self._datasource = datasource
+        self._cache = cache
+        self._ttl = ttl
+        self._ttls = dict(ttls or {})
+        self._key_prefix = key_prefix
+        self._stats_lock = threading.Lock()
+        self.reset_cache_stats()
+
+    def __getattr__(self, name):
+        # Only called for attributes this class doesn't define: every other read goes to the SQL datasource.
+        return getattr(self._datasource, name)
+
+    def connect(self):
+        """
+        Open the connections to the database and to Redis.
+        """
+        self._datasource.connect()
+        self._cache.connect()
+
+    def disconnect(self):
+        """
+        Close the connections to the database and to Redis.
+        """
+        self._datasource.disconnect()
+        self._cache.disconnect()
+
+    def check_health(self):
+        """
+        Check whether the database and Redis are healthy.
+
+        Returns:
+        - True if both are healthy, False otherwise.
+        """
+        return self._datasource.check_health() and self._cache.check_health()
+
+    def reset_cache_stats(self):
+        """
+        Clear the cache counters and timings.
+        """
+        with self._stats_lock:
+            self._stats = {'hits': 0, 'misses': 0, 'errors': 0, 'invalidations': 0,
+                           'cache_time_total': 0.0, 'database_time_total': 0.0}
+
+    def cache_stats(self):
+        """
+        Get the cache counters and timings.
+
+        Returns:
+        - A dictionary with the hit, miss, error and invalidation counts, the hit rate, and the total time spent on
+          cache lookups and on database loads, in seconds.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else None
+        return stats
+
+    def _record(self, **increments):
+        with self._stats_lock:
+            for name, increment in increments.items():
+                self._stats[name] += increment
+
+    def _entry_key(self, data_entity_key, data_entity_id):
+        # The ID is JSON-encoded, so 1, '1' and (1, 2) get distinct, unambiguous keys.
+        return f"{self._key_prefix}:{data_entity_key}:{codec.dumps(data_entity_id)}"
+
+    def _index_key(self, data_entity_key):
+        return f"{self._key_prefix}:{data_entity_key}:index"
+
+    def _fields(self, data_entity_key):
+        return tuple(attribute.key for attribute in inspect(self._datasource.get_model(data_entity_key)).column_attrs)
+
+    def _normalize_id(self, data_entity_key, data_entity_id):
+        primary_key = self._datasource.get_model(data_entity_key).__table__.primary_key.columns
+        return tuple(data_entity_id) if len(primary_key) > 1 else data_entity_id
+
+    def _encode(self, fields, instance):
+        return codec.dumps([getattr(instance, field) for field in fields])
+
+    def _decode(self, data_entity_key, fields, value, compact):
+        """
+        Rebuild a record from its cached value.
+
+        Returns:
+        - A CompactRow, or a detached ORM instance, or None if the value was cached for different columns.
+        """
+        values = codec.loads(value)
+        if len(values) != len(fields):
+            return None
+        if compact:
+            return compact_row_class(data_entity_key, fields)(*values)
+
+        instance = self._datasource.get_model(data_entity_key)(**dict(zip(fields, values)))
+        # Give the instance its identity, so it behaves like an instance loaded by a session that has been closed.
+        make_transient_to_detached(instance)
+        return instance
+
+    def _cache_call(self, operation, *args):
+        """
+        Run a cache operation, timing it. Transient errors are counted and reported as None; others are raised.
+        """
+        start = time.perf_counter()
+        try:
+            return operation(*args)
+        except Exception as error:
+            # The cache may be sharded, and the shards raise the errors, so they're classified here.
+            if not is_transient_redis_error(error):
+                raise
+            self._record(errors=1)
+            logger.warning("Cache operation %s failed: %s", getattr(operation, '__name__', operation), error)
+            return None
+        finally:
+            self._record(cache_time_total=time.perf_counter() - start)
+
+    def _load(self, data_entity_key, ids, chunk_size, compact):
+        """
+        Load records from the database and add the found ones to the cache.
+        """
+        start = time.perf_counter()
+        records = self._datasource.find_by_ids(data_entity_key, ids, chunk_size=chunk_size)
+        self._record(database_time_total=time.perf_counter() - start)
+
+        fields = self._fields(data_entity_key)
+        found = {self._entry_key(data_entity_key, data_entity_id): self._encode(fields, record)
+                 for data_entity_id, record in records.items() if record is not None}
+        if found:
+            ttl = self._ttls.get(data_entity_key, self._ttl)
+            self._cache_call(self._cache.set_keys, found, ttl)
+            # The index outlives every record it holds, as its TTL is reset whenever records are added.
+            self._cache_call(functools.partial(self._cache.set_set_value, ttl=ttl), self._index_key(data_entity_key),
+                             *found)
+
+        if compact:
+            row_class = compact_row_class(data_entity_key, fields)
+            records = {data_entity_id: row_class(*(getattr(record, field) for field in fields))
+                       if record is not None else None for data_entity_id, record in records.items()}
+        return records
+
+    def find_by_ids(self, data_entity_key: str, ids, chunk_size=1000, columns=None, compact=False):
+        """
+        Get many records by their primary keys, from the cache when possible.
+
+        Cached records are read with one round trip. The others are loaded with SQLDataSource.find_by_ids and
+        added to the cache. Projections (columns) aren't cached and go straight to the database.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - ids: The IDs of the records, as tuples for composite primary keys.
+        - chunk_size: (Optional) The maximum number of IDs per database query.
+        - columns: (Optional) The names of the columns to load. Defaults to every column.
+        - compact: (Optional) Whether to return read-only CompactRows instead of ORM instances.
+
+        Returns:
+        - A dictionary mapping each distinct ID, in the order of ids, to its record, or to None if it wasn't found.
+        """
+        if columns or self._connection.in_transaction:
+            return self._datasource.find_by_ids(data_entity_key, ids, chunk_size, columns, compact)
+
+        ids = list(dict.fromkeys(self._normalize_id(data_entity_key, data_entity_id) for data_entity_id in ids))
+        values = self._cache_call(self._cache.get_keys, [self._entry_key(data_entity_key, data_entity_id)
+                                                         for data_entity_id in ids]) or [None] * len(ids)
+
+        fields = self._fields(data_entity_key)
+        records = {}
+        missing = []
+        for data_entity_id, value in zip(ids, values):
+            record = self._decode(data_entity_key, fields, value, compact) if value is not None else None
+            if record is None:
+                missing.append(data_entity_id)
+            records[data_entity_id] = record
+
+        self._record(hits=len(ids) - len(missing), misses=len(missing))
+        if missing:
+            records.update(self._load(data_entity_key, missing, chunk_size, compact))
+        return records
+
+    def find_by_id(self, data_entity_key: str, data_entity_id, columns=None, compact=False):
+        """
+        Get a record by its unique ID, from the cache when possible.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - data_entity_id: The ID of the record to retrieve.
+        - columns: (Optional) The names of the columns to load. Projections aren't cached.
+        - compact: (Optional) Whether to return a read-only CompactRow instead of an ORM instance.
+
+        Returns:
+        - The record, or None if it doesn't exist.
+        """
+        if columns or self._connection.in_transaction:
+            return self._datasource.find_by_id(data_entity_key, data_entity_id, columns, compact)
+        data_entity_id = self._normalize_id(data_entity_key, data_entity_id)
+        return self.find_by_ids(data_entity_key, [data_entity_id], compact=compact)[data_entity_id]
+
+    def invalidate(self, data_entity_key: str, ids):
+        """
+        Remove records from the cache.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - ids: The IDs of the records.
+        """
+        keys = [self._entry_key(data_entity_key, self._normalize_id(data_entity_key, data_entity_id))
+                for data_entity_id in ids]
+        if keys:
+            self._delete_entries(data_entity_key, keys)
+            self._connection.after_transaction(functools.partial(self._delete_entries, data_entity_key, keys))
+
+    def _delete_entries(self, data_entity_key, keys):
+        self._cache_call(self._cache.delete_keys, keys)
+        self._cache_call(self._cache.remove_set_value, self._index_key(data_entity_key), *keys)
+        self._record(invalidations=len(keys))
+
+    def invalidate_entity(self, data_entity_key: str):
+        """
+        Remove every cached record of an entity.
+
+        Args:
+        - data_entity_key: The name of the table.
+        """
+        self._delete_entity(data_entity_key)
+        self._connection.after_transaction(functools.partial(self._delete_entity, data_entity_key))
+
+    def _delete_entity(self, data_entity_key):
+        index_key = self._index_key(data_entity_key)
+        keys = self._cache_call(self._cache.get_set_values, index_key) or ()
+        self._cache_call(self._cache.delete_keys, [*keys, index_key])
+        self._record(invalidations=len(keys))
+
+    def _tracking_ids(self, data_entity_key, rows, ids):
+        """
+        Yield the rows, collecting their primary keys into ids as they're consumed, so generators stay lazy.
+        A None is collected for rows without the whole primary key.
+        """
+        primary_key = [column.key for column in self._datasource.get_model(data_entity_key).__table__.primary_key]
+        for row in rows:
+            if all(row.get(column) is not None for column in primary_key):
+                values = tuple(row[column] for column in primary_key)
+                ids.append(values if len(values) > 1 else values[0])
+            else:
+                ids.append(None)
+            yield row
+
+    def _invalidate_tracked(self, data_entity_key, ids):
+        if None in ids:
+            self.invalidate_entity(data_entity_key)
+        else:
+            self.invalidate(data_entity_key, ids)
+
+    def insert(self, data_entity_key: str, data: dict):
+        """
+        Insert a record, then invalidate its ID, in case it was cached before being deleted outside this datasource.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - data: A dictionary containing the data to insert.
+
+        Returns:
+        - The ID of the inserted record.
+        """
+        data_entity_id = self._datasource.insert(data_entity_key, data)
+        self.invalidate(data_entity_key, [data_entity_id])
+        return data_entity_id
+
+    def insert_many(self, data_entity_key: str, rows, batch_size=1000, return_ids=False):
+        """
+        Insert many records in batches (see SQLDataSource.insert_many). New rows can't be cached yet: only those
+        given an explicit primary key are invalidated, in case their ID was cached before being deleted outside this
+        datasource. They're invalidated even if a batch fails.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - rows: An iterable of dictionaries mapping column names to values.
+        - batch_size: (Optional) The number of rows per batch.
+        - return_ids: (Optional) Whether to return the primary keys of the inserted rows.
+
+        Returns:
+        - The number of rows inserted, or the list of their primary keys if return_ids is True.
+        """
+        ids = []
+        try:
+            return self._datasource.insert_many(data_entity_key, self._tracking_ids(data_entity_key, rows, ids),
+                                                batch_size, return_ids)
+        finally:
+            self.invalidate(data_entity_key, [data_entity_id for data_entity_id in ids if data_entity_id is not None])
+
+    def update(self, data_entity_key: str, data_entity_id, data: dict):
+        """
+        Update a record, then invalidate it, even if the update fails.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - data_entity_id: The ID of the record to update.
+        - data: A dictionary containing the data to update.
+
+        Returns:
+        - True if the record was updated.
+        """
+        try:
+            return self._datasource.update(data_entity_key, data_entity_id, data)
+        finally:
+            self.invalidate(data_entity_key, [data_entity_id])
+
+    def update_many(self, data_entity_key: str, updates, batch_size=1000):
+        """
+        Update many records by primary key in batches (see SQLDataSource.update_many), then invalidate the records
+        updated so far, even if a batch fails.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - updates: An iterable of (ID, dictionary of changes) pairs.
+        - batch_size: (Optional) The number of updates per batch.
+
+        Returns:
+        - The number of rows matched.
+        """
+        ids = []
+
+        def tracking_updates():
+            for data_entity_id, changes in updates:
+                ids.append(data_entity_id)
+                yield data_entity_id, changes
+
+        try:
+            return self._datasource.update_many(data_entity_key, tracking_updates(), batch_size)
+        finally:
+            self.invalidate(data_entity_key, ids)
+
+    def upsert_many(self, data_entity_key: str, rows, conflict_keys, update_columns=None, batch_size=1000):
+        """
+        Insert or update many records (see SQLDataSource.upsert_many), then invalidate them, even if a batch fails.
+        If any row lacks the primary key, e.g. when the conflict is on another unique key, the updated records can't
+        be told apart and every cached record of the entity is invalidated.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - rows: An iterable of dictionaries mapping column names to values.
+        - conflict_keys: The names of the columns of the unique key detecting conflicts.
+        - update_columns: (Optional) The names of the columns updated on conflict.
+        - batch_size: (Optional) The number of rows per batch.
+
+        Returns:
+        - The number of rows processed.
+        """
+        ids = []
+        try:
+            return self._datasource.upsert_many(data_entity_key, self._tracking_ids(data_entity_key, rows, ids),
+                                                conflict_keys, update_columns, batch_size)
+        finally:
+            self._invalidate_tracked(data_entity_key, ids)
+
+    def remove(self, data_entity_key: str, data_entity_id):
+        """
+        Remove a record, then invalidate it, even if the removal fails.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - data_entity_id: The ID of the record to remove.
+
+        Returns:
+        - True if the record was removed.
+        """
+        try:
+            return self._datasource.remove(data_entity_key, data_entity_id)
+        finally:
+            self.invalidate(data_entity_key, [data_entity_id])
+
+    def update_where(self, data_entity_key: str, condition, values: dict, chunk_size=None):
+        """
+        Update the rows matching a condition (see SQLDataSource.update_where), then invalidate every cached record
+        of the entity, as the updated rows aren't known. The entity is invalidated even if the update fails.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - condition: A raw SQL condition or a structured filter selecting the rows, or None to update every row.
+        - values: A dictionary mapping column names to their new values.
+        - chunk_size: (Optional) The number of rows per chunk, or None for a single statement.
+
+        Returns:
+        - The number of rows updated.
+        """
+        try:
+            return self._datasource.update_where(data_entity_key, condition, values, chunk_size)
+        finally:
+            self.invalidate_entity(data_entity_key)
+
+    def remove_where(self, data_entity_key: str, condition, chunk_size=None):
+        """
+        Delete the rows matching a condition (see SQLDataSource.remove_where), then invalidate every cached record
+        of the entity, as the deleted rows aren't known. The entity is invalidated even if the deletion fails.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - condition: A raw SQL condition or a structured filter selecting the rows, or None to delete every row.
+        - chunk_size: (Optional) The number of rows per chunk, or None for a single statement.
+
+        Returns:
+        - The number of rows deleted.
+        """
+        try:
+            return self._datasource.remove_where(data_entity_key, condition, chunk_size)
+        finally:
+            self.invalidate_entity(data_entity_key)
+
+    def bulk_load(self, data_entity_key: str, source, columns=None, format='csv', header=False):
+        """
+        Load many records with the dialect's native bulk loader (see SQLDataSource.bulk_load), then invalidate
+        every cached record of the entity, as the loaded rows aren't tracked. The entity is invalidated even if the
+        load fails.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - source: An iterable of rows, or the path or file object of a file to load.
+        - columns: (Optional) The names of the columns, in the order of the values.
+        - format: (Optional) The format of a file source.
+        - header: (Optional) Whether a file source starts with a header line.
+
+        Returns:
+        - A dictionary with the number of rows loaded, the elapsed seconds and the rows per second.
+        """
+        try:
+            return self._datasource.bulk_load(data_entity_key, source, columns, format, header)
+        finally:
+            self.invalidate_entity(data_entity_key)
@@ -0,0 +1,100 @@
+import base64
+import datetime
+import decimal
+import json
+import uuid
+
+# The JSON codec tags the values JSON can't represent natively with their type, so they decode to the same type.
+_TYPE_KEY = '__type__'
+_VALUE_KEY = 'value'
+
+
+def _encode_value(value):
+    if isinstance(value, datetime.datetime):
+        return {_TYPE_KEY: 'datetime', _VALUE_KEY: value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {_TYPE_KEY: 'date', _VALUE_KEY: value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {_TYPE_KEY: 'time', _VALUE_KEY: value.isoformat()}
+    if isinstance(value, decimal.Decimal):
+        return {_TYPE_KEY: 'decimal', _VALUE_KEY: str(value)}
+    if isinstance(value, uuid.UUID):
+        return {_TYPE_KEY: 'uuid', _VALUE_KEY: str(value)}
+    if isinstance(value, bytes):
+        return {_TYPE_KEY: 'bytes', _VALUE_KEY: base64.b64encode(value).decode('ascii')}
+    raise TypeError(f"Object of type {type(value).__name__} can't be encoded.")
+
+
+_DECODERS = {
+    'datetime': datetime.datetime.fromisoformat,
+    'date': datetime.date.fromisoformat,
+    'time': datetime.time.fromisoformat,
+    'decimal': decimal.Decimal,
+    'uuid': uuid.UUID,
+    'bytes': base64.b64decode,
+}
+
+
+def _decode_object(obj):
+    decoder = _DECODERS.get(obj.get(_TYPE_KEY)) if len(obj) == 2 else None
+    return decoder(obj[_VALUE_KEY]) if decoder is not None else obj
+
+
+def dumps(value):
+    """
+    Serialize a value to JSON, including dates, times, decimals, UUIDs and bytes.
+
+    Args:
+    - value: The value to serialize.
+
+    Returns:
+    - The JSON string.
+    """
+    return json.dumps(value, default=_encode_value, separators=(',', ':'))
+
+
+def loads(data):
+    """
+    Deserialize a JSON string produced by dumps, restoring the types it tagged.
+
+    Args:
+    - data: The JSON string.
+
+    Returns:
+    - The deserialized value.
+    """
+    return json.loads(data, object_hook=_decode_object)
+
+
+def encode_token(value):
+    """
+    Encode a value as an opaque, URL-safe token.
+
+    Args:
+    - value: The value to encode.
+
+    Returns:
+    - The token string.
+    """
+    return base64.urlsafe_b64encode(dumps(value).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_token(token):
+    """
+    Decode a token produced by encode_token.
+
+    Args:
+    - token: The token string.
+
+    Returns:
+    - The decoded value.
+
+    Raises:
+    - ValueError: If the token is malformed.
+    """
+    try:
+        padding = '=' * (-len(token) % 4)
+        return loads(base64.urlsafe_b64decode(token + padding).decode('utf-8'))
+    except (ValueError, TypeError, decimal.InvalidOperation) as error:
+        # Bad base64, UTF-8 and JSON raise ValueErrors, and so do bad tagged dates, times, UUIDs and bytes.
+        raise ValueError(f"Malformed token: {token!r}") from error
@@ -0,0 +1,100 @@
+import functools
+import keyword
+
+
+class CompactRow:
+    """
+    CompactRow is the base class of the lightweight, read-only row objects returned by the read methods of SQL
+    datasources in compact mode.
+
+    Every table (or projection) gets its own subclass, generated once by compact_row_class, whose __slots__ are the
+    selected columns. Instances have no __dict__, no ORM instrumentation and aren't tracked by any session, so they
+    cost little more than a tuple. Fields are read as attributes (row.name), and rows can be iterated, compared,
+    hashed, pickled and converted with _asdict.
+
+    Attributes:
+    - _fields: The names of the fields, in the order of the selected columns.
+    - _table_name: The name of the table (or join) the rows come from.
+    """
+
+    __slots__ = ()
+    _fields = ()
+    _table_name = None
+
+    def __init__(self, *values):
+        if len(values) != len(self._fields):
+            raise TypeError(f"{type(self).__name__} takes {len(self._fields)} values, got {len(values)}.")
+        for field, value in zip(self._fields, values):
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only.")
+
+    def __iter__(self):
+        return (getattr(self, field) for field in self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash((type(self), tuple(self)))
+
+    def __repr__(self):
+        values = ', '.join(f"{field}={value!r}" for field, value in zip(self._fields, self))
+        return f"{type(self).__name__}({values})"
+
+    def __reduce__(self):
+        # The generated classes can't be imported by name, so pickles rebuild them from their name and fields.
+        return _rebuild_compact_row, (self._table_name, self._fields, tuple(self))
+
+    def _asdict(self):
+        """Get the row as a dictionary mapping field names to values."""
+        return dict(zip(self._fields, self))
+
+
+def compact_row_class(table_name, fields):
+    """
+    Get the CompactRow subclass of a table and a set of fields, generating it on first use.
+
+    Args:
+    - table_name: The name of the table (or join) the rows come from.
+    - fields: A tuple of field names. Names that aren't valid identifiers are suffixed with an underscore when
+      they're keywords, and rejected otherwise.
+
+    Returns:
+    - The CompactRow subclass.
+
+    Raises:
+    - ValueError: If a field name isn't a valid identifier.
+    """
+    slots = []
+    for field in fields:
+        if keyword.iskeyword(field):
+            field = f"{field}_"
+        if not field.isidentifier() or field.startswith('__'):
+            raise ValueError(f"Column {field!r} can't be used as a compact row field.")
+        slots.append(field)
+    return _generate_compact_row_class(table_name, tuple(slots))
+
+
+@functools.lru_cache(maxsize=None)
+def _generate_compact_row_class(table_name, slots):
+    # Cached on the sanitized fields, so rows rebuilt from their _fields (e.g. unpickled) get the same class.
+    class_name = ''.join(part.capitalize() for part in str(table_name).split('_') if part) + 'Row'
+    return type(class_name, (CompactRow,), {
+        '__slots__': slots,
+        '_fields': slots,
+        '_table_name': table_name,
+    })
+
+
+def _rebuild_compact_row(table_name, fields, values):
+    return compact_row_class(table_name, fields)(*values)
@@ -0,0 +1,104 @@
+import bisect
+import hashlib
+
+
+class ConsistentHashRing:
+    """
+    ConsistentHashRing maps keys to nodes with consistent hashing.
+
+    Every node is placed on the ring at virtual_nodes pseudo-random positions, and a key belongs to the node owning
+    the first position at or after the key's hash. Adding a node to a ring of N nodes therefore only moves about
+    1/(N+1) of the keys (those now falling on the new node's positions), and removing a node only moves its own keys.
+    The virtual nodes spread each node's share of the ring evenly.
+
+    Attributes:
+    - _virtual_nodes: The number of positions of each node on the ring.
+    - _nodes: The set of nodes on the ring.
+    - _ring: A (positions, owners) tuple of the sorted position hashes and the node owning each position. It's
+      replaced as a whole when nodes change, so lookups running concurrently always see a consistent ring.
+
+    The following methods are implemented in this class:
+    - add_node: Adds a node to the ring.
+    - remove_node: Removes a node from the ring.
+    - get_node: Returns the node a key belongs to.
+    """
+
+    def __init__(self, nodes=(), virtual_nodes=160):
+        """
+        Initialize the ConsistentHashRing.
+
+        Args:
+        - nodes: (Optional) The names of the initial nodes.
+        - virtual_nodes: (Optional) The number of positions of each node on the ring.
+        """
+        self._virtual_nodes = virtual_nodes
+        self._nodes = set()
+        self._ring = ((), ())
+        for node in nodes:
+            self.add_node(node)
+
+    @property
+    def nodes(self):
+        """Get the names of the nodes on the ring."""
+        return set(self._nodes)
+
+    @staticmethod
+    def _hash(value):
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+        return int.from_bytes(hashlib.md5(value).digest()[:8], 'big')
+
+    def add_node(self, node):
+        """
+        Add a node to the ring.
+
+        Args:
+        - node: The name of the node.
+
+        Raises:
+        - ValueError: If the node is already on the ring.
+        """
+        if node in self._nodes:
+            raise ValueError(f"Node {node} is already on the ring.")
+
+        self._nodes.add(node)
+        points = list(zip(*self._ring))
+        points.extend((self._hash(f"{node}#{replica}"), node) for replica in range(self._virtual_nodes))
+        self._set_ring(points)
+
+    def remove_node(self, node):
+        """
+        Remove a node from the ring.
+
+        Args:
+        - node: The name of the node.
+
+        Raises:
+        - KeyError: If the node isn't on the ring.
+        """
+        self._nodes.remove(node)
+        self._set_ring([(position, owner) for position, owner in zip(*self._ring) if owner != node])
+
+    def _set_ring(self, points):
+        points.sort()
+        self._ring = (tuple(position for position, _ in points), tuple(owner for _, owner in points))
+
+    def get_node(self, key):
+        """
+        Get the node a key belongs to.
+
+        Args:
+        - key: The key, as a string or bytes.
+
+        Returns:
+        - The name of the node.
+
+        Raises:
+        - LookupError: If the ring has no nodes.
+        """
+        positions, owners = self._ring
+        if not positions:
+            raise LookupError("The hash ring has no nodes.")
+
+        index = bisect.bisect_left(positions, self._hash(key))
+        return owners[index % len(owners)]
@@ -12,7 +12,9 @@ class DataSource(ABC):
 
     Attributes:
     - _connection: A Connection object that manages the connection to the database.
-    - _connection_engine: The actual connection engine that is used to interact with the database.
+    - _connection_engine: The actual connection engine that is used to interact with the database. It's read from
+      the connection on every access, so it reflects connect() calls made after the datasource was constructed and
+      is shared by every datasource built on the same connection.
 
     The following methods are implemented in this class:
     - connect: Opens the connection to the database.
@@ -34,7 +36,6 @@ class DataSource(ABC):
         - connection: A Connection object that manages the connection to the database.
         """
         self._connection = connection
-        self._connection_engine = connection.connection_engine
 
     def __enter__(self):
         self.connect()
@@ -43,6 +44,10 @@ class DataSource(ABC):
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.disconnect()
 
+    @property
+    def _connection_engine(self):
+        return self._connection.connection_engine
+
     @property
     def connection_engine(self):
         """
@@ -74,6 +79,19 @@ class DataSource(ABC):
         """
         return self._connection.check_health()
 
+    def _is_transient_error(self, error):
+        """
+        Classify an error raised by an operation. Transient errors (lost connections, timeouts, failovers) are
+        retried and counted by the circuit breaker of the connection's ResiliencePolicy.
+
+        Args:
+        - error: The exception raised by the operation.
+
+        Returns:
+        - True if the error is transient, False otherwise.
+        """
+        return False
+
     def __enter__(self):
         """Open the datasource connection when entering a with statement."""
         self.connect()
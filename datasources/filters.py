@@ -0,0 +1,327 @@
+import operator
+from abc import ABC, abstractmethod
+
+from sqlalchemy import and_, not_, or_, text
+from sqlalchemy.sql.elements import TextClause
+
+_OPERATORS = {
+    '=': operator.eq,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda column, value: column.in_(value),
+    'not in': lambda column, value: column.not_in(value),
+    'like': lambda column, value: column.like(value),
+    'ilike': lambda column, value: column.ilike(value),
+    'between': lambda column, value: column.between(*value),
+    'is null': lambda column, value: column.is_(None),
+    'is not null': lambda column, value: column.is_not(None),
+}
+
+
+def _hashable(value):
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+class Filter(ABC):
+    """
+    Filter is the base class of structured filter expressions. Filters name columns instead of embedding SQL, and
+    their values are sent as bound parameters, so queries differing only by values compile to the same statement.
+
+    Filters are combined with & (and), | (or) and ~ (not), and compare by value, so equal filters share cache
+    entries.
+
+    The following methods are implemented in subclasses:
+    - compile: Returns the SQLAlchemy clause of the filter.
+    """
+
+    __slots__ = ()
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def __invert__(self):
+        return Not(self)
+
+    @abstractmethod
+    def _key(self):
+        pass
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash((type(self), self._key()))
+
+    @abstractmethod
+    def compile(self, resolve):
+        """
+        Get the SQLAlchemy clause of the filter.
+
+        Args:
+        - resolve: A callable mapping a column name to the SQLAlchemy column (or ORM attribute) it refers to.
+
+        Returns:
+        - The SQLAlchemy clause.
+        """
+        pass
+
+
+class Comparison(Filter):
+    """
+    Comparison is a filter comparing a column to a value with one of the operators =, !=, <, <=, >, >=, in, not in,
+    like, ilike, between (with a (low, high) value), is null and is not null (without a value).
+
+    Attributes:
+    - column: The name of the column.
+    - operator: The operator.
+    - value: The value, sent as a bound parameter.
+    """
+
+    __slots__ = ('column', 'operator', 'value')
+
+    def __init__(self, column, operator, value=None):
+        """
+        Initialize the Comparison.
+
+        Args:
+        - column: The name of the column.
+        - operator: The operator.
+        - value: (Optional) The value. Not used by is null and is not null.
+
+        Raises:
+        - ValueError: If the operator isn't supported.
+        """
+        operator = operator.lower()
+        if operator not in _OPERATORS:
+            raise ValueError(f"Unsupported filter operator: {operator}")
+        self.column = column
+        self.operator = operator
+        self.value = value
+
+    def _key(self):
+        return self.column, self.operator, _hashable(self.value)
+
+    def __repr__(self):
+        return f"Comparison({self.column!r}, {self.operator!r}, {self.value!r})"
+
+    def compile(self, resolve):
+        return _OPERATORS[self.operator](resolve(self.column), self.value)
+
+
+class And(Filter):
+    """
+    And is a filter matching the rows matching every one of its filters.
+
+    Attributes:
+    - filters: The combined filters.
+    """
+
+    __slots__ = ('filters',)
+
+    def __init__(self, *filters):
+        self.filters = tuple(filters)
+
+    def _key(self):
+        return tuple(as_filter(condition) for condition in self.filters)
+
+    def __repr__(self):
+        return f"And{self.filters!r}"
+
+    def compile(self, resolve):
+        return and_(*[compile_filter(condition, resolve) for condition in self.filters])
+
+
+class Or(Filter):
+    """
+    Or is a filter matching the rows matching any of its filters.
+
+    Attributes:
+    - filters: The combined filters.
+    """
+
+    __slots__ = ('filters',)
+
+    def __init__(self, *filters):
+        self.filters = tuple(filters)
+
+    def _key(self):
+        return tuple(as_filter(condition) for condition in self.filters)
+
+    def __repr__(self):
+        return f"Or{self.filters!r}"
+
+    def compile(self, resolve):
+        return or_(*[compile_filter(condition, resolve) for condition in self.filters])
+
+
+class Not(Filter):
+    """
+    Not is a filter matching the rows its filter doesn't match.
+
+    Attributes:
+    - filter: The negated filter.
+    """
+
+    __slots__ = ('filter',)
+
+    def __init__(self, filter):
+        self.filter = filter
+
+    def _key(self):
+        return as_filter(self.filter)
+
+    def __repr__(self):
+        return f"Not({self.filter!r})"
+
+    def compile(self, resolve):
+        return not_(compile_filter(self.filter, resolve))
+
+
+class Field:
+    """
+    Field builds the comparisons of a column with Python operators, e.g. field('age') >= 18.
+
+    Attributes:
+    - name: The name of the column.
+    """
+
+    __slots__ = ('name',)
+
+    # Comparisons build filters rather than booleans, so fields can't be hashed.
+    __hash__ = None
+
+    def __init__(self, name):
+        self.name = name
+
+    def __eq__(self, value):
+        return Comparison(self.name, '=', value)
+
+    def __ne__(self, value):
+        return Comparison(self.name, '!=', value)
+
+    def __lt__(self, value):
+        return Comparison(self.name, '<', value)
+
+    def __le__(self, value):
+        return Comparison(self.name, '<=', value)
+
+    def __gt__(self, value):
+        return Comparison(self.name, '>', value)
+
+    def __ge__(self, value):
+        return Comparison(self.name, '>=', value)
+
+    def in_(self, values):
+        return Comparison(self.name, 'in', tuple(values))
+
+    def not_in(self, values):
+        return Comparison(self.name, 'not in', tuple(values))
+
+    def like(self, pattern):
+        return Comparison(self.name, 'like', pattern)
+
+    def ilike(self, pattern):
+        return Comparison(self.name, 'ilike', pattern)
+
+    def between(self, low, high):
+        return Comparison(self.name, 'between', (low, high))
+
+    def is_null(self):
+        return Comparison(self.name, 'is null')
+
+    def is_not_null(self):
+        return Comparison(self.name, 'is not null')
+
+
+def field(name):
+    """
+    Get the Field of a column, to build filters with Python operators.
+
+    Example:
+        datasource.find_all('users', condition=(field('age') >= 18) & field('country').in_(['FR', 'BE']))
+
+    Args:
+    - name: The name of the column, or 'table.column' in joins.
+
+    Returns:
+    - The Field.
+    """
+    return Field(name)
+
+
+def as_filter(condition):
+    """
+    Convert the plain data form of a filter to a Filter. The plain form can come from configuration or JSON:
+
+    - (column, operator, value) or (column, operator) tuples are comparisons;
+    - lists are the conjunction of their items;
+    - dictionaries are the conjunction of {column: value} equalities.
+
+    Args:
+    - condition: A Filter, or the plain data form of one.
+
+    Returns:
+    - The Filter.
+
+    Raises:
+    - ValueError: If the condition isn't a filter.
+    """
+    if isinstance(condition, Filter):
+        return condition
+    if isinstance(condition, tuple) and len(condition) in (2, 3):
+        return Comparison(*condition)
+    if isinstance(condition, list):
+        return And(*[as_filter(item) for item in condition])
+    if isinstance(condition, dict):
+        return And(*[Comparison(column, '=', value) for column, value in condition.items()])
+    raise ValueError(f"Invalid filter: {condition!r}")
+
+
+def compile_filter(condition, resolve):
+    """
+    Get the SQLAlchemy clause of a Filter or of the plain data form of one (see as_filter).
+
+    Args:
+    - condition: The filter.
+    - resolve: A callable mapping a column name to the SQLAlchemy column (or ORM attribute) it refers to.
+
+    Returns:
+    - The SQLAlchemy clause.
+    """
+    return as_filter(condition).compile(resolve)
+
+
+def compile_condition(condition, resolve, params=None):
+    """
+    Get the SQLAlchemy clause of any condition accepted by the SQL datasources.
+
+    Args:
+    - condition: A raw SQL string (with :name placeholders for params), a text() clause, a Filter or the plain
+      data form of one, or None.
+    - resolve: A callable mapping a column name to the SQLAlchemy column (or ORM attribute) it refers to.
+    - params: (Optional) A dictionary of the values of the placeholders of a raw SQL condition.
+
+    Returns:
+    - The SQLAlchemy clause, or None if there's no condition.
+
+    Raises:
+    - ValueError: If params are given with a structured filter, whose values are already bound.
+    """
+    if condition is None or (isinstance(condition, str) and not condition):
+        return None
+    if isinstance(condition, str):
+        condition = text(condition)
+    if isinstance(condition, TextClause):
+        return condition.bindparams(**params) if params else condition
+    if params:
+        raise ValueError("params only apply to raw SQL conditions.")
+    return compile_filter(condition, resolve)
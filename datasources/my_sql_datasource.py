@@ -1,6 +1,15 @@
+import os
+import shutil
+import tempfile
+
 from sqlalchemy import text
-from sqlalchemy.orm import aliased
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import aliased, load_only
 
+from connections.exceptions.connection import LocalInfileDisabled
+from connections.resilience import resilient
+from datasources.bulk_io import encode_csv_rows
+from datasources.query_result_cache import cached_query, invalidates
 from datasources.sql_datasource import SQLDataSource
 
 
@@ -12,26 +21,50 @@ class MySQLDataSource(SQLDataSource):
 
     Methods:
     - insert: Inserts a new record into a table in the MySQL database.
+    - insert_many: Inserts many records in batches (see SQLDataSource.insert_many).
     - update: Updates an existing record in a table in the MySQL database.
+    - bulk_load: Loads many records with LOAD DATA LOCAL INFILE from a streamed temporary file (see SQLDataSource.bulk_load).
+    - upsert_many: Inserts or updates many records with INSERT ... ON DUPLICATE KEY UPDATE (see SQLDataSource.upsert_many).
     - remove: Deletes an existing record from a table in the MySQL database.
+    - update_where: Updates the records matching a condition in one statement or in chunks (see SQLDataSource.update_where).
+    - remove_where: Deletes the records matching a condition in one statement or in chunks (see SQLDataSource.remove_where).
     - query: Executes a SQL query against the MySQL database.
     - find_by_id: Fetches a record by its id from a table in the MySQL database.
+    - find_by_ids: Fetches many records by id from a table in the MySQL database with chunked IN queries (see SQLDataSource.find_by_ids).
     - find_all: Fetches all records from a table in the MySQL database. An optional condition can be applied.
+    - iter_all: Streams all records from a table in the MySQL database with a server-side cursor (see SQLDataSource.iter_all).
+    - find_page: Fetches a page of records from a table in the MySQL database with keyset pagination (see SQLDataSource.find_page).
+    - find_frame: Fetches records from a table in the MySQL database into NumPy arrays or a DataFrame (see SQLDataSource.find_frame).
+    - iter_record_batches: Streams records from a table in the MySQL database as Arrow RecordBatches (see SQLDataSource.iter_record_batches).
+    - export_parquet: Exports records from a table in the MySQL database to a Parquet file (see SQLDataSource.export_parquet).
     - count: Counts all records in a table in the MySQL database. An optional condition can be applied.
     - exists: Checks if a record exists in a table in the MySQL database.
     - inner_join: Performs an inner join operation between two tables in the MySQL database. An optional condition can be applied.
     - left_join: Performs a left outer join operation between two tables in the MySQL database. An optional condition can be applied.
     - right_join: Performs a right outer join operation between two tables in the MySQL database. An optional condition can be applied.
+
+    The find_by_id, find_by_ids, find_all and join methods can load only some columns, and return CompactRows
+    instead of ORM instances (see SQLDataSource.find_all). find_all, count and the join methods can be served from an
+    in-process result cache, invalidated by the writes to their tables (see SQLDataSource.enable_result_cache).
+    Several calls can share one session and commit together in a transaction scope (see SQLDataSource.transaction).
+    Conditions can be structured filters, or raw SQL with :name placeholders and params, whose values are sent as
+    bound parameters so that repeated queries reuse their compiled statements (see SQLDataSource.find_all).
     """
 
+    # MySQL's prepared statement protocol limits a statement to 65535 placeholders.
+    _MAX_BIND_PARAMETERS = 65535
+
     def __init__(self, connection):
         super().__init__(connection)
 
-    def _apply_condition(self, query, condition):
-        if condition:
-            query = query.filter(text(condition))
+    def _apply_condition(self, query, condition, resolve, params=None):
+        clause = self._condition_clause(condition, resolve, params)
+        if clause is not None:
+            query = query.filter(clause)
         return query
 
+    @invalidates('data_entity_key')
+    @resilient(idempotent=False)
     def insert(self, data_entity_key: str, data: dict):
         session = self.get_new_session()
         try:
@@ -42,6 +75,97 @@ class MySQLDataSource(SQLDataSource):
         finally:
             session.close()
 
+    def _upsert_statement(self, table, conflict_keys, update_columns):
+        # MySQL detects conflicts on every primary key and unique index, so conflict_keys isn't part of the statement.
+        statement = mysql.insert(table)
+        if not update_columns:
+            # A no-op assignment, as MySQL has no DO NOTHING.
+            update_columns = conflict_keys
+        return statement.on_duplicate_key_update(
+            {column: statement.inserted[column] for column in update_columns})
+
+    def _bulk_value(self, value):
+        if isinstance(value, bool):
+            return '1' if value else '0'
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            raise TypeError("Binary values can't be bulk loaded as CSV; use insert_many.")
+        return super()._bulk_value(value)
+
+    def _require_local_infile(self):
+        if not self._connection.local_infile:
+            raise LocalInfileDisabled(f"Connection {self._connection.name} doesn't allow LOAD DATA LOCAL INFILE, "
+                                      f"set local_infile to bulk load.")
+
+    def _bulk_load_rows(self, table, columns, rows):
+        self._require_local_infile()
+        # The rows are written to the temporary file in chunks as they're consumed, so memory usage stays flat.
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='', suffix='.csv', delete=False) as file:
+            try:
+                for chunk in encode_csv_rows(rows, columns, 'NULL', self._bulk_value):
+                    file.write(chunk)
+            except BaseException:
+                os.remove(file.name)
+                raise
+        try:
+            return self._load_data(table, columns, file.name, 'csv', False)
+        finally:
+            os.remove(file.name)
+
+    def _bulk_load_file(self, table, columns, source, format, header):
+        if format not in ('csv', 'text'):
+            raise ValueError(f"Unsupported bulk load format: {format}")
+        self._require_local_infile()
+        if not hasattr(source, 'read'):
+            return self._load_data(table, columns, os.fsdecode(source), format, header)
+
+        # LOAD DATA reads a file by name, so file objects are copied to a temporary file first.
+        with tempfile.NamedTemporaryFile('wb', suffix=f".{format}", delete=False) as file:
+            shutil.copyfileobj(source, file)
+        try:
+            return self._load_data(table, columns, file.name, format, header)
+        finally:
+            os.remove(file.name)
+
+    @resilient(idempotent=False)
+    def _load_data(self, table, columns, path, format, header):
+        """
+        Run LOAD DATA LOCAL INFILE. The client streams the file to the server.
+
+        CSV files are read with RFC 4180 quoting (quotes doubled, no backslash escapes), and the unquoted word NULL
+        as NULL. Text files use MySQL's default tab-separated format, with backslash escapes and \\N as NULL.
+
+        Args:
+        - table: The SQLAlchemy Table.
+        - columns: The names of the columns, in the order of the file's fields.
+        - path: The path of the file.
+        - format: 'csv' or 'text'.
+        - header: Whether the file starts with a header line.
+
+        Returns:
+        - The number of loaded rows.
+        """
+        preparer = self._connection.connection_engine.dialect.identifier_preparer
+        statement = f"LOAD DATA LOCAL INFILE %s INTO TABLE {preparer.format_table(table)} CHARACTER SET utf8mb4 "
+        if format == 'csv':
+            statement += "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' LINES TERMINATED BY '\\n' "
+        if header:
+            statement += "IGNORE 1 LINES "
+        statement += f"({', '.join(preparer.quote(column) for column in columns)})"
+
+        session = self.get_new_session()
+        try:
+            cursor = session.connection().connection.cursor()
+            try:
+                rows = cursor.execute(statement, (path,))
+            finally:
+                cursor.close()
+            session.commit()
+            return rows
+        finally:
+            session.close()
+
+    @invalidates('data_entity_key')
+    @resilient(idempotent=True)
     def update(self, data_entity_key: str, data_entity_id: int, data: dict):
         session = self.get_new_session()
         try:
@@ -54,6 +178,8 @@ class MySQLDataSource(SQLDataSource):
         finally:
             session.close()
 
+    @invalidates('data_entity_key')
+    @resilient(idempotent=True)
     def remove(self, data_entity_key: str, data_entity_id: int):
         session = self.get_new_session()
         try:
@@ -64,83 +190,119 @@ class MySQLDataSource(SQLDataSource):
         finally:
             session.close()
 
+    @invalidates()
+    @resilient(idempotent=False)
     def query(self, query_string: str):
         session = self.get_new_session()
         result = session.execute(text(query_string))
         session.close()
         return result
 
-    def find_by_id(self, data_entity_key: str, data_entity_id: int):
-        session = self.get_new_session()
+    @resilient(idempotent=True)
+    def find_by_id(self, data_entity_key: str, data_entity_id, columns=None, compact=False):
+        session = self.get_new_session(read_only=True)
         try:
-            instance = session.query(self.get_model(data_entity_key)).get(data_entity_id)
+            model = self.get_model(data_entity_key)
+            if compact:
+                statement = self._select_columns(data_entity_key, columns).where(
+                    self._primary_key_clause(model.__table__, data_entity_id))
+                rows = self._fetch_compact(session, statement, data_entity_key)
+                return rows[0] if rows else None
+            query = session.query(model)
+            if columns:
+                query = query.options(load_only(*columns))
+            instance = query.get(data_entity_id)
             return instance
         finally:
             session.close()
 
-    def find_all(self, data_entity_key: str, condition=None):
-        session = self.get_new_session()
+    @cached_query('data_entity_key')
+    @resilient(idempotent=True)
+    def find_all(self, data_entity_key: str, condition=None, columns=None, compact=False, params=None):
+        session = self.get_new_session(read_only=True)
         try:
-            query = session.query(self.get_model(data_entity_key))
-            query = self._apply_condition(query, condition)
+            if compact:
+                return self._fetch_compact(session, self._select_columns(data_entity_key, columns, condition, params),
+                                           data_entity_key)
+            model = self.get_model(data_entity_key)
+            query = session.query(model)
+            if columns:
+                query = query.options(load_only(*columns))
+            query = self._apply_condition(query, condition, self._column_resolver(model.__table__), params)
             all_instances = query.all()
             return all_instances
         finally:
             session.close()
 
-    def count(self, data_entity_key: str, condition=None):
-        session = self.get_new_session()
+    @cached_query('data_entity_key')
+    @resilient(idempotent=True)
+    def count(self, data_entity_key: str, condition=None, params=None):
+        session = self.get_new_session(read_only=True)
         try:
-            query = session.query(self.get_model(data_entity_key))
-            query = self._apply_condition(query, condition)
+            model = self.get_model(data_entity_key)
+            query = session.query(model)
+            query = self._apply_condition(query, condition, self._column_resolver(model.__table__), params)
             count = query.count()
             return count
         finally:
             session.close()
 
+    @resilient(idempotent=True)
     def exists(self, data_entity_key: str, data_entity_id: int):
-        session = self.get_new_session()
+        session = self.get_new_session(read_only=True)
         try:
             instance = session.query(self.get_model(data_entity_key)).get(data_entity_id)
             return instance is not None
         finally:
             session.close()
 
-    def inner_join(self, primary_entity_key: str, secondary_entity_key: str, on_field: str, condition=None):
-        session = self.get_new_session()
+    @cached_query('primary_entity_key', 'secondary_entity_key')
+    @resilient(idempotent=True)
+    def inner_join(self, primary_entity_key: str, secondary_entity_key: str, on_field: str, condition=None,
+                   columns=None, compact=False, params=None):
+        session = self.get_new_session(read_only=True)
         try:
             primary = self.get_model(primary_entity_key)
             secondary = aliased(self.get_model(secondary_entity_key))
             query = session.query(primary, secondary).join(
                 secondary, getattr(primary, on_field) == getattr(secondary, on_field))
-            query = self._apply_condition(query, condition)
-            join_result = query.all()
+            entities = [(primary_entity_key, primary), (secondary_entity_key, secondary)]
+            query = self._apply_condition(query, condition, self._join_resolver(entities), params)
+            join_result = self._join_result(query, entities, columns, compact)
             return join_result
         finally:
             session.close()
 
-    def left_join(self, primary_entity_key: str, secondary_entity_key: str, on_field: str, condition=None):
-        session = self.get_new_session()
+    @cached_query('primary_entity_key', 'secondary_entity_key')
+    @resilient(idempotent=True)
+    def left_join(self, primary_entity_key: str, secondary_entity_key: str, on_field: str, condition=None,
+                  columns=None, compact=False, params=None):
+        session = self.get_new_session(read_only=True)
         try:
             primary = self.get_model(primary_entity_key)
             secondary = aliased(self.get_model(secondary_entity_key))
             query = session.query(primary, secondary).outerjoin(
                 secondary, getattr(primary, on_field) == getattr(secondary, on_field))
-            query = self._apply_condition(query, condition)
-            join_result = query.all()
+            entities = [(primary_entity_key, primary), (secondary_entity_key, secondary)]
+            query = self._apply_condition(query, condition, self._join_resolver(entities), params)
+            join_result = self._join_result(query, entities, columns, compact)
             return join_result
         finally:
             session.close()
 
-    def right_join(self, primary_entity_key: str, secondary_entity_key: str, on_field: str, condition=None):
-        session = self.get_new_session()
+    @cached_query('primary_entity_key', 'secondary_entity_key')
+    @resilient(idempotent=True)
+    def right_join(self, primary_entity_key: str, secondary_entity_key: str, on_field: str, condition=None,
+                   columns=None, compact=False, params=None):
+        session = self.get_new_session(read_only=True)
         try:
             primary = aliased(self.get_model(primary_entity_key))
             secondary = self.get_model(secondary_entity_key)
             query = session.query(secondary, primary).outerjoin(
                 primary, getattr(primary, on_field) == getattr(secondary, on_field))
-            query = self._apply_condition(query, condition)
-            join_result = query.all()
+            entities = [(secondary_entity_key, secondary), (primary_entity_key, primary)]
+            query = self._apply_condition(query, condition, self._join_resolver(entities), params)
+            join_result = self._join_result(query, entities, columns, compact)
             return join_result
         finally:
             session.close()
@@ -1,6 +1,10 @@
-from sqlalchemy.orm import aliased
-from sqlalchemy.sql import text, func
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import aliased, load_only
+from sqlalchemy.sql import func, text
 
+from connections.resilience import resilient
+from datasources.bulk_io import IterableReader, encode_csv_rows
+from datasources.query_result_cache import cached_query, invalidates
 from datasources.sql_datasource import SQLDataSource
 
 
@@ -12,26 +16,50 @@ class PostgreSQLDataSource(SQLDataSource):
 
     Methods:
     - insert: Inserts a new record into a table in the PostgreSQL database.
+    - insert_many: Inserts many records in batches (see SQLDataSource.insert_many), returning the generated keys with RETURNING.
     - update: Updates an existing record in a table in the PostgreSQL database.
+    - bulk_load: Loads many records with COPY ... FROM STDIN, streaming them as CSV (see SQLDataSource.bulk_load).
+    - upsert_many: Inserts or updates many records with INSERT ... ON CONFLICT DO UPDATE (see SQLDataSource.upsert_many).
     - remove: Deletes an existing record from a table in the PostgreSQL database.
+    - update_where: Updates the records matching a condition in one statement or in chunks (see SQLDataSource.update_where).
+    - remove_where: Deletes the records matching a condition in one statement or in chunks (see SQLDataSource.remove_where).
     - query: Executes a SQL query against the PostgreSQL database.
     - find_by_id: Fetches a record by id from a table in the PostgreSQL database.
+    - find_by_ids: Fetches many records by id from a table in the PostgreSQL database with chunked IN queries (see SQLDataSource.find_by_ids).
     - find_all: Fetches all records from a table in the PostgreSQL database.
+    - iter_all: Streams all records from a table in the PostgreSQL database with a server-side cursor (see SQLDataSource.iter_all).
+    - find_page: Fetches a page of records from a table in the PostgreSQL database with keyset pagination (see SQLDataSource.find_page).
+    - find_frame: Fetches records from a table in the PostgreSQL database into NumPy arrays or a DataFrame (see SQLDataSource.find_frame).
+    - iter_record_batches: Streams records from a table in the PostgreSQL database as Arrow RecordBatches (see SQLDataSource.iter_record_batches).
+    - export_parquet: Exports records from a table in the PostgreSQL database to a Parquet file (see SQLDataSource.export_parquet).
     - count: Counts all records from a table in the PostgreSQL database.
     - exists: Checks if a record exists in a table in the PostgreSQL database.
     - inner_join: Performs an inner join operation between two tables in the PostgreSQL database.
     - left_join: Performs a left outer join operation between two tables in the PostgreSQL database.
     - right_join: Performs a right outer join operation between two tables in the PostgreSQL database.
+
+    The find_by_id, find_by_ids, find_all and join methods can load only some columns, and return CompactRows
+    instead of ORM instances (see SQLDataSource.find_all). find_all, count and the join methods can be served from an
+    in-process result cache, invalidated by the writes to their tables (see SQLDataSource.enable_result_cache).
+    Several calls can share one session and commit together in a transaction scope (see SQLDataSource.transaction).
+    Conditions can be structured filters, or raw SQL with :name placeholders and params, whose values are sent as
+    bound parameters so that repeated queries reuse their compiled statements (see SQLDataSource.find_all).
     """
 
+    # PostgreSQL's wire protocol limits a statement to 32767 bind parameters.
+    _MAX_BIND_PARAMETERS = 32767
+
     def __init__(self, connection):
         super().__init__(connection)
 
-    def _apply_condition(self, query, condition):
-        if condition:
-            query = query.filter(text(condition))
+    def _apply_condition(self, query, condition, resolve, params=None):
+        clause = self._condition_clause(condition, resolve, params)
+        if clause is not None:
+            query = query.filter(clause)
         return query
 
+    @invalidates('data_entity_key')
+    @resilient(idempotent=False)
     def insert(self, data_entity_key: str, data: dict):
         session = self.get_new_session()
         try:
@@ -42,6 +70,101 @@ class PostgreSQLDataSource(SQLDataSource):
         finally:
             session.close()
 
+    @resilient(idempotent=False)
+    def _insert_batch(self, table, batch, return_ids):
+        """
+        Insert a batch of rows in a single transaction.
+
+        With return_ids, the batch is sent as multi-row INSERT ... VALUES ... RETURNING statements, split so each
+        statement stays below PostgreSQL's limit of bind parameters. Otherwise it's sent as one executemany, which
+        psycopg2 batches into multi-row statements itself.
+
+        Args:
+        - table: The SQLAlchemy Table.
+        - batch: A list of dictionaries mapping column names to values.
+        - return_ids: Whether to return the generated primary keys.
+
+        Returns:
+        - The list of primary keys if return_ids is True, None otherwise.
+        """
+        session = self.get_new_session()
+        try:
+            ids = None
+            if return_ids:
+                ids = []
+                rows_per_statement = max(1, self._MAX_BIND_PARAMETERS // max(1, len(batch[0])))
+                for statement_rows in self._batches(batch, rows_per_statement):
+                    statement = table.insert().values(statement_rows).returning(*table.primary_key.columns)
+                    ids.extend(self._primary_key_value(row) for row in session.execute(statement))
+            else:
+                session.execute(table.insert(), batch)
+            session.commit()
+            return ids
+        finally:
+            session.close()
+
+    def _upsert_statement(self, table, conflict_keys, update_columns):
+        statement = postgresql.insert(table)
+        if not update_columns:
+            return statement.on_conflict_do_nothing(index_elements=conflict_keys)
+        return statement.on_conflict_do_update(
+            index_elements=conflict_keys,
+            set_={column: statement.excluded[column] for column in update_columns})
+
+    def _bulk_value(self, value):
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return '\\x' + bytes(value).hex()
+        return super()._bulk_value(value)
+
+    def _bulk_load_rows(self, table, columns, rows):
+        chunks = (chunk.encode('utf-8') for chunk in encode_csv_rows(rows, columns, '', self._bulk_value))
+        return self._copy_from(table, columns, IterableReader(chunks), 'csv', False)
+
+    def _bulk_load_file(self, table, columns, source, format, header):
+        if format not in ('csv', 'text', 'binary'):
+            raise ValueError(f"Unsupported bulk load format: {format}")
+        if hasattr(source, 'read'):
+            return self._copy_from(table, columns, source, format, header)
+        with open(source, 'rb') as file:
+            return self._copy_from(table, columns, file, format, header)
+
+    @resilient(idempotent=False)
+    def _copy_from(self, table, columns, file, format, header):
+        """
+        Run COPY ... FROM STDIN, streaming a file to the server.
+
+        Args:
+        - table: The SQLAlchemy Table.
+        - columns: The names of the columns, in the order of the file's fields.
+        - file: A binary file object, read in chunks by psycopg2.
+        - format: The COPY format: 'csv', 'text' or 'binary'.
+        - header: Whether a CSV file starts with a header line.
+
+        Returns:
+        - The number of copied rows.
+        """
+        preparer = self._connection.connection_engine.dialect.identifier_preparer
+        options = [f"FORMAT {format}"]
+        if header and format == 'csv':
+            options.append("HEADER true")
+        statement = (f"COPY {preparer.format_table(table)} ({', '.join(preparer.quote(column) for column in columns)}) "
+                     f"FROM STDIN WITH ({', '.join(options)})")
+
+        session = self.get_new_session()
+        try:
+            cursor = session.connection().connection.cursor()
+            try:
+                cursor.copy_expert(statement, file)
+                rows = cursor.rowcount
+            finally:
+                cursor.close()
+            session.commit()
+            return rows
+        finally:
+            session.close()
+
+    @invalidates('data_entity_key')
+    @resilient(idempotent=True)
     def update(self, data_entity_key: str, data_entity_id, data: dict):
         session = self.get_new_session()
         try:
@@ -53,6 +176,8 @@ class PostgreSQLDataSource(SQLDataSource):
         finally:
             session.close()
 
+    @invalidates('data_entity_key')
+    @resilient(idempotent=True)
     def remove(self, data_entity_key: str, data_entity_id):
         session = self.get_new_session()
         try:
@@ -63,81 +188,124 @@ class PostgreSQLDataSource(SQLDataSource):
         finally:
             session.close()
 
+    @invalidates()
+    @resilient(idempotent=False)
     def query(self, query_string: str):
-        result = self._connection.connection_engine.execute(query_string)
-        return result.fetchall()
-
-    def find_by_id(self, data_entity_key: str, data_entity_id):
+        # The query runs in a session, so it joins the current transaction scope, if any.
         session = self.get_new_session()
         try:
-            instance = session.query(self.get_model(data_entity_key)).get(data_entity_id)
+            result = session.execute(text(query_string))
+            rows = result.fetchall() if result.returns_rows else None
+            session.commit()
+            return rows
+        finally:
+            session.close()
+
+    @resilient(idempotent=True)
+    def find_by_id(self, data_entity_key: str, data_entity_id, columns=None, compact=False):
+        session = self.get_new_session(read_only=True)
+        try:
+            model = self.get_model(data_entity_key)
+            if compact:
+                statement = self._select_columns(data_entity_key, columns).where(
+                    self._primary_key_clause(model.__table__, data_entity_id))
+                rows = self._fetch_compact(session, statement, data_entity_key)
+                return rows[0] if rows else None
+            query = session.query(model)
+            if columns:
+                query = query.options(load_only(*columns))
+            instance = query.get(data_entity_id)
             return instance
         finally:
             session.close()
 
-    def find_all(self, data_entity_key: str, condition=None):
-        session = self.get_new_session()
+    @cached_query('data_entity_key')
+    @resilient(idempotent=True)
+    def find_all(self, data_entity_key: str, condition=None, columns=None, compact=False, params=None):
+        session = self.get_new_session(read_only=True)
         try:
-            query = session.query(self.get_model(data_entity_key))
-            query = self._apply_condition(query, condition)
+            if compact:
+                return self._fetch_compact(session, self._select_columns(data_entity_key, columns, condition, params),
+                                           data_entity_key)
+            model = self.get_model(data_entity_key)
+            query = session.query(model)
+            if columns:
+                query = query.options(load_only(*columns))
+            query = self._apply_condition(query, condition, self._column_resolver(model.__table__), params)
             all_instances = query.all()
             return all_instances
         finally:
             session.close()
 
-    def count(self, data_entity_key: str, condition=None):
-        session = self.get_new_session()
+    @cached_query('data_entity_key')
+    @resilient(idempotent=True)
+    def count(self, data_entity_key: str, condition=None, params=None):
+        session = self.get_new_session(read_only=True)
         try:
-            query = session.query(func.count(self.get_model(data_entity_key).id))
-            query = self._apply_condition(query, condition)
+            model = self.get_model(data_entity_key)
+            query = session.query(func.count(model.id))
+            query = self._apply_condition(query, condition, self._column_resolver(model.__table__), params)
             count = query.scalar()
             return count
         finally:
             session.close()
 
+    @resilient(idempotent=True)
     def exists(self, data_entity_key: str, data_entity_id):
-        session = self.get_new_session()
+        session = self.get_new_session(read_only=True)
         try:
             instance = session.query(self.get_model(data_entity_key)).get(data_entity_id)
             return instance is not None
         finally:
             session.close()
 
-    def inner_join(self, primary_entity_key: str, secondary_entity_key: str, on_field: str, condition=None):
-        session = self.get_new_session()
+    @cached_query('primary_entity_key', 'secondary_entity_key')
+    @resilient(idempotent=True)
+    def inner_join(self, primary_entity_key: str, secondary_entity_key: str, on_field: str, condition=None,
+                   columns=None, compact=False, params=None):
+        session = self.get_new_session(read_only=True)
         try:
             primary = self.get_model(primary_entity_key)
             secondary = aliased(self.get_model(secondary_entity_key))
             query = session.query(primary, secondary).join(
                 secondary, getattr(primary, on_field) == getattr(secondary, on_field))
-            query = self._apply_condition(query, condition)
-            join_result = query.all()
+            entities = [(primary_entity_key, primary), (secondary_entity_key, secondary)]
+            query = self._apply_condition(query, condition, self._join_resolver(entities), params)
+            join_result = self._join_result(query, entities, columns, compact)
             return join_result
         finally:
             session.close()
 
-    def left_join(self, primary_entity_key: str, secondary_entity_key: str, on_field: str, condition=None):
-        session = self.get_new_session()
+    @cached_query('primary_entity_key', 'secondary_entity_key')
+    @resilient(idempotent=True)
+    def left_join(self, primary_entity_key: str, secondary_entity_key: str, on_field: str, condition=None,
+                  columns=None, compact=False, params=None):
+        session = self.get_new_session(read_only=True)
         try:
             primary = self.get_model(primary_entity_key)
             secondary = aliased(self.get_model(secondary_entity_key))
             query = session.query(primary, secondary).outerjoin(
                 secondary, getattr(primary, on_field) == getattr(secondary, on_field))
-            query = self._apply_condition(query, condition)
-            join_result = query.all()
+            entities = [(primary_entity_key, primary), (secondary_entity_key, secondary)]
+            query = self._apply_condition(query, condition, self._join_resolver(entities), params)
+            join_result = self._join_result(query, entities, columns, compact)
             return join_result
         finally:
             session.close()
 
-    def right_join(self, primary_entity_key: str, secondary_entity_key: str, on_field: str, condition=None):
-        session = self.get_new_session()
+    @cached_query('primary_entity_key', 'secondary_entity_key')
+    @resilient(idempotent=True)
+    def right_join(self, primary_entity_key: str, secondary_entity_key: str, on_field: str, condition=None,
+                   columns=None, compact=False, params=None):
+        session = self.get_new_session(read_only=True)
         try:
             primary = aliased(self.get_model(primary_entity_key))
             secondary = self.get_model(secondary_entity_key)
             query = session.query(secondary, primary).outerjoin(
                 primary, getattr(primary, on_field) == getattr(secondary, on_field))
-            query = self._apply_condition(query, condition)
-            join_result = query.all()
+            entities = [(secondary_entity_key, secondary), (primary_entity_key, primary)]
+            query = self._apply_condition(query, condition, self._join_resolver(entities), params)
+            join_result = self._join_result(query, entities, columns, compact)
             return join_result
         finally:
             session.close()
@@ -0,0 +1,315 @@
+import functools
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy.engine import Row
+
+from datasources.compact_row import CompactRow, compact_row_class
+
+
+def _freeze(value):
+    """Turn the arguments of a call into a hashable cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        frozen = tuple(_freeze(item) for item in value)
+        return frozenset(frozen) if isinstance(value, (set, frozenset)) else frozen
+    return value
+
+
+def snapshot(value):
+    """
+    Get an immutable copy of a query result, which can be shared between threads.
+
+    Lists and rows become tuples, and ORM instances become CompactRows of their loaded column attributes. Other values
+    (numbers, strings, CompactRows...) are returned as they are.
+
+    Args:
+    - value: The query result.
+
+    Returns:
+    - The immutable copy.
+    """
+    if isinstance(value, CompactRow):
+        return value
+    if isinstance(value, (list, tuple, Row)):
+        # Rows of joins hold ORM instances, which are snapshotted too.
+        return tuple(snapshot(item) for item in value)
+    mapper = getattr(type(value), '__mapper__', None)
+    if mapper is not None:
+        # Only the loaded attributes are kept: those deferred by a projection can't be loaded once detached.
+        loaded = value.__dict__
+        fields = tuple(attribute.key for attribute in mapper.column_attrs if attribute.key in loaded)
+        return compact_row_class(mapper.local_table.name, fields)(*(loaded[field] for field in fields))
+    return value
+
+
+def _approximate_size(value):
+    """Approximate the memory footprint of a snapshot, in bytes, following tuples and CompactRows."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, CompactRow)):
+        size += sum(_approximate_size(item) for item in value)
+    return size
+
+
+class QueryResultCache:
+    """
+    QueryResultCache is an in-process cache of query results, bounded in entries and in approximate bytes, with LRU
+    eviction and a time to live.
+
+    Every entry is tagged with the tables its query read, so a write to a table drops exactly the entries that
+    depend on it. Results are stored as immutable snapshots (see snapshot), so a cached result is shared by every
+    caller without copying.
+
+    Attributes:
+    - _max_entries: The maximum number of entries.
+    - _max_bytes: (Optional) The maximum approximate size of the entries, in bytes.
+    - _ttl: (Optional) The time to live of the entries, in seconds.
+    - _entries: An OrderedDict mapping keys to (value, tables, size, expiry) tuples, least recently used first.
+    - _tables: A dictionary mapping table names to the keys of the entries that read them.
+    - _bytes: The approximate size of the entries, in bytes.
+    - _generations: A dictionary mapping table names to the number of times they were invalidated, and None to the
+      number of times the cache was cleared. Results read before an invalidation of their tables aren't cached.
+    - _stats: A dictionary of the hit, miss, eviction, expiration and invalidation counters.
+    - _lock: A lock guarding the entries, as datasources are shared between threads.
+
+    The following methods are implemented in this class:
+    - get: Returns the cached result of a key.
+    - generation: Returns the invalidation state of some tables, to pass to put.
+    - put: Caches a result.
+    - invalidate_tables: Drops the entries that read some tables.
+    - clear: Drops every entry.
+    - stats: Returns the cache counters and size.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, max_entries=1024, max_bytes=None, ttl=60):
+        """
+        Initialize the QueryResultCache.
+
+        Args:
+        - max_entries: (Optional) The maximum number of entries.
+        - max_bytes: (Optional) The maximum approximate size of the entries, in bytes. Defaults to no limit.
+        - ttl: (Optional) The time to live of the entries, in seconds. Defaults to 60; None disables expiry.
+        """
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._tables = {}
+        self._bytes = 0
+        self._generations = {}
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Get the cached result of a key, marking it as recently used.
+
+        Args:
+        - key: The key of the entry.
+        - default: (Optional) The value returned if the key isn't cached or has expired.
+
+        Returns:
+        - The cached result, or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[3] is not None and entry[3] <= time.monotonic():
+                self._remove(key)
+                self._stats['expirations'] += 1
+                entry = None
+            if entry is None:
+                self._stats['misses'] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry[0]
+
+    def generation(self, tables):
+        """
+        Get the invalidation state of some tables. Take it before running a query, and pass it to put.
+
+        Args:
+        - tables: The names of the tables.
+
+        Returns:
+        - An opaque value, which changes when any of the tables is invalidated.
+        """
+        with self._lock:
+            return tuple(self._generations.get(table, 0) for table in (None, *tables))
+
+    def put(self, key, value, tables, generation=None):
+        """
+        Cache a result, evicting the least recently used entries if the cache is full.
+
+        Args:
+        - key: The key of the entry.
+        - value: The result. It's stored, and returned, as an immutable snapshot.
+        - tables: The names of the tables the result was read from.
+        - generation: (Optional) The generation of the tables taken before the query ran. If a table was
+          invalidated since, the result may be stale and isn't cached.
+
+        Returns:
+        - The snapshot of the result.
+        """
+        value = snapshot(value)
+        size = _approximate_size(value)
+        if self._max_bytes is not None and size > self._max_bytes:
+            return value
+
+        expiry = time.monotonic() + self._ttl if self._ttl is not None else None
+        with self._lock:
+            if generation is not None and generation != tuple(self._generations.get(table, 0)
+                                                              for table in (None, *tables)):
+                return value
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, tuple(tables), size, expiry)
+            self._bytes += size
+            for table in tables:
+                self._tables.setdefault(table, set()).add(key)
+
+            while self._entries and (len(self._entries) > self._max_entries or
+                                     (self._max_bytes is not None and self._bytes > self._max_bytes)):
+                self._remove(next(iter(self._entries)))
+                self._stats['evictions'] += 1
+        return value
+
+    def _remove(self, key):
+        value, tables, size, expiry = self._entries.pop(key)
+        self._bytes -= size
+        for table in tables:
+            keys = self._tables.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tables[table]
+
+    def invalidate_tables(self, tables):
+        """
+        Drop the entries that read any of the given tables.
+
+        Args:
+        - tables: The names of the tables.
+
+        Returns:
+        - The number of entries dropped.
+        """
+        with self._lock:
+            keys = set()
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+                keys.update(self._tables.get(table, ()))
+            for key in keys:
+                self._remove(key)
+            self._stats['invalidations'] += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """
+        Drop every entry.
+        """
+        with self._lock:
+            self._stats['invalidations'] += len(self._entries)
+            self._generations[None] = self._generations.get(None, 0) + 1
+            self._entries.clear()
+            self._tables.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Get the cache counters and size.
+
+        Returns:
+        - A dictionary with the hit, miss, eviction, expiration and invalidation counts, the hit rate, the number of
+          entries and their approximate size in bytes.
+        """
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries), bytes=self._bytes)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else None
+        return stats
+
+
+def cached_query(*table_arguments):
+    """
+    Decorate a datasource read method so its results are served from the datasource's result cache, if one is
+    enabled. Results are keyed by the method name and its arguments, and tagged with the tables it reads.
+
+    Cached calls return immutable snapshots (see snapshot) instead of lists of ORM instances. Calls made inside a
+    transaction scope bypass the cache, as they may see uncommitted changes.
+
+    Args:
+    - table_arguments: The names of the method's arguments holding the names of the tables it reads.
+
+    Returns:
+    - The method decorator.
+    """
+
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = self._result_cache
+            if cache is None or self._connection.in_transaction:
+                return method(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            del arguments['self']
+            key = (method.__name__, _freeze(arguments))
+            result = cache.get(key, QueryResultCache._MISSING)
+            if result is QueryResultCache._MISSING:
+                tables = [arguments[name] for name in table_arguments]
+                generation = cache.generation(tables)
+                result = cache.put(key, method(self, *args, **kwargs), tables, generation)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def invalidates(*table_arguments):
+    """
+    Decorate a datasource write method so it drops the cached results of the tables it writes, once it returns or
+    raises (a failed batched write may have committed some batches). Inside a transaction scope, they're dropped
+    again when the scope ends, as results read by other threads until then don't include the write.
+
+    Args:
+    - table_arguments: The names of the method's arguments holding the names of the tables it writes. Without
+      any, the method may write any table and every cached result is dropped.
+
+    Returns:
+    - The method decorator.
+    """
+
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                cache = self._result_cache
+                if cache is not None:
+                    if table_arguments:
+                        arguments = signature.bind(self, *args, **kwargs).arguments
+                        invalidate = functools.partial(cache.invalidate_tables,
+                                                       [arguments[name] for name in table_arguments])
+                    else:
+                        invalidate = cache.clear
+                    invalidate()
+                    self._connection.after_transaction(invalidate)
+
+        return wrapper
+
+    return decorator
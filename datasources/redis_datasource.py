@@ -1,8 +1,28 @@
 import json
+from typing import TYPE_CHECKING
 
-from connections import RedisConnection
+from connections.resilience import resilient
 from datasources.datasource import DataSource
 
+if TYPE_CHECKING:
+    from connections.redis_connection import RedisConnection
+
+
+def is_transient_redis_error(error):
+    """
+    Classify an error raised by a Redis operation. Connection errors and timeouts are transient.
+
+    Args:
+    - error: The exception raised by the operation.
+
+    Returns:
+    - True if the error is transient, False otherwise.
+    """
+    # redis-py is imported here rather than at module level, as it's loaded by the connection anyway.
+    from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+    return isinstance(error, (RedisConnectionError, RedisTimeoutError))
+
 
 class RedisDataSource(DataSource):
     """
@@ -16,35 +36,53 @@ class RedisDataSource(DataSource):
     - set_key: Sets the value of a key in Redis.
     - get_key: Retrieves the value of a key from Redis.
     - delete_key: Deletes a key from Redis.
+    - get_keys: Retrieves the values of several keys from Redis in one round trip.
+    - set_keys: Sets the values of several keys in Redis in one round trip.
+    - delete_keys: Deletes several keys from Redis in one round trip.
     - key_exists: Checks if a key exists in Redis.
     - set_hash_field: Sets the value of a field in a Redis hash.
     - get_hash_field: Retrieves the value of a field from a Redis hash.
     - delete_hash_field: Deletes a field from a Redis hash.
-    - set_set_value: Adds a value to a Redis set.
+    - set_set_value: Adds one or more values to a Redis set.
     - get_set_values: Retrieves all values from a Redis set.
-    - remove_set_value: Removes a value from a Redis set.
+    - remove_set_value: Removes one or more values from a Redis set.
     - set_json_value: Sets the value of a key in Redis as a JSON object using RedisJSON.
     - get_json_value: Retrieves the value of a key from Redis as a JSON object using RedisJSON.
 
     Note: This implementation assumes the availability of appropriate Redis commands in the underlying connection engine.
     """
 
-    def __init__(self, connection: RedisConnection):
+    def __init__(self, connection: 'RedisConnection'):
         super().__init__(connection)
 
-    def set_key(self, key: str, value: str):
+    def _is_transient_error(self, error):
+        """
+        Classify an error raised by an operation. Connection errors and timeouts are transient.
+
+        Args:
+        - error: The exception raised by the operation.
+
+        Returns:
+        - True if the error is transient, False otherwise.
+        """
+        return is_transient_redis_error(error)
+
+    @resilient(idempotent=True)
+    def set_key(self, key: str, value: str, ttl=None):
         """
         Set the value of a key in Redis.
 
         Args:
         - key: The key to set.
         - value: The value to set.
+        - ttl: (Optional) The time to live of the key, in seconds. Defaults to no expiry.
 
         Returns:
         - True if the operation was successful, False otherwise.
         """
-        return self._connection_engine.set(key, value)
+        return self._connection_engine.set(key, value, ex=ttl)
 
+    @resilient(idempotent=True)
     def get_key(self, key: str):
         """
         Retrieve the value of a key from Redis.
@@ -57,6 +95,7 @@ class RedisDataSource(DataSource):
         """
         return self._connection_engine.get(key)
 
+    @resilient(idempotent=True)
     def delete_key(self, key: str):
         """
         Delete a key from Redis.
@@ -69,6 +108,62 @@ class RedisDataSource(DataSource):
         """
         return self._connection_engine.delete(key)
 
+    @resilient(idempotent=True)
+    def get_keys(self, keys):
+        """
+        Retrieve the values of several keys from Redis in one round trip.
+
+        Args:
+        - keys: The keys to retrieve.
+
+        Returns:
+        - A list with the value of each key, in the order of the keys, with None for missing keys.
+        """
+        keys = list(keys)
+        if not keys:
+            return []
+        return self._connection_engine.mget(keys)
+
+    @resilient(idempotent=True)
+    def set_keys(self, mapping: dict, ttl=None):
+        """
+        Set the values of several keys in Redis in one round trip.
+
+        Args:
+        - mapping: A dictionary mapping the keys to their values.
+        - ttl: (Optional) The time to live of the keys, in seconds. Defaults to no expiry.
+
+        Returns:
+        - True if the operation was successful, False otherwise.
+        """
+        if not mapping:
+            return True
+        if ttl is None:
+            return self._connection_engine.mset(mapping)
+
+        # MSET can't set an expiry, so the SETs are pipelined instead, still in one round trip.
+        pipeline = self._connection_engine.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipeline.set(key, value, ex=ttl)
+        return all(pipeline.execute())
+
+    @resilient(idempotent=True)
+    def delete_keys(self, keys):
+        """
+        Delete several keys from Redis in one round trip.
+
+        Args:
+        - keys: The keys to delete.
+
+        Returns:
+        - The number of keys deleted.
+        """
+        keys = list(keys)
+        if not keys:
+            return 0
+        return self._connection_engine.delete(*keys)
+
+    @resilient(idempotent=True)
     def key_exists(self, key: str):
         """
         Check if a key exists in Redis.
@@ -81,6 +176,7 @@ class RedisDataSource(DataSource):
         """
         return self._connection_engine.exists(key)
 
+    @resilient(idempotent=True)
     def set_hash_field(self, key: str, field: str, value: str):
         """
         Set the value of a field in a Redis hash.
@@ -95,6 +191,7 @@ class RedisDataSource(DataSource):
         """
         return self._connection_engine.hset(key, field, value)
 
+    @resilient(idempotent=True)
     def get_hash_field(self, key: str, field: str):
         """
         Retrieve the value of a field from a Redis hash.
@@ -108,6 +205,7 @@ class RedisDataSource(DataSource):
         """
         return self._connection_engine.hget(key, field)
 
+    @resilient(idempotent=True)
     def delete_hash_field(self, key: str, field: str):
         """
         Delete a field from a Redis hash.
@@ -121,19 +219,30 @@ class RedisDataSource(DataSource):
         """
         return self._connection_engine.hdel(key, field)
 
-    def set_set_value(self, key: str, value: str):
+    @resilient(idempotent=True)
+    def set_set_value(self, key: str, *values, ttl=None):
         """
-        Add a value to a Redis set.
+        Add one or more values to a Redis set.
 
         Args:
         - key: The key of the set.
-        - value: The value to add.
+        - values: The values to add.
+        - ttl: (Optional) The time to live of the set, in seconds, reset by every call. Defaults to leaving the
+          set's expiry as it is.
 
         Returns:
         - The number of elements added to the set.
         """
-        return self._connection_engine.sadd(key, value)
-
+        if not values:
+            return 0
+        if ttl is None:
+            return self._connection_engine.sadd(key, *values)
+        pipeline = self._connection_engine.pipeline(transaction=False)
+        pipeline.sadd(key, *values)
+        pipeline.expire(key, ttl)
+        return pipeline.execute()[0]
+
+    @resilient(idempotent=True)
     def get_set_values(self, key: str):
         """
         Retrieve all values from a Redis set.
@@ -146,19 +255,23 @@ class RedisDataSource(DataSource):
         """
         return self._connection_engine.smembers(key)
 
-    def remove_set_value(self, key: str, value: str):
+    @resilient(idempotent=True)
+    def remove_set_value(self, key: str, *values):
         """
-        Remove a value from a Redis set.
+        Remove one or more values from a Redis set.
 
         Args:
         - key: The key of the set.
-        - value: The value to remove.
+        - values: The values to remove.
 
         Returns:
         - The number of elements removed from the set.
         """
-        return self._connection_engine.srem(key, value)
+        if not values:
+            return 0
+        return self._connection_engine.srem(key, *values)
 
+    @resilient(idempotent=True)
     def set_json_value(self, key: str, value):
         """
         Sets the value of a key in Redis as a JSON object using RedisJSON.
@@ -173,6 +286,7 @@ class RedisDataSource(DataSource):
         json_value = json.dumps(value)
         return self._connection_engine.execute_command('JSON.SET', key, '.', json_value)
 
+    @resilient(idempotent=True)
     def get_json_value(self, key: str):
         """
         Retrieves the value of a key from Redis as a JSON object using RedisJSON.
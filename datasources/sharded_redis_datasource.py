@@ -0,0 +1,257 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from datasources.consistent_hash_ring import ConsistentHashRing
+from datasources.datasource import DataSource
+from datasources.redis_datasource import RedisDataSource
+
+
+class ShardedRedisDataSource(DataSource):
+    """
+    ShardedRedisDataSource spreads keys over several Redis servers (shards) with client-side consistent hashing.
+
+    Each shard is a RedisConnection, identified by its name, and is served by its own RedisDataSource, so the
+    connection's pool and resilience policy apply per shard. A key always maps to the same shard, and hashes and sets
+    live entirely on the shard of their key. Adding a shard to N shards only remaps about 1/(N+1) of the keys;
+    the data of remapped keys is not migrated.
+
+    Multi-key operations (get_keys, set_keys, delete_keys) are split per shard and the shards are called in parallel.
+
+    Attributes:
+    - _shards: A dictionary mapping shard names to their RedisDataSource.
+    - _ring: The ConsistentHashRing mapping keys to shard names.
+    - _max_workers: (Optional) The maximum number of threads calling shards in parallel.
+    - _executor: The thread pool running multi-key operations, created on first use and recreated when the shards
+      change, so it is sized for the current number of shards.
+    - _executor_lock: A lock guarding the thread pool.
+
+    Methods:
+    - connect: Establishes the connections to every shard.
+    - disconnect: Disconnects from every shard.
+    - check_health: Checks whether every shard is healthy.
+    - add_shard: Adds a shard to the ring.
+    - remove_shard: Removes a shard from the ring.
+    - shard_for: Returns the RedisDataSource of the shard a key belongs to.
+    - get_keys, set_keys, delete_keys: Multi-key operations, run on the shards in parallel.
+    - set_key, get_key, delete_key, key_exists, set_hash_field, get_hash_field, delete_hash_field, set_set_value,
+      get_set_values, remove_set_value, set_json_value, get_json_value: See RedisDataSource.
+    """
+
+    def __init__(self, connections, virtual_nodes=160, max_workers=None):
+        """
+        Construct a new ShardedRedisDataSource instance.
+
+        Args:
+        - connections: The RedisConnections of the shards. Their names identify the shards on the ring.
+        - virtual_nodes: (Optional) The number of positions of each shard on the hash ring.
+        - max_workers: (Optional) The maximum number of threads calling shards in parallel. Defaults to one per shard.
+        """
+        super().__init__(None)
+        self._shards = {}
+        self._ring = ConsistentHashRing(virtual_nodes=virtual_nodes)
+        self._max_workers = max_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        for connection in connections:
+            self.add_shard(connection)
+
+    @property
+    def _connection_engine(self):
+        # There's no single engine - use shard_for(key).connection_engine.
+        return None
+
+    @property
+    def shards(self):
+        """Get a dictionary mapping shard names to their RedisDataSource."""
+        return dict(self._shards)
+
+    def add_shard(self, connection):
+        """
+        Add a shard to the ring. About 1/N of the keys are remapped to it, N being the new number of shards.
+
+        Args:
+        - connection: The RedisConnection of the shard.
+
+        Raises:
+        - ValueError: If a shard with the same name already exists.
+        """
+        if connection.name in self._shards:
+            raise ValueError(f"Shard {connection.name} already exists.")
+        self._shards[connection.name] = RedisDataSource(connection)
+        self._ring.add_node(connection.name)
+        self._reset_executor()
+
+    def remove_shard(self, name):
+        """
+        Remove a shard from the ring. Its keys are remapped to the remaining shards.
+
+        Args:
+        - name: The name of the shard.
+
+        Returns:
+        - The RedisDataSource of the removed shard.
+        """
+        self._ring.remove_node(name)
+        shard = self._shards.pop(name)
+        self._reset_executor()
+        return shard
+
+    def shard_for(self, key):
+        """
+        Get the RedisDataSource of the shard a key belongs to.
+
+        Args:
+        - key: The key.
+
+        Returns:
+        - The RedisDataSource of the shard.
+        """
+        return self._shards[self._ring.get_node(key)]
+
+    def connect(self):
+        """
+        Open the connections to every shard.
+        """
+        for shard in self._shards.values():
+            shard.connect()
+
+    def disconnect(self):
+        """
+        Close the connections to every shard, and stop the thread pool.
+        """
+        for shard in self._shards.values():
+            shard.disconnect()
+        self._reset_executor()
+
+    def _reset_executor(self):
+        """
+        Shut the thread pool down, letting the operations already submitted finish. The next multi-key operation
+        creates a new one, sized for the current number of shards.
+        """
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def check_health(self):
+        """
+        Check whether every shard is healthy.
+
+        Returns:
+        - True if every shard is healthy, False otherwise.
+        """
+        return all(shard.check_health() for shard in self._shards.values())
+
+    def _group_by_shard(self, keys):
+        groups = {}
+        for key in keys:
+            groups.setdefault(self._ring.get_node(key), []).append(key)
+        return groups
+
+    def _run_per_shard(self, operation, groups):
+        """
+        Run an operation on the keys of each shard, calling the shards in parallel.
+
+        Args:
+        - operation: A callable taking a RedisDataSource and the shard's part of the arguments.
+        - groups: A dictionary mapping shard names to their part of the arguments.
+
+        Returns:
+        - A dictionary mapping shard names to the operation's result.
+        """
+        if len(groups) <= 1:
+            return {name: operation(self._shards[name], group) for name, group in groups.items()}
+
+        # The tasks are submitted under the lock, so the pool can't be shut down by a concurrent add_shard meanwhile.
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers or len(self._shards),
+                                                    thread_name_prefix='sharded-redis')
+            futures = {name: self._executor.submit(operation, self._shards[name], group)
+                       for name, group in groups.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+    def get_keys(self, keys):
+        """
+        Retrieve the values of several keys, with one round trip per shard.
+
+        Args:
+        - keys: The keys to retrieve.
+
+        Returns:
+        - A list with the value of each key, in the order of the keys, with None for missing keys.
+        """
+        keys = list(keys)
+        groups = self._group_by_shard(keys)
+        results = self._run_per_shard(lambda shard, shard_keys: shard.get_keys(shard_keys), groups)
+
+        values = {}
+        for name, shard_keys in groups.items():
+            values.update(zip(shard_keys, results[name]))
+        return [values[key] for key in keys]
+
+    def set_keys(self, mapping: dict, ttl=None):
+        """
+        Set the values of several keys, with one round trip per shard.
+
+        Args:
+        - mapping: A dictionary mapping the keys to their values.
+        - ttl: (Optional) The time to live of the keys, in seconds. Defaults to no expiry.
+
+        Returns:
+        - True if the operation was successful on every shard, False otherwise.
+        """
+        groups = {name: {key: mapping[key] for key in shard_keys}
+                  for name, shard_keys in self._group_by_shard(mapping).items()}
+        results = self._run_per_shard(lambda shard, shard_mapping: shard.set_keys(shard_mapping, ttl), groups)
+        return all(results.values())
+
+    def delete_keys(self, keys):
+        """
+        Delete several keys, with one round trip per shard.
+
+        Args:
+        - keys: The keys to delete.
+
+        Returns:
+        - The number of keys deleted.
+        """
+        results = self._run_per_shard(lambda shard, shard_keys: shard.delete_keys(shard_keys),
+                                      self._group_by_shard(keys))
+        return sum(results.values())
+
+    def set_key(self, key: str, value: str, ttl=None):
+        return self.shard_for(key).set_key(key, value, ttl)
+
+    def get_key(self, key: str):
+        return self.shard_for(key).get_key(key)
+
+    def delete_key(self, key: str):
+        return self.shard_for(key).delete_key(key)
+
+    def key_exists(self, key: str):
+        return self.shard_for(key).key_exists(key)
+
+    def set_hash_field(self, key: str, field: str, value: str):
+        return self.shard_for(key).set_hash_field(key, field, value)
+
+    def get_hash_field(self, key: str, field: str):
+        return self.shard_for(key).get_hash_field(key, field)
+
+    def delete_hash_field(self, key: str, field: str):
+        return self.shard_for(key).delete_hash_field(key, field)
+
+    def set_set_value(self, key: str, *values, ttl=None):
+        return self.shard_for(key).set_set_value(key, *values, ttl=ttl)
+
+    def get_set_values(self, key: str):
+        return self.shard_for(key).get_set_values(key)
+
+    def remove_set_value(self, key: str, *values):
+        return self.shard_for(key).remove_set_value(key, *values)
+
+    def set_json_value(self, key: str, value):
+        return self.shard_for(key).set_json_value(key, value)
+
+    def get_json_value(self, key: str):
+        return self.shard_for(key).get_json_value(key)
@@ -1,13 +1,70 @@
+import contextvars
+import csv
+import io
+import json
+import os
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
+from itertools import chain, islice
 
+from sqlalchemy import and_, bindparam, exc, or_, select, tuple_
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+from sqlalchemy import types as sqltypes
+from sqlalchemy.dialects import sqlite
+
+from connections.resilience import resilient
 from connections.sql_connection import SQLConnection
+from datasources import codec
+from datasources.compact_row import compact_row_class
 from datasources.datasource import DataSource
+from datasources.filters import compile_condition
+from datasources.query_result_cache import QueryResultCache, invalidates
 
 
 class SQLDataSource(DataSource, ABC):
 
+    # The number of bind parameters a statement may have. This default is SQLite's historical limit; dialect
+    # datasources raise it to their own.
+    _MAX_BIND_PARAMETERS = 999
+    # Whether the dialect supports row-value comparisons, e.g. (a, b) IN ((1, 2), (3, 4)).
+    _SUPPORTS_TUPLE_IN = True
+
     def __init__(self, connection: SQLConnection):
         super().__init__(connection)
+        self._result_cache = None
+
+    @property
+    def result_cache(self):
+        """Get the QueryResultCache of the datasource, or None if result caching is disabled."""
+        return self._result_cache
+
+    def enable_result_cache(self, max_entries=1024, max_bytes=None, ttl=60):
+        """
+        Cache the results of find_all, count and the join methods in process, until a write through this
+        datasource changes one of the tables they read, or their TTL expires.
+
+        Cached calls return immutable snapshots: tuples instead of lists, and CompactRows instead of ORM instances.
+        Writes made through other datasources or processes aren't seen until the TTL expires.
+
+        Args:
+        - max_entries: (Optional) The maximum number of cached results.
+        - max_bytes: (Optional) The maximum approximate size of the cached results, in bytes.
+        - ttl: (Optional) The time to live of the cached results, in seconds, or None for no expiry.
+
+        Returns:
+        - The QueryResultCache.
+        """
+        self._result_cache = QueryResultCache(max_entries, max_bytes, ttl)
+        return self._result_cache
+
+    def disable_result_cache(self):
+        """
+        Stop caching results, and drop the cached ones.
+        """
+        self._result_cache = None
 
     def register_model(self, model):
         """
@@ -37,13 +94,56 @@ class SQLDataSource(DataSource, ABC):
         Returns:
         - The SQLAlchemy model for the table, or None if no such table exists.
         """
-        return self._connection.automap_base_model.classes.get(table_name)
+        return self._connection.get_model(table_name)
 
-    def get_new_session(self):
+    def get_new_session(self, read_only=False):
         """
         Get new SQLAlchemy session
+
+        Args:
+        - read_only: (Optional) Whether the session only reads, and may be served by a read replica.
+        """
+        return self._connection.get_new_session(read_only)
+
+    def transaction(self):
+        """
+        Open a transaction scope: the datasource calls made inside it, in the current thread or task, share one
+        session and one connection, and commit once when it exits (or roll back if it raises). Nested scopes are
+        savepoints. See SQLConnection.transaction.
+
+        Example:
+            with datasource.transaction():
+                order_id = datasource.insert('orders', order)
+                datasource.update('stock', item_id, {'quantity': quantity - 1})
+
+        Returns:
+        - A context manager yielding the scope's session.
         """
-        return self._connection.get_new_session()
+        return self._connection.transaction()
+
+    def compiled_cache_stats(self):
+        """
+        Get the hit rate of SQLAlchemy's compiled statement cache. See SQLConnection.compiled_cache_stats.
+
+        Returns:
+        - A dictionary with the hit, miss and uncached statement counts, the hit rate and the number of entries.
+        """
+        return self._connection.compiled_cache_stats()
+
+    def _is_transient_error(self, error):
+        """
+        Classify an error raised by an operation. Lost or invalidated connections, operational errors (e.g. a server
+        going away during a failover) and pool timeouts are transient.
+
+        Args:
+        - error: The exception raised by the operation.
+
+        Returns:
+        - True if the error is transient, False otherwise.
+        """
+        if isinstance(error, (exc.OperationalError, exc.InterfaceError, exc.DisconnectionError, exc.TimeoutError)):
+            return True
+        return isinstance(error, exc.DBAPIError) and error.connection_invalidated
 
     @property
     def declarative_base_model(self):
@@ -55,6 +155,1030 @@ class SQLDataSource(DataSource, ABC):
         """Get the SQLAlchemy declarative automap base model class instance."""
         return self._connection._automap_base_model
 
+    @staticmethod
+    def _batches(rows, batch_size):
+        """
+        Split an iterable into lists of at most batch_size items, consuming it lazily.
+
+        Args:
+        - rows: Any iterable, including generators.
+        - batch_size: The maximum number of items per batch.
+
+        Returns:
+        - A generator of lists.
+        """
+        iterator = iter(rows)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+            yield batch
+
+    @staticmethod
+    def _primary_key_value(primary_key):
+        """Unwrap single-column primary keys, keep composite ones as tuples."""
+        return primary_key[0] if len(primary_key) == 1 else tuple(primary_key)
+
+    @invalidates('data_entity_key')
+    def insert_many(self, data_entity_key: str, rows, batch_size=1000, return_ids=False):
+        """
+        Insert many rows into the specified table, with one transaction per batch.
+
+        Each batch is sent as a single executemany INSERT, so loading N rows costs N / batch_size round trips and
+        transactions instead of N. Rows are consumed lazily, so generators can be loaded with flat memory usage.
+        Batches are committed as they go: if a batch fails, the previous batches stay inserted.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - rows: An iterable of dictionaries mapping column names to values. All rows must have the same keys.
+        - batch_size: (Optional) The number of rows per batch.
+        - return_ids: (Optional) Whether to return the generated primary keys.
+
+        Returns:
+        - The number of inserted rows, or the list of their primary keys if return_ids is True.
+        """
+        table = self.get_model(data_entity_key).__table__
+
+        inserted = 0
+        ids = []
+        for batch in self._batches(rows, batch_size):
+            batch_ids = self._insert_batch(table, batch, return_ids)
+            inserted += len(batch)
+            if return_ids:
+                ids.extend(batch_ids)
+
+        return ids if return_ids else inserted
+
+    @resilient(idempotent=False)
+    def _insert_batch(self, table, batch, return_ids):
+        """
+        Insert a batch of rows in a single transaction.
+
+        Without return_ids, the batch is sent as one executemany statement. Generic dialects can't return the keys
+        generated by an executemany, so with return_ids the rows are inserted one by one within the transaction.
+        Dialects supporting RETURNING override this method.
+
+        Args:
+        - table: The SQLAlchemy Table.
+        - batch: A list of dictionaries mapping column names to values.
+        - return_ids: Whether to return the generated primary keys.
+
+        Returns:
+        - The list of primary keys if return_ids is True, None otherwise.
+        """
+        session = self.get_new_session()
+        try:
+            ids = None
+            if return_ids:
+                ids = [self._primary_key_value(session.execute(table.insert(), row).inserted_primary_key)
+                       for row in batch]
+            else:
+                session.execute(table.insert(), batch)
+            session.commit()
+            return ids
+        finally:
+            session.close()
+
+    @invalidates('data_entity_key')
+    def upsert_many(self, data_entity_key: str, rows, conflict_keys, update_columns=None, batch_size=1000):
+        """
+        Insert many rows, updating the existing rows they conflict with, with one transaction per batch.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - rows: An iterable of dictionaries mapping column names to values. All rows must have the same keys.
+        - conflict_keys: The columns of the primary key or unique constraint identifying conflicting rows.
+        - update_columns: (Optional) The columns updated on conflict. Defaults to every column of the rows that isn't
+          a conflict key.
+        - batch_size: (Optional) The number of rows per batch.
+
+        Returns:
+        - The number of rows processed.
+        """
+        table = self.get_model(data_entity_key).__table__
+
+        processed = 0
+        for batch in self._batches(rows, batch_size):
+            columns = update_columns
+            if columns is None:
+                columns = [column for column in batch[0] if column not in conflict_keys]
+            self._upsert_batch(self._upsert_statement(table, list(conflict_keys), list(columns)), batch)
+            processed += len(batch)
+
+        return processed
+
+    @resilient(idempotent=True)
+    def _upsert_batch(self, statement, batch):
+        session = self.get_new_session()
+        try:
+            session.execute(statement, batch)
+            session.commit()
+        finally:
+            session.close()
+
+    def _upsert_statement(self, table, conflict_keys, update_columns):
+        """
+        Build the dialect's insert-or-update statement. The base implementation compiles SQLite's
+        INSERT ... ON CONFLICT DO UPDATE, and dialects override it.
+
+        Args:
+        - table: The SQLAlchemy Table.
+        - conflict_keys: The columns identifying conflicting rows.
+        - update_columns: The columns updated on conflict.
+
+        Returns:
+        - The SQLAlchemy insert statement.
+        """
+        statement = sqlite.insert(table)
+        if not update_columns:
+            return statement.on_conflict_do_nothing(index_elements=conflict_keys)
+        return statement.on_conflict_do_update(
+            index_elements=conflict_keys,
+            set_={column: statement.excluded[column] for column in update_columns})
+
+    @invalidates('data_entity_key')
+    def update_many(self, data_entity_key: str, updates, batch_size=1000):
+        """
+        Update many rows by primary key without loading them, with one transaction per batch.
+
+        Within a batch, the updates changing the same columns are sent as one executemany UPDATE ... WHERE pk = ?.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - updates: An iterable of (id, changes) pairs, changes being a dictionary mapping column names to their new
+          values. For composite primary keys, id is a tuple in the order of the primary key columns.
+        - batch_size: (Optional) The number of updates per batch.
+
+        Returns:
+        - The number of rows matched.
+        """
+        table = self.get_model(data_entity_key).__table__
+        primary_key_columns = list(table.primary_key.columns)
+
+        matched = 0
+        for batch in self._batches(updates, batch_size):
+            groups = {}
+            for data_entity_id, changes in batch:
+                if not changes:
+                    continue
+                ids = data_entity_id if len(primary_key_columns) > 1 else (data_entity_id,)
+                parameters = {f"_pk_{column.name}": value for column, value in zip(primary_key_columns, ids)}
+                parameters.update({f"_value_{column}": value for column, value in changes.items()})
+                groups.setdefault(tuple(sorted(changes)), []).append(parameters)
+
+            statements = []
+            for columns, parameters in groups.items():
+                statement = table.update().where(
+                    and_(*[column == bindparam(f"_pk_{column.name}") for column in primary_key_columns])
+                ).values({column: bindparam(f"_value_{column}") for column in columns})
+                statements.append((statement, parameters))
+            matched += self._update_batch(statements)
+
+        return matched
+
+    @resilient(idempotent=True)
+    def _update_batch(self, statements):
+        session = self.get_new_session()
+        try:
+            matched = sum(session.execute(statement, parameters).rowcount for statement, parameters in statements)
+            session.commit()
+            return matched
+        finally:
+            session.close()
+
+    @invalidates('data_entity_key')
+    def bulk_load(self, data_entity_key: str, source, columns=None, format='csv', header=False):
+        """
+        Load many rows into a table with the database's native bulk loader (COPY for PostgreSQL, LOAD DATA for
+        MySQL), which is much faster than batched INSERTs. Rows are encoded and sent as a stream, so memory usage
+        stays flat. Other dialects fall back to insert_many.
+
+        Native loads are a single statement, which loads every row or none.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - source: Either an iterable of rows (dictionaries, or sequences of values in the order of columns), or a
+          file path or binary file object already in the given format.
+        - columns: (Optional) The names of the columns. Defaults to the keys of the first row for dictionaries, and
+          to every column of the table, in order, otherwise.
+        - format: (Optional) The format of a file source: 'csv', or a format of the dialect's loader ('text' for
+          both, 'binary' for PostgreSQL). Rows are always sent as CSV.
+        - header: (Optional) Whether a CSV file source starts with a header line, which is skipped.
+
+        Returns:
+        - A dictionary with the number of loaded rows ('rows'), the duration in seconds ('seconds') and the
+          throughput ('rows_per_second').
+        """
+        table = self.get_model(data_entity_key).__table__
+        start = time.perf_counter()
+        if isinstance(source, (str, bytes, os.PathLike)) or hasattr(source, 'read'):
+            rows = self._bulk_load_file(table, columns or [column.name for column in table.columns], source,
+                                        format, header)
+        else:
+            iterator = iter(source)
+            first = next(iterator, None)
+            if first is None:
+                rows = 0
+            else:
+                if columns is None:
+                    columns = list(first) if isinstance(first, dict) else [column.name for column in table.columns]
+                rows = self._bulk_load_rows(table, list(columns), chain([first], iterator))
+        seconds = time.perf_counter() - start
+        return {'rows': rows, 'seconds': seconds, 'rows_per_second': rows / seconds if seconds > 0 else None}
+
+    def _bulk_value(self, value):
+        """
+        Format a non-None value for the CSV stream of a bulk load.
+
+        Args:
+        - value: The value.
+
+        Returns:
+        - The value as a string.
+        """
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        return str(value)
+
+    def _bulk_load_rows(self, table, columns, rows):
+        """
+        Load rows into a table. This default inserts them with insert_many.
+
+        Args:
+        - table: The SQLAlchemy Table.
+        - columns: The names of the columns.
+        - rows: An iterable of dictionaries, or of sequences of values in the order of columns.
+
+        Returns:
+        - The number of loaded rows.
+        """
+        rows = (row if isinstance(row, dict) else dict(zip(columns, row)) for row in rows)
+        return self.insert_many(table.name, rows, batch_size=10000)
+
+    def _bulk_load_file(self, table, columns, source, format, header):
+        """
+        Load a file into a table. This default parses CSV files, and inserts their rows with insert_many.
+
+        Args:
+        - table: The SQLAlchemy Table.
+        - columns: The names of the columns, in the order of the file's fields.
+        - source: A file path or binary file object.
+        - format: The format of the file.
+        - header: Whether the file starts with a header line.
+
+        Returns:
+        - The number of loaded rows.
+
+        Raises:
+        - ValueError: If the format isn't supported.
+        """
+        if format != 'csv':
+            raise ValueError(f"Unsupported bulk load format: {format}")
+
+        file = source if hasattr(source, 'read') else open(source, 'rb')
+        text_file = io.TextIOWrapper(file, encoding='utf-8', newline='')
+        try:
+            reader = csv.reader(text_file)
+            if header:
+                next(reader, None)
+            return self._bulk_load_rows(table, columns, reader)
+        finally:
+            # The caller's file objects are left open.
+            if file is source:
+                text_file.detach()
+            else:
+                text_file.close()
+
+    @staticmethod
+    def _column_resolver(table):
+        """
+        Get the callable resolving the column names of a structured filter on a table.
+
+        Args:
+        - table: The SQLAlchemy Table.
+
+        Returns:
+        - A callable mapping a column name to the column of the table.
+        """
+
+        def resolve(column):
+            if column not in table.c:
+                raise ValueError(f"Column {column} doesn't belong to the table {table.name}.")
+            return table.c[column]
+
+        return resolve
+
+    def _condition_clause(self, condition, resolve, params=None):
+        """
+        Build the WHERE clause of a condition.
+
+        Structured filters and the params of raw SQL conditions are sent as bound parameters, so the statement
+        compiles to the same SQL whatever the values and is served from SQLAlchemy's compiled cache.
+
+        Args:
+        - condition: (Optional) A raw SQL condition (with :name placeholders for params), a text() clause, or a
+          structured filter (see datasources.filters).
+        - resolve: A callable mapping the column names of a structured filter to columns (see _column_resolver).
+        - params: (Optional) A dictionary of the values of the placeholders of a raw SQL condition.
+
+        Returns:
+        - The SQLAlchemy clause, or None if there's no condition.
+        """
+        return compile_condition(condition, resolve, params)
+
+    @invalidates('data_entity_key')
+    def update_where(self, data_entity_key: str, condition, values: dict, chunk_size=None):
+        """
+        Update the rows matching a condition with a set-based UPDATE ... WHERE, without loading them.
+
+        In chunked mode, the matching primary keys are walked in key order, chunk_size rows at a time, and each
+        chunk is updated in its own short transaction. This keeps locks short on large updates, at the cost of the
+        update not being atomic as a whole.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - condition: A raw SQL condition or a structured filter selecting the rows, or None to update every row.
+        - values: A dictionary mapping column names to their new values.
+        - chunk_size: (Optional) The number of rows updated per transaction. Defaults to a single statement.
+
+        Returns:
+        - The number of rows updated.
+        """
+        table = self.get_model(data_entity_key).__table__
+
+        def build_statement(clause):
+            statement = table.update().values(values)
+            return statement if clause is None else statement.where(clause)
+
+        return self._write_where(table, condition, chunk_size, build_statement)
+
+    @invalidates('data_entity_key')
+    def remove_where(self, data_entity_key: str, condition, chunk_size=None):
+        """
+        Delete the rows matching a condition with a set-based DELETE ... WHERE, without loading them.
+
+        In chunked mode, the matching primary keys are walked in key order, chunk_size rows at a time, and each
+        chunk is deleted in its own short transaction. This keeps locks and undo logs small on large deletes, at the
+        cost of the delete not being atomic as a whole.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - condition: A raw SQL condition or a structured filter selecting the rows, or None to delete every row.
+        - chunk_size: (Optional) The number of rows deleted per transaction. Defaults to a single statement.
+
+        Returns:
+        - The number of rows deleted.
+        """
+        table = self.get_model(data_entity_key).__table__
+
+        def build_statement(clause):
+            return table.delete() if clause is None else table.delete().where(clause)
+
+        return self._write_where(table, condition, chunk_size, build_statement)
+
+    def _write_where(self, table, condition, chunk_size, build_statement):
+        """
+        Run a set-based UPDATE or DELETE on the rows matching a condition, in one statement or in key-ordered chunks.
+
+        Args:
+        - table: The SQLAlchemy Table.
+        - condition: A raw SQL condition or a structured filter selecting the rows, or None.
+        - chunk_size: The number of rows per chunk, or None for a single statement. Capped so a chunk never exceeds
+          the dialect's bind parameter limit.
+        - build_statement: A callable building the UPDATE or DELETE statement from a WHERE clause (or None).
+
+        Returns:
+        - The number of rows affected.
+        """
+        clause = self._condition_clause(condition, self._column_resolver(table))
+
+        if not chunk_size:
+            return self._execute_write(build_statement(clause))
+
+        primary_key_columns = list(table.primary_key.columns)
+        key = tuple_(*primary_key_columns) if len(primary_key_columns) > 1 else primary_key_columns[0]
+        chunk_size = max(1, min(chunk_size, self._MAX_BIND_PARAMETERS // len(primary_key_columns)))
+
+        affected = 0
+        last_key = None
+        while True:
+            keys_query = select(*primary_key_columns).order_by(*primary_key_columns).limit(chunk_size)
+            if clause is not None:
+                keys_query = keys_query.where(clause)
+            if last_key is not None:
+                keys_query = keys_query.where(key > (tuple_(*last_key) if len(last_key) > 1 else last_key[0]))
+
+            chunk_keys, chunk_affected = self._write_chunk(
+                keys_query, lambda keys: build_statement(self._primary_keys_clause(primary_key_columns, keys)),
+                len(primary_key_columns) > 1)
+            affected += chunk_affected
+            if len(chunk_keys) < chunk_size:
+                return affected
+            last_key = tuple(chunk_keys[-1]) if len(primary_key_columns) > 1 else (chunk_keys[-1],)
+
+    @resilient(idempotent=True)
+    def _execute_write(self, statement):
+        session = self.get_new_session()
+        try:
+            affected = session.execute(statement).rowcount
+            session.commit()
+            return affected
+        finally:
+            session.close()
+
+    @resilient(idempotent=True)
+    def _write_chunk(self, keys_query, build_statement, composite_key):
+        """
+        Select a chunk of primary keys and update or delete their rows, in one transaction.
+
+        Args:
+        - keys_query: The query selecting the chunk's primary keys.
+        - build_statement: A callable building the UPDATE or DELETE statement from the list of keys.
+        - composite_key: Whether the primary key has several columns.
+
+        Returns:
+        - A (keys, affected) tuple of the chunk's primary keys and the number of rows affected.
+        """
+        session = self.get_new_session()
+        try:
+            rows = session.execute(keys_query).all()
+            keys = [tuple(row) for row in rows] if composite_key else [row[0] for row in rows]
+            affected = 0
+            if keys:
+                affected = session.execute(build_statement(keys)).rowcount
+            session.commit()
+            return keys, affected
+        finally:
+            session.close()
+
+    def iter_all(self, data_entity_key: str, condition=None, chunk_size=1000):
+        """
+        Iterate over the records of the specified table without loading them all in memory.
+
+        The rows are streamed from a server-side cursor (an SSCursor on PyMySQL, a named cursor on psycopg2) and
+        turned into ORM instances chunk_size at a time. The session stays open while the generator is consumed, and
+        is closed when it's exhausted, closed or garbage collected, or when the loop raises. Wrap the generator in
+        contextlib.closing to close it deterministically when breaking out of the loop early.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - condition: (Optional) A raw SQL condition or a structured filter selecting the records.
+        - chunk_size: (Optional) The number of rows fetched from the cursor at a time.
+
+        Returns:
+        - A generator of ORM instances.
+        """
+        model = self.get_model(data_entity_key)
+        clause = self._condition_clause(condition, self._column_resolver(model.__table__))
+
+        session = self.get_new_session(read_only=True)
+        try:
+            query = session.query(model)
+            if clause is not None:
+                query = query.filter(clause)
+            query = query.execution_options(stream_results=True).yield_per(chunk_size)
+            for instance in query:
+                yield instance
+        finally:
+            session.close()
+
+    @resilient(idempotent=True)
+    def find_page(self, data_entity_key: str, order_by, after=None, limit=100, condition=None):
+        """
+        Get a page of records with keyset (seek) pagination.
+
+        The records are ordered by the order_by columns, followed by the primary key columns they don't include so
+        the order is total. A page starts right after the given key with WHERE (k1, k2) > (:a, :b) ORDER BY k1, k2
+        LIMIT n, which an index on the ordering columns serves at the same cost for every page, unlike OFFSET.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - order_by: The name of the ordering column, or a list of names. Only ascending order is supported.
+        - after: (Optional) Where the page starts: the continuation token returned with the previous page, or a tuple
+          of the values of the ordering columns (including the appended primary key columns) of the last record of
+          the previous page. Defaults to the first page.
+        - limit: (Optional) The maximum number of records in the page.
+        - condition: (Optional) A raw SQL condition or a structured filter selecting the records.
+
+        Returns:
+        - A (records, token) tuple of the page's records and the continuation token of the next page, or None as the
+          token if this is the last page.
+
+        Raises:
+        - ValueError: If the token is malformed or was issued for another ordering.
+        """
+        model = self.get_model(data_entity_key)
+        order_by = [order_by] if isinstance(order_by, str) else list(order_by)
+        order_by += [column.key for column in model.__table__.primary_key.columns if column.key not in order_by]
+        columns = [getattr(model, column) for column in order_by]
+
+        if isinstance(after, str):
+            payload = codec.decode_token(after)
+            if not isinstance(payload, dict) or not isinstance(payload.get('after'), list):
+                raise ValueError(f"Malformed page token: {after!r}")
+            if payload.get('order_by') != order_by:
+                raise ValueError("The page token was issued for another ordering.")
+            after = payload['after']
+
+        session = self.get_new_session(read_only=True)
+        try:
+            query = session.query(model)
+            clause = self._condition_clause(condition, self._column_resolver(model.__table__))
+            if clause is not None:
+                query = query.filter(clause)
+            if after is not None:
+                after = tuple(after) if isinstance(after, (list, tuple)) else (after,)
+                if len(after) != len(columns):
+                    raise ValueError(f"The page key must have a value for each of the columns {order_by}.")
+                query = query.filter(tuple_(*columns) > tuple_(*after) if len(columns) > 1 else columns[0] > after[0])
+            records = query.order_by(*columns).limit(limit).all()
+        finally:
+            session.close()
+
+        token = None
+        if records and len(records) == limit:
+            token = codec.encode_token({
+                'order_by': order_by,
+                'after': [getattr(records[-1], column) for column in order_by],
+            })
+        return records, token
+
+    def _primary_keys_clause(self, columns, ids):
+        """
+        Build the WHERE clause selecting rows by a list of primary keys.
+
+        Args:
+        - columns: The primary key columns.
+        - ids: The primary key values, as tuples for composite primary keys.
+
+        Returns:
+        - The SQLAlchemy clause.
+        """
+        if len(columns) == 1:
+            return columns[0].in_(ids)
+        if self._SUPPORTS_TUPLE_IN:
+            return tuple_(*columns).in_(ids)
+        return or_(*[and_(*[column == value for column, value in zip(columns, values)]) for values in ids])
+
+    @resilient(idempotent=True)
+    def find_by_ids(self, data_entity_key: str, ids, chunk_size=1000, columns=None, compact=False):
+        """
+        Get many records by their primary keys, with one query per chunk of IDs instead of one per ID.
+
+        The IDs are deduplicated and sent as WHERE pk IN (...) chunks, whose size is capped so a query never exceeds
+        the dialect's bind parameter limit. Composite primary keys are matched with (a, b) IN ((...), ...).
+
+        Args:
+        - data_entity_key: The name of the table.
+        - ids: The IDs of the records, as tuples for composite primary keys.
+        - chunk_size: (Optional) The maximum number of IDs per query.
+        - columns: (Optional) The names of the columns to load. Defaults to every column.
+        - compact: (Optional) Whether to return read-only CompactRows instead of ORM instances.
+
+        Returns:
+        - A dictionary mapping each distinct ID, in the order of ids, to its record, or to None if it wasn't found.
+        """
+        model = self.get_model(data_entity_key)
+        table = model.__table__
+        key_columns = list(table.primary_key.columns)
+        if len(key_columns) > 1:
+            ids = (tuple(data_entity_id) for data_entity_id in ids)
+        ids = list(dict.fromkeys(ids))
+        chunk_size = max(1, min(chunk_size, self._MAX_BIND_PARAMETERS // len(key_columns)))
+
+        records = {}
+        session = self.get_new_session(read_only=True)
+        try:
+            if compact:
+                selected = [table.c[column] for column in columns] if columns else list(table.columns)
+                row_class = compact_row_class(data_entity_key, tuple(column.key for column in selected))
+                # The keys are selected under their own labels, as the projection may not include them.
+                labeled_keys = [column.label(f"_pk_{column.key}") for column in key_columns]
+                for chunk in self._batches(ids, chunk_size):
+                    statement = select(*labeled_keys, *selected).where(self._primary_keys_clause(key_columns, chunk))
+                    for row in session.execute(statement):
+                        records[self._primary_key_value(row[:len(key_columns)])] = row_class(*row[len(key_columns):])
+            else:
+                query = session.query(model)
+                if columns:
+                    query = query.options(load_only(*columns))
+                for chunk in self._batches(ids, chunk_size):
+                    for instance in query.filter(self._primary_keys_clause(key_columns, chunk)):
+                        records[self._primary_key_value(inspect(instance).identity)] = instance
+        finally:
+            session.close()
+        return {data_entity_id: records.get(data_entity_id) for data_entity_id in ids}
+
+    def _select_columns(self, data_entity_key, columns=None, condition=None, params=None):
+        """
+        Build a Core select of some columns of a table.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - columns: (Optional) The names of the columns. Defaults to every column of the table.
+        - condition: (Optional) A raw SQL condition or a structured filter selecting the rows.
+        - params: (Optional) A dictionary of the values of the placeholders of a raw SQL condition.
+
+        Returns:
+        - The SQLAlchemy select statement.
+        """
+        table = self.get_model(data_entity_key).__table__
+        selected = [table.c[column] for column in columns] if columns else list(table.columns)
+        statement = select(*selected)
+        clause = self._condition_clause(condition, self._column_resolver(table), params)
+        if clause is not None:
+            statement = statement.where(clause)
+        return statement
+
+    def _iter_row_chunks(self, statement, chunk_size):
+        """
+        Run a Core statement on a read-only session and stream its rows from a server-side cursor, in chunks.
+        No ORM instances are built, and the session is closed when the generator finishes or is closed.
+
+        Args:
+        - statement: The SQLAlchemy select statement.
+        - chunk_size: The number of rows per chunk.
+
+        Returns:
+        - A generator of lists of rows (tuples).
+        """
+        session = self.get_new_session(read_only=True)
+        try:
+            result = session.execute(statement, execution_options={'stream_results': True})
+            while True:
+                rows = result.fetchmany(chunk_size)
+                if not rows:
+                    return
+                yield rows
+        finally:
+            session.close()
+
+    @staticmethod
+    def _column_dtype(column):
+        """
+        Infer the NumPy dtype of a column from its SQL type. NULLs become NaN in nullable numeric columns, NaT in
+        temporal columns, and None in object columns.
+
+        Args:
+        - column: The SQLAlchemy Column.
+
+        Returns:
+        - The NumPy dtype name.
+        """
+        column_type = column.type
+        nullable = column.nullable and not column.primary_key
+        if isinstance(column_type, sqltypes.Boolean):
+            return 'object' if nullable else 'bool'
+        if isinstance(column_type, sqltypes.Integer):
+            return 'float64' if nullable else 'int64'
+        if isinstance(column_type, sqltypes.Float) or (
+                isinstance(column_type, sqltypes.Numeric) and not column_type.asdecimal):
+            return 'float64'
+        if isinstance(column_type, sqltypes.DateTime):
+            return 'datetime64[us]'
+        if isinstance(column_type, sqltypes.Date):
+            return 'datetime64[D]'
+        return 'object'
+
+    @resilient(idempotent=True)
+    def find_frame(self, data_entity_key: str, columns=None, condition=None, dtypes=None, chunk_size=10000,
+                   as_frame=True):
+        """
+        Fetch records straight into NumPy column arrays or a pandas DataFrame, without building ORM instances.
+
+        The rows are streamed from a server-side cursor in chunks and copied column by column into preallocated
+        arrays, whose capacity doubles when full. Memory usage is bounded by the arrays plus one chunk of rows.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - columns: (Optional) The names of the columns. Defaults to every column of the table.
+        - condition: (Optional) A raw SQL condition or a structured filter selecting the records.
+        - dtypes: (Optional) A dictionary mapping column names to NumPy dtypes, overriding the ones inferred from the
+          column types (see _column_dtype).
+        - chunk_size: (Optional) The number of rows fetched from the cursor at a time.
+        - as_frame: (Optional) Whether to return a DataFrame rather than a dictionary of arrays.
+
+        Returns:
+        - A pandas DataFrame, or a dictionary mapping column names to NumPy arrays.
+        """
+        import numpy as np
+
+        statement = self._select_columns(data_entity_key, columns, condition)
+        selected = list(statement.selected_columns)
+        dtypes = dtypes or {}
+        column_dtypes = [np.dtype(dtypes.get(column.key, self._column_dtype(column))) for column in selected]
+
+        capacity = chunk_size
+        arrays = [np.empty(capacity, dtype=dtype) for dtype in column_dtypes]
+        size = 0
+        for rows in self._iter_row_chunks(statement, chunk_size):
+            end = size + len(rows)
+            if end > capacity:
+                capacity = max(end, capacity * 2)
+                arrays = [np.resize(array, capacity) for array in arrays]
+            for array, values in zip(arrays, zip(*rows)):
+                array[size:end] = values
+            size = end
+
+        arrays = {column.key: array[:size] for column, array in zip(selected, arrays)}
+        if not as_frame:
+            return arrays
+
+        import pandas as pd
+        return pd.DataFrame(arrays, copy=False)
+
+    @staticmethod
+    def _arrow_type(column):
+        """
+        Derive the Arrow type of a column from its SQL type. Types without an Arrow counterpart are exported as
+        strings.
+
+        Args:
+        - column: The SQLAlchemy Column.
+
+        Returns:
+        - The pyarrow DataType.
+        """
+        import pyarrow as pa
+
+        column_type = column.type
+        if isinstance(column_type, sqltypes.Boolean):
+            return pa.bool_()
+        if isinstance(column_type, sqltypes.SmallInteger):
+            return pa.int16()
+        if isinstance(column_type, sqltypes.Integer):
+            return pa.int64()
+        if isinstance(column_type, sqltypes.Float):
+            return pa.float64()
+        if isinstance(column_type, sqltypes.Numeric):
+            if column_type.asdecimal and column_type.precision:
+                return pa.decimal128(column_type.precision, column_type.scale or 0)
+            return pa.float64()
+        if isinstance(column_type, sqltypes.DateTime):
+            return pa.timestamp('us', tz='UTC' if column_type.timezone else None)
+        if isinstance(column_type, sqltypes.Date):
+            return pa.date32()
+        if isinstance(column_type, sqltypes.Time):
+            return pa.time64('us')
+        if isinstance(column_type, sqltypes._Binary):
+            return pa.binary()
+        return pa.string()
+
+    def _arrow_schema(self, statement):
+        """Derive the Arrow schema of a Core select from the reflected types of its columns."""
+        import pyarrow as pa
+
+        return pa.schema([pa.field(column.key, self._arrow_type(column), nullable=column.nullable)
+                          for column in statement.selected_columns])
+
+    @staticmethod
+    def _record_batch(rows, schema):
+        """
+        Convert a chunk of rows into an Arrow RecordBatch.
+
+        Args:
+        - rows: A list of rows (tuples).
+        - schema: The pyarrow Schema.
+
+        Returns:
+        - The pyarrow RecordBatch.
+        """
+        import pyarrow as pa
+
+        arrays = []
+        for field, values in zip(schema, zip(*rows)):
+            if pa.types.is_string(field.type):
+                values = [value if value is None or isinstance(value, str) else str(value) for value in values]
+            arrays.append(pa.array(values, type=field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    @staticmethod
+    def _prefetched(iterable, depth):
+        """
+        Consume an iterable on a background thread, up to depth items ahead of the caller, so fetching the next
+        items overlaps with processing the current one.
+
+        The iterable is consumed (and closed) on the background thread only. When the caller stops early, the
+        thread stops at its next item and the generator waits for it to finish. The thread runs in a copy of the
+        caller's context, so the sessions it opens join the caller's transaction scope and read-your-writes window.
+
+        Args:
+        - iterable: The iterable to consume.
+        - depth: The maximum number of items buffered ahead.
+
+        Returns:
+        - A generator of the iterable's items. Errors raised by the iterable are re-raised to the caller.
+        """
+        items = queue.Queue(maxsize=depth)
+        stop = threading.Event()
+
+        def put(kind, value):
+            while not stop.is_set():
+                try:
+                    items.put((kind, value), timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            iterator = iter(iterable)
+            try:
+                for item in iterator:
+                    if not put('item', item):
+                        return
+                put('done', None)
+            except Exception as error:
+                put('error', error)
+            finally:
+                close = getattr(iterator, 'close', None)
+                if close is not None:
+                    close()
+
+        # The context is copied when the generator starts, as the iterable opens its session lazily.
+        producer = threading.Thread(target=contextvars.copy_context().run, args=(produce,),
+                                    name='sql-datasource-prefetch', daemon=True)
+        producer.start()
+        try:
+            while True:
+                kind, value = items.get()
+                if kind == 'done':
+                    return
+                if kind == 'error':
+                    raise value
+                yield value
+        finally:
+            stop.set()
+            producer.join()
+
+    def iter_record_batches(self, data_entity_key: str, columns=None, condition=None, batch_rows=65536):
+        """
+        Stream records as Arrow RecordBatches, without building ORM instances.
+
+        The schema is derived from the reflected column types (see _arrow_type), and every batch is built from one
+        chunk of rows fetched from a server-side cursor.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - columns: (Optional) The names of the columns. Defaults to every column of the table.
+        - condition: (Optional) A raw SQL condition or a structured filter selecting the records.
+        - batch_rows: (Optional) The number of rows per batch.
+
+        Returns:
+        - A generator of pyarrow RecordBatches.
+        """
+        statement = self._select_columns(data_entity_key, columns, condition)
+        schema = self._arrow_schema(statement)
+        for rows in self._iter_row_chunks(statement, batch_rows):
+            yield self._record_batch(rows, schema)
+
+    def export_parquet(self, data_entity_key: str, path, columns=None, condition=None, batch_rows=65536,
+                       compression='snappy', prefetch=2):
+        """
+        Export records to a Parquet file in constant memory.
+
+        Every chunk of rows is written as a row group as soon as it's converted. While a chunk is converted and
+        encoded, the next ones are fetched from the database on a background thread.
+
+        Args:
+        - data_entity_key: The name of the table.
+        - path: The path of the Parquet file (or a writable file object).
+        - columns: (Optional) The names of the columns. Defaults to every column of the table.
+        - condition: (Optional) A raw SQL condition or a structured filter selecting the records.
+        - batch_rows: (Optional) The number of rows per row group.
+        - compression: (Optional) The Parquet compression codec.
+        - prefetch: (Optional) The number of chunks fetched ahead of the writer. 0 disables the background fetch.
+
+        Returns:
+        - The number of rows written.
+        """
+        import pyarrow.parquet as pq
+
+        statement = self._select_columns(data_entity_key, columns, condition)
+        schema = self._arrow_schema(statement)
+        chunks = self._iter_row_chunks(statement, batch_rows)
+        if prefetch:
+            chunks = self._prefetched(chunks, prefetch)
+
+        written = 0
+        with pq.ParquetWriter(path, schema, compression=compression) as writer:
+            for rows in chunks:
+                writer.write_batch(self._record_batch(rows, schema))
+                written += len(rows)
+        return written
+
+    def _primary_key_clause(self, table, data_entity_id):
+        """
+        Build the WHERE clause selecting a row by primary key.
+
+        Args:
+        - table: The SQLAlchemy Table.
+        - data_entity_id: The primary key value, or a tuple of values for composite primary keys.
+
+        Returns:
+        - The SQLAlchemy clause.
+        """
+        columns = list(table.primary_key.columns)
+        ids = data_entity_id if len(columns) > 1 else (data_entity_id,)
+        return and_(*[column == value for column, value in zip(columns, ids)])
+
+    def _fetch_compact(self, session, statement, table_name):
+        """
+        Run a Core statement and return its rows as compact rows. No ORM instance is built.
+
+        Args:
+        - session: The SQLAlchemy session.
+        - statement: The SQLAlchemy select statement.
+        - table_name: The name the compact row class is generated and cached for.
+
+        Returns:
+        - A list of CompactRow instances.
+        """
+        result = session.execute(statement)
+        row_class = compact_row_class(table_name, tuple(result.keys()))
+        return [row_class(*row) for row in result]
+
+    @staticmethod
+    def _join_resolver(entities):
+        """
+        Get the callable resolving column names in a join, given as 'table.column', or as 'column' for the first
+        joined table having that column.
+
+        Args:
+        - entities: The (table name, model or alias) pairs of the join, in the order of the query.
+
+        Returns:
+        - A callable mapping a column name to the column attribute of its model or alias.
+
+        Raises:
+        - ValueError: From the callable, if a column doesn't belong to any of the joined tables.
+        """
+
+        def resolve(column):
+            table_name, _, column_name = column.rpartition('.')
+            entity = next((entity for name, entity in entities
+                           if (not table_name or name == table_name) and hasattr(entity, column_name)), None)
+            if entity is None:
+                raise ValueError(f"Column {column} doesn't belong to the joined tables.")
+            return getattr(entity, column_name)
+
+        return resolve
+
+    def _join_columns(self, entities, columns=None):
+        """
+        Resolve the projection of a join to labeled column attributes.
+
+        Columns are given as 'table.column', or as 'column' for the first joined table having that column. Without
+        columns, every column of every joined table is selected. Labels are the column names, suffixed with _1, _2...
+        when several selected columns have the same name.
+
+        Args:
+        - entities: The (table name, model or alias) pairs of the join, in the order of the query.
+        - columns: (Optional) The names of the columns.
+
+        Returns:
+        - A list of labeled column attributes.
+
+        Raises:
+        - ValueError: If a column doesn't belong to any of the joined tables.
+        """
+        if not columns:
+            attributes = [getattr(entity, attribute.key) for _, entity in entities
+                          for attribute in inspect(entity).mapper.column_attrs]
+        else:
+            attributes = [self._join_resolver(entities)(column) for column in columns]
+
+        counts = {}
+        labeled = []
+        for attribute in attributes:
+            count = counts.get(attribute.key, 0)
+            counts[attribute.key] = count + 1
+            labeled.append(attribute.label(attribute.key if count == 0 else f"{attribute.key}_{count}"))
+        return labeled
+
+    def _join_result(self, query, entities, columns=None, compact=False):
+        """
+        Run a join query, projecting it on some columns and converting its rows to compact rows if requested.
+
+        Args:
+        - query: The SQLAlchemy ORM query of the join.
+        - entities: The (table name, model or alias) pairs of the join, in the order of the query.
+        - columns: (Optional) The names of the columns to return (see _join_columns).
+        - compact: (Optional) Whether to return CompactRows.
+
+        Returns:
+        - A list of (primary, secondary) instance pairs, or of rows of the selected columns.
+        """
+        if not columns and not compact:
+            return query.all()
+
+        selected = self._join_columns(entities, columns)
+        rows = query.with_entities(*selected).all()
+        if not compact:
+            return rows
+        row_class = compact_row_class('_'.join(name for name, _ in entities), tuple(column.key for column in selected))
+        return [row_class(*row) for row in rows]
+
     @abstractmethod
     def insert(self, data_entity_key: str, data: dict):
         """
@@ -100,33 +1224,44 @@ class SQLDataSource(DataSource, ABC):
         pass
 
     @abstractmethod
-    def find_by_id(self, data_entity_key: str, data_entity_id):
+    def find_by_id(self, data_entity_key: str, data_entity_id, columns=None, compact=False):
         """
         Get a record by its unique ID.
 
         Args:
         - data_entity_key: The name of the table.
         - data_entity_id: The ID of the record to retrieve.
+        - columns: (Optional) The names of the columns to load. Defaults to every column.
+        - compact: (Optional) Whether to return a read-only CompactRow instead of an ORM instance.
         """
         pass
 
     @abstractmethod
-    def find_all(self, data_entity_key: str):
+    def find_all(self, data_entity_key: str, condition=None, columns=None, compact=False, params=None):
         """
         Get all records from the specified table.
 
+        Conditions are best given as structured filters (see datasources.filters), or as raw SQL with :name
+        placeholders and params: their values are bound parameters, so repeated queries reuse the compiled statement.
+
         Args:
         - data_entity_key: The name of the table.
+        - condition: (Optional) A raw SQL condition or a structured filter selecting the records.
+        - columns: (Optional) The names of the columns to load. Defaults to every column.
+        - compact: (Optional) Whether to return read-only CompactRows instead of ORM instances.
+        - params: (Optional) A dictionary of the values of the placeholders of a raw SQL condition.
         """
         pass
 
     @abstractmethod
-    def count(self, data_entity_key: str):
+    def count(self, data_entity_key: str, condition=None, params=None):
         """
         Count the number of records in the specified table.
 
         Args:
         - data_entity_key: The name of the table.
+        - condition: (Optional) A raw SQL condition or a structured filter selecting the records.
+        - params: (Optional) A dictionary of the values of the placeholders of a raw SQL condition.
         """
         pass
 
@@ -142,7 +1277,8 @@ class SQLDataSource(DataSource, ABC):
         pass
 
     @abstractmethod
-    def inner_join(self, primary_table: str, secondary_table: str, on_field: str):
+    def inner_join(self, primary_table: str, secondary_table: str, on_field: str, condition=None, columns=None,
+               compact=False, params=None):
         """
         Perform an inner join between two tables.
 
@@ -150,11 +1286,18 @@ class SQLDataSource(DataSource, ABC):
         - primary_table: The name of the first table.
         - secondary_table: The name of the second table.
         - on_field: The field to join on.
+        - condition: (Optional) A raw SQL condition or a structured filter selecting the records. Structured filters
+          name columns as 'table.column' or 'column' (see _join_resolver).
+        - columns: (Optional) The columns to return, as 'table.column' or 'column' (see _join_columns). Rows of these
+          columns are returned instead of pairs of ORM instances.
+        - compact: (Optional) Whether to return read-only CompactRows instead of pairs of ORM instances.
+        - params: (Optional) A dictionary of the values of the placeholders of a raw SQL condition.
         """
         pass
 
     @abstractmethod
-    def left_join(self, primary_table: str, secondary_table: str, on_field: str):
+    def left_join(self, primary_table: str, secondary_table: str, on_field: str, condition=None, columns=None,
+               compact=False, params=None):
         """
         Perform a left join between two tables.
 
@@ -162,11 +1305,18 @@ class SQLDataSource(DataSource, ABC):
         - primary_table: The name of the first table.
         - secondary_table: The name of the second table.
         - on_field: The field to join on.
+        - condition: (Optional) A raw SQL condition or a structured filter selecting the records. Structured filters
+          name columns as 'table.column' or 'column' (see _join_resolver).
+        - columns: (Optional) The columns to return, as 'table.column' or 'column' (see _join_columns). Rows of these
+          columns are returned instead of pairs of ORM instances.
+        - compact: (Optional) Whether to return read-only CompactRows instead of pairs of ORM instances.
+        - params: (Optional) A dictionary of the values of the placeholders of a raw SQL condition.
         """
         pass
 
     @abstractmethod
-    def right_join(self, primary_table: str, secondary_table: str, on_field: str):
+    def right_join(self, primary_table: str, secondary_table: str, on_field: str, condition=None, columns=None,
+               compact=False, params=None):
         """
         Perform a right join between two tables.
 
@@ -174,5 +1324,11 @@ class SQLDataSource(DataSource, ABC):
         - primary_table: The name of the first table.
         - secondary_table: The name of the second table.
         - on_field: The field to join on.
+        - condition: (Optional) A raw SQL condition or a structured filter selecting the records. Structured filters
+          name columns as 'table.column' or 'column' (see _join_resolver).
+        - columns: (Optional) The columns to return, as 'table.column' or 'column' (see _join_columns). Rows of these
+          columns are returned instead of pairs of ORM instances.
+        - compact: (Optional) Whether to return read-only CompactRows instead of pairs of ORM instances.
+        - params: (Optional) A dictionary of the values of the placeholders of a raw SQL condition.
         """
         pass
@@ -12,13 +12,9 @@ class MultiSourceRepository:
         mysql_table = "my_table"
         postgres_table = "my_other_table"
 
-        # Use the data sources to get all records from the tables
-        mysql_result = self.mysql_ds.find_all(mysql_table)
-        postgres_result = self.postgres_ds.find_all(postgres_table)
-
-        # Convert the results to dataframes
-        mysql_df = pd.DataFrame([obj.__dict__ for obj in mysql_result])
-        postgres_df = pd.DataFrame([obj.__dict__ for obj in postgres_result])
+        # Use the data sources to fetch all records from the tables straight into dataframes
+        mysql_df = self.mysql_ds.find_frame(mysql_table)
+        postgres_df = self.postgres_ds.find_frame(postgres_table)
 
         # Concatenate the dataframes into one
         combined_df = pd.concat([mysql_df, postgres_df], axis=0)
@@ -0,0 +1,70 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# The packages live at the repository root, which isn't installed.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from connections.sql_connection import SQLConnection  # noqa: E402
+
+
+class SQLiteConnection(SQLConnection):
+    """
+    SQLiteConnection is a SQLConnection to a SQLite file, standing in for a database server in tests. The host
+    argument of the engine names another database file, so replicas can be tested too.
+    """
+
+    def _create_engine(self, host=None, port=None):
+        return create_engine(self.create_connection_string(host, port), connect_args={'check_same_thread': False},
+                             **self._pool_args())
+
+    def create_connection_string(self, host=None, port=None):
+        return f"sqlite:///{host or self._database}"
+
+
+@pytest.fixture
+def sqlite_connection(tmp_path):
+    """
+    Get a factory creating a SQLite database from some SQL statements and returning a connected SQLiteConnection.
+    """
+    connections = []
+
+    def create(*statements, **kwargs):
+        path = str(tmp_path / f"database_{len(connections)}.sqlite")
+        with sqlite3.connect(path) as database:
+            for statement in statements:
+                database.execute(statement)
+        connection = SQLiteConnection('sqlite', None, None, path, None, None, **kwargs)
+        connection.connect()
+        connections.append(connection)
+        return connection
+
+    yield create
+    for connection in connections:
+        connection.disconnect()
+
+
+def fake_redis_connection(name='redis', server=None):
+    """
+    Get a RedisConnection connected to an in-process fakeredis server.
+
+    Args:
+    - name: (Optional) The name of the connection.
+    - server: (Optional) The fakeredis.FakeServer. Defaults to a new server.
+
+    Returns:
+    - The connected RedisConnection.
+    """
+    fakeredis = pytest.importorskip('fakeredis')
+    from connections.redis_connection import RedisConnection
+
+    connection = RedisConnection(name, 'localhost', 6379, 0, None)
+    connection_class = getattr(fakeredis, 'FakeRedisConnection', None) or fakeredis.FakeConnection
+    connection.connect(connection_class=connection_class, server=server or fakeredis.FakeServer())
+    return connection
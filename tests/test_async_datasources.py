@@ -0,0 +1,97 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+pytest.importorskip('aiosqlite')
+
+from connections.async_sqlite_connection import AsyncSQLiteConnection  # noqa: E402
+from datasources.async_sql_datasource import AsyncSQLDataSource  # noqa: E402
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    path = str(tmp_path / 'async.sqlite')
+    with sqlite3.connect(path) as database:
+        database.execute("CREATE TABLE cameras (id INTEGER PRIMARY KEY, model TEXT, owner_id INTEGER)")
+        database.execute("CREATE TABLE owners (id INTEGER PRIMARY KEY, owner_id INTEGER, name TEXT)")
+        database.execute("INSERT INTO owners (id, owner_id, name) VALUES (1, 1, 'ada'), (2, 2, 'bob')")
+    return path
+
+
+def test_async_sql_datasource_crud(database_path):
+    async def scenario():
+        async with AsyncSQLDataSource(AsyncSQLiteConnection('sqlite', database_path)) as datasource:
+            assert await datasource.check_health()
+
+            first = await datasource.insert('cameras', {'model': 'Canon', 'owner_id': 1})
+            second = await datasource.insert('cameras', {'model': 'Nikon', 'owner_id': 3})
+            assert (await datasource.find_by_id('cameras', first)).model == 'Canon'
+            assert await datasource.count('cameras') == 2
+            assert [camera.model for camera in await datasource.find_all('cameras', "model = 'Nikon'")] == ['Nikon']
+
+            assert await datasource.update('cameras', second, {'model': 'Sony'})
+            assert (await datasource.find_by_id('cameras', second)).model == 'Sony'
+
+            inner = await datasource.inner_join('cameras', 'owners', 'owner_id')
+            assert [(camera.model, owner.name) for camera, owner in inner] == [('Canon', 'ada')]
+            left = await datasource.left_join('cameras', 'owners', 'owner_id')
+            assert sorted((camera.model, owner.name if owner else None) for camera, owner in left) == \
+                [('Canon', 'ada'), ('Sony', None)]
+            right = await datasource.right_join('cameras', 'owners', 'owner_id')
+            assert sorted((owner.name, camera.model if camera else None) for owner, camera in right) == \
+                [('ada', 'Canon'), ('bob', None)]
+
+            assert await datasource.remove('cameras', first)
+            assert not await datasource.exists('cameras', first)
+            assert await datasource.query("SELECT COUNT(*) FROM cameras") == [(1,)]
+
+    asyncio.run(scenario())
+
+
+def test_async_raw_write_query_commits(database_path):
+    async def scenario():
+        async with AsyncSQLDataSource(AsyncSQLiteConnection('sqlite', database_path)) as datasource:
+            assert await datasource.query("UPDATE owners SET name = 'eve' WHERE id = 1") is None
+            assert await datasource.query("SELECT name FROM owners WHERE id = 1") == [('eve',)]
+            assert (await datasource.find_by_id('owners', 1)).name == 'eve'
+
+    asyncio.run(scenario())
+
+
+def test_async_redis_datasource():
+    fakeredis = pytest.importorskip('fakeredis')
+    from fakeredis import aioredis
+
+    from connections.async_redis_connection import AsyncRedisConnection
+    from datasources.async_redis_datasource import AsyncRedisDataSource
+
+    async def scenario():
+        connection = AsyncRedisConnection('redis', 'localhost', 6379, 0, None)
+        connection_class = getattr(aioredis, 'FakeAsyncRedisConnection', None) or aioredis.FakeConnection
+        await connection.connect(connection_class=connection_class, server=fakeredis.FakeServer())
+        datasource = AsyncRedisDataSource(connection)
+        engine = datasource.connection_engine
+
+        assert await datasource.check_health()
+        assert await datasource.set_key('key', 'value', ttl=60)
+        assert await datasource.get_key('key') == b'value'
+        assert 0 < await engine.ttl('key') <= 60
+        assert await datasource.key_exists('key')
+        assert await datasource.delete_key('key') == 1
+        assert await datasource.get_key('key') is None
+
+        assert await datasource.set_hash_field('hash', 'field', 'value') == 1
+        assert await datasource.get_hash_field('hash', 'field') == b'value'
+        assert await datasource.delete_hash_field('hash', 'field') == 1
+
+        assert await datasource.set_set_value('set', ttl=60) == 0
+        assert await datasource.remove_set_value('set') == 0
+        assert await datasource.set_set_value('set', 'a', 'b', 'c', ttl=60) == 3
+        assert 0 < await engine.ttl('set') <= 60
+        assert await datasource.remove_set_value('set', 'a', 'b') == 2
+        assert await datasource.get_set_values('set') == {b'c'}
+
+        await datasource.disconnect()
+
+    asyncio.run(scenario())
@@ -0,0 +1,50 @@
+import csv
+import io
+
+from datasources.bulk_io import IterableReader, encode_csv_rows
+
+
+def test_null_marker_is_the_only_unquoted_field():
+    rows = [{'a': None, 'b': 'NULL'}, {'a': '', 'b': None}]
+    assert ''.join(encode_csv_rows(rows, ['a', 'b'], 'NULL')) == 'NULL,"NULL"\n"",NULL\n'
+    assert ''.join(encode_csv_rows(rows, ['a', 'b'], '')) == ',"NULL"\n"",\n'
+
+
+def test_embedded_quotes_and_newlines_are_quoted():
+    row = ['say "hi"', 'first\nsecond', 'a,b', 3]
+    encoded = ''.join(encode_csv_rows([row], ['text', 'lines', 'comma', 'number'], 'NULL'))
+    assert encoded == '"say ""hi""","first\nsecond","a,b","3"\n'
+    assert list(csv.reader(io.StringIO(encoded, newline=''))) == [['say "hi"', 'first\nsecond', 'a,b', '3']]
+
+
+def test_rows_are_encoded_lazily_in_chunks():
+    def rows():
+        for index in range(5):
+            yield {'id': index}
+        raise AssertionError('read past the last row')
+
+    chunks = encode_csv_rows(rows(), ['id'], 'NULL', rows_per_chunk=2)
+    assert next(chunks) == '"0"\n"1"\n'
+    assert next(chunks) == '"2"\n"3"\n'
+
+
+def test_reader_spans_chunk_boundaries():
+    # A raw read returns at most the rest of the current chunk; an empty chunk isn't the end of the stream.
+    reader = IterableReader([b'ab', b'', b'cdef', b'g'])
+    assert [reader.read(3) for _ in range(5)] == [b'ab', b'cde', b'f', b'g', b'']
+    assert IterableReader([b'ab', b'', b'cdef', b'g']).read() == b'abcdefg'
+
+
+def test_reader_pulls_chunks_on_demand():
+    pulled = []
+
+    def chunks():
+        for chunk in (b'abc', b'def'):
+            pulled.append(chunk)
+            yield chunk
+
+    reader = IterableReader(chunks())
+    assert reader.read(2) == b'ab'
+    assert pulled == [b'abc']
+    assert io.BufferedReader(reader, buffer_size=4).read() == b'cdef'
+    assert pulled == [b'abc', b'def']
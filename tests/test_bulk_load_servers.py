@@ -0,0 +1,67 @@
+"""
+Native bulk loads against real database servers. The servers are configured with the IONIFY_TEST_MYSQL and
+IONIFY_TEST_POSTGRES environment variables (user:password@host:port/database), and the tests are skipped when they
+aren't reachable.
+"""
+import io
+import os
+from urllib.parse import urlsplit
+
+import pytest
+from sqlalchemy import text
+
+from connections.my_sql_connection import MySQLConnection
+from connections.postgres_connection import PostgreConnection
+from datasources.my_sql_datasource import MySQLDataSource
+from datasources.postgres_sql_datasource import PostgreSQLDataSource
+
+SERVERS = {
+    'mysql': ('pymysql', 'IONIFY_TEST_MYSQL', 'root:root@localhost:3306/test', MySQLConnection, MySQLDataSource,
+              {'local_infile': True}),
+    'postgres': ('psycopg2', 'IONIFY_TEST_POSTGRES', 'postgres:postgres@localhost:5432/postgres',
+                 PostgreConnection, PostgreSQLDataSource, {}),
+}
+
+ROWS = [
+    {'id': 1, 'label': None},
+    {'id': 2, 'label': 'NULL'},
+    {'id': 3, 'label': ''},
+    {'id': 4, 'label': 'say "hi"'},
+    {'id': 5, 'label': 'first\nsecond, third'},
+]
+
+
+@pytest.fixture(params=sorted(SERVERS))
+def datasource(request):
+    driver, variable, default, connection_class, datasource_class, options = SERVERS[request.param]
+    pytest.importorskip(driver)
+    address = urlsplit(f"//{os.environ.get(variable, default)}")
+    connection = connection_class(request.param, address.hostname, address.port, address.path.lstrip('/'),
+                                  address.username, address.password, lazy_reflection=True, **options)
+    connection.connect()
+    if not connection.probe_health():
+        connection.disconnect()
+        pytest.skip(f"No {request.param} server reachable, set {variable} to run the test.")
+
+    with connection.connection_engine.begin() as database:
+        database.execute(text("DROP TABLE IF EXISTS bulk_load_test"))
+        database.execute(text("CREATE TABLE bulk_load_test (id INTEGER PRIMARY KEY, label VARCHAR(64))"))
+    yield datasource_class(connection)
+    with connection.connection_engine.begin() as database:
+        database.execute(text("DROP TABLE bulk_load_test"))
+    connection.disconnect()
+
+
+def _labels(datasource):
+    return [(record.id, record.label) for record in sorted(datasource.find_all('bulk_load_test'), key=lambda r: r.id)]
+
+
+def test_rows_keep_nulls_quotes_and_newlines(datasource):
+    assert datasource.bulk_load('bulk_load_test', iter(ROWS))['rows'] == len(ROWS)
+    assert _labels(datasource) == [(row['id'], row['label']) for row in ROWS]
+
+
+def test_csv_file_with_header(datasource):
+    source = io.BytesIO(b'id,label\n1,"a ""quoted"" label"\n2,"multi\nline"\n')
+    assert datasource.bulk_load('bulk_load_test', source, columns=['id', 'label'], header=True)['rows'] == 2
+    assert _labels(datasource) == [(1, 'a "quoted" label'), (2, 'multi\nline')]
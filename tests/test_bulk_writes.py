@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy.dialects import mysql, postgresql
+
+from datasources.my_sql_datasource import MySQLDataSource
+from datasources.postgres_sql_datasource import PostgreSQLDataSource
+from datasources.sql_datasource import SQLDataSource
+
+
+class SQLiteDataSource(MySQLDataSource):
+    """A MySQLDataSource using the base (SQLite) upsert statement, so it runs on the SQLite test databases."""
+
+    _upsert_statement = SQLDataSource._upsert_statement
+
+
+@pytest.fixture
+def items(sqlite_connection):
+    connection = sqlite_connection(
+        "CREATE TABLE items (id INTEGER PRIMARY KEY, sku TEXT UNIQUE, name TEXT, stock INTEGER)",
+        "INSERT INTO items (id, sku, name, stock) VALUES (1, 'a', 'apple', 1), (2, 'b', 'banana', 2)",
+        "CREATE TABLE stock (warehouse TEXT, sku TEXT, quantity INTEGER, note TEXT, PRIMARY KEY (warehouse, sku))",
+        "INSERT INTO stock (warehouse, sku, quantity) VALUES ('north', 'a', 1), ('south', 'a', 2)",
+    )
+    return SQLiteDataSource(connection)
+
+
+def rows(datasource, table='items'):
+    return sorted(tuple(row) for row in datasource.query(f"SELECT * FROM {table}").fetchall())
+
+
+def test_upsert_inserts_new_rows_and_updates_existing_ones(items):
+    upserts = [
+        {'id': 2, 'sku': 'b', 'name': 'blueberry', 'stock': 20},
+        {'id': 3, 'sku': 'c', 'name': 'cherry', 'stock': 3},
+        {'id': 4, 'sku': 'd', 'name': 'date', 'stock': 4},
+    ]
+    assert items.upsert_many('items', iter(upserts), ['id'], batch_size=2) == 3
+    assert rows(items) == [(1, 'a', 'apple', 1), (2, 'b', 'blueberry', 20), (3, 'c', 'cherry', 3),
+                           (4, 'd', 'date', 4)]
+
+
+def test_upsert_on_a_unique_key_updates_only_the_given_columns(items):
+    upserts = [{'sku': 'a', 'name': 'avocado', 'stock': 10}, {'sku': 'e', 'name': 'elderberry', 'stock': 5}]
+    assert items.upsert_many('items', upserts, ['sku'], update_columns=['stock']) == 2
+    assert rows(items) == [(1, 'a', 'apple', 10), (2, 'b', 'banana', 2), (3, 'e', 'elderberry', 5)]
+
+
+def test_upsert_without_update_columns_keeps_existing_rows(items):
+    upserts = [{'id': 1, 'sku': 'a', 'name': 'avocado', 'stock': 10}, {'id': 5, 'sku': 'f', 'name': 'fig', 'stock': 6}]
+    assert items.upsert_many('items', upserts, ['id'], update_columns=[]) == 2
+    assert rows(items) == [(1, 'a', 'apple', 1), (2, 'b', 'banana', 2), (5, 'f', 'fig', 6)]
+
+
+@pytest.mark.parametrize('datasource_class, dialect, clause', [
+    (MySQLDataSource, mysql.dialect(), 'ON DUPLICATE KEY UPDATE'),
+    (PostgreSQLDataSource, postgresql.dialect(), 'ON CONFLICT (id) DO UPDATE'),
+    (SQLDataSource, None, 'ON CONFLICT (id) DO UPDATE'),
+])
+def test_dialects_build_their_upsert_statement(items, datasource_class, dialect, clause):
+    table = items.get_model('items').__table__
+    statement = datasource_class._upsert_statement(items, table, ['id'], ['name'])
+    compiled = str(statement.compile(dialect=dialect or items.connection_engine.dialect))
+    assert clause in compiled
+
+
+def test_update_many_updates_by_primary_key(items):
+    updates = [(1, {'stock': 10}), (2, {'name': 'blueberry', 'stock': 20}), (99, {'stock': 0}), (1, {})]
+    assert items.update_many('items', updates, batch_size=2) == 2
+    assert rows(items) == [(1, 'a', 'apple', 10), (2, 'b', 'blueberry', 20)]
+
+
+def test_update_many_with_a_composite_primary_key(items):
+    updates = [(('north', 'a'), {'quantity': 5}), (('south', 'a'), {'quantity': 6, 'note': 'recount'}),
+               (('east', 'a'), {'quantity': 7})]
+    assert items.update_many('stock', updates) == 2
+    assert rows(items, 'stock') == [('north', 'a', 5, None), ('south', 'a', 6, 'recount')]
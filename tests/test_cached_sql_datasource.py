@@ -0,0 +1,65 @@
+import pytest
+
+from conftest import fake_redis_connection
+from datasources.cached_sql_datasource import CachedSQLDataSource
+from datasources.my_sql_datasource import MySQLDataSource
+from datasources.redis_datasource import RedisDataSource
+
+
+@pytest.fixture
+def users(sqlite_connection):
+    connection = sqlite_connection(
+        "CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)",
+        "INSERT INTO users (id, name) VALUES " + ', '.join(f"({index}, 'user{index}')" for index in range(1, 11)),
+    )
+    return MySQLDataSource(connection)
+
+
+def test_lookups_are_served_from_the_cache(users):
+    cached = CachedSQLDataSource(users, RedisDataSource(fake_redis_connection()), ttl=60)
+
+    assert cached.find_by_id('users', 1).name == 'user1'
+    assert cached.find_by_id('users', 1, compact=True).name == 'user1'
+    assert cached.find_by_ids('users', [1, 2, 99])[99] is None
+
+    stats = cached.cache_stats()
+    assert (stats['hits'], stats['misses']) == (2, 3)
+
+
+def test_index_is_trimmed_and_expires(users):
+    cache = RedisDataSource(fake_redis_connection())
+    cached = CachedSQLDataSource(users, cache, ttl=60)
+    index_key = cached._index_key('users')
+
+    cached.find_by_ids('users', range(1, 11))
+    assert len(cache.get_set_values(index_key)) == 10
+    assert 0 < cache.connection_engine.ttl(index_key) <= 60
+
+    cached.update('users', 1, {'name': 'renamed'})
+    cached.remove('users', 2)
+    assert len(cache.get_set_values(index_key)) == 8
+    assert cached.find_by_id('users', 1).name == 'renamed'
+
+    cached.invalidate_entity('users')
+    assert not cache.key_exists(index_key)
+    assert cache.get_keys([cached._entry_key('users', 3)]) == [None]
+
+
+@pytest.mark.parametrize('sharded', [False, True])
+def test_cache_outage_falls_back_to_the_database(users, sharded):
+    fakeredis = pytest.importorskip('fakeredis')
+    from datasources.sharded_redis_datasource import ShardedRedisDataSource
+
+    servers = [fakeredis.FakeServer() for _ in range(3)]
+    connections = [fake_redis_connection(f"shard{index}", server) for index, server in enumerate(servers)]
+    cache = ShardedRedisDataSource(connections) if sharded else RedisDataSource(connections[0])
+    cached = CachedSQLDataSource(users, cache, ttl=60)
+    assert cached.find_by_id('users', 1).name == 'user1'
+
+    for server in servers:
+        server.connected = False
+    assert cached.find_by_id('users', 1).name == 'user1'
+    assert cached.find_by_ids('users', [2, 3])[3].name == 'user3'
+    cached.update('users', 4, {'name': 'renamed'})
+    assert users.find_by_id('users', 4).name == 'renamed'
+    assert cached.cache_stats()['errors'] > 0
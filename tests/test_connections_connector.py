@@ -0,0 +1,66 @@
+import threading
+import time
+
+from connections.connections_connector import connect_all
+
+
+class SleepyConnection:
+    """A connection whose connect() sleeps, recording when it started and finished."""
+
+    def __init__(self, name, delay=0.0, error=None, release=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.release = release
+        self.started = None
+        self.finished = None
+
+    def connect(self):
+        self.started = time.perf_counter()
+        if self.release is not None:
+            self.release.wait(5)
+        time.sleep(self.delay)
+        self.finished = time.perf_counter()
+        if self.error is not None:
+            raise self.error
+
+
+def test_connections_open_concurrently():
+    connections = [SleepyConnection(f"db{index}", delay=0.2) for index in range(4)]
+
+    start = time.perf_counter()
+    results = connect_all(connections)
+    elapsed = time.perf_counter() - start
+
+    assert list(results) == ['db0', 'db1', 'db2', 'db3']
+    assert all(result.connected and result.latency >= 0.2 for result in results.values())
+    # Every open started before the first one finished.
+    assert max(connection.started for connection in connections) < \
+        min(connection.finished for connection in connections)
+    assert elapsed < 0.6
+
+
+def test_connections_overrunning_the_deadline_are_reported():
+    release = threading.Event()
+    slow = SleepyConnection('slow', release=release)
+    failing = SleepyConnection('failing', error=ConnectionRefusedError('refused'))
+    fast = SleepyConnection('fast')
+
+    start = time.perf_counter()
+    results = connect_all([slow, failing, fast], timeout=0.2)
+    elapsed = time.perf_counter() - start
+    release.set()
+
+    assert elapsed < 1
+    assert results['slow'].timed_out and not results['slow'].connected and results['slow'].latency is None
+    assert isinstance(results['failing'].error, ConnectionRefusedError) and not results['failing'].timed_out
+    assert results['fast'].connected
+
+
+def test_max_workers_bounds_the_concurrent_opens():
+    connections = [SleepyConnection(f"db{index}", delay=0.1) for index in range(4)]
+    results = connect_all(connections, max_workers=2)
+
+    assert all(result.connected for result in results.values())
+    starts = sorted(connection.started for connection in connections)
+    assert starts[2] - starts[0] >= 0.09
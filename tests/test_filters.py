@@ -0,0 +1,20 @@
+import pytest
+
+from datasources.filters import Comparison, Filter, field
+
+
+def test_filter_is_abstract():
+    with pytest.raises(TypeError):
+        Filter()
+
+    class Incomplete(Filter):
+        def _key(self):
+            return ()
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_filters_compare_by_value():
+    assert (field('age') > 18) & (field('name') == 'ada') == (field('age') > 18) & (field('name') == 'ada')
+    assert len({Comparison('tags', 'in', [1, 2]), Comparison('tags', 'in', [1, 2])}) == 1
@@ -0,0 +1,65 @@
+import time
+import tracemalloc
+
+import pytest
+
+from datasources.my_sql_datasource import MySQLDataSource
+
+pd = pytest.importorskip('pandas')
+
+ROWS = 20000
+
+METRICS_TABLE = ("CREATE TABLE metrics (id INTEGER PRIMARY KEY, count INTEGER NOT NULL, score INTEGER, ratio REAL, "
+                 "label TEXT, seen DATETIME, active BOOLEAN NOT NULL)")
+
+
+def _old_frame(datasource, columns):
+    """Build a DataFrame the way callers did before find_frame: ORM instances and their __dict__."""
+    records = [{key: value for key, value in record.__dict__.items() if key != '_sa_instance_state'}
+               for record in datasource.find_all('metrics')]
+    return pd.DataFrame(records)[columns]
+
+
+def _measure(function):
+    """Get the (seconds, peak traced bytes) of a call. The time is measured on a separate, untraced call."""
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        function()
+        return elapsed, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_find_frame_keeps_nulls_and_dtypes(sqlite_connection):
+    datasource = MySQLDataSource(sqlite_connection(
+        METRICS_TABLE,
+        "INSERT INTO metrics VALUES (1, 3, 7, 0.5, 'a', '2024-01-02 03:04:05', 1), "
+        "(2, 4, NULL, NULL, NULL, NULL, 0), (3, 5, 9, 1.5, 'NULL', '2024-05-06 00:00:00', 1)",
+    ))
+
+    frame = datasource.find_frame('metrics')
+    pd.testing.assert_frame_equal(frame, _old_frame(datasource, list(frame.columns)))
+    assert frame['score'].isna().tolist() == [False, True, False]
+    assert frame['label'].isna().tolist() == [False, True, False]
+    assert frame['seen'].isna().tolist() == [False, True, False]
+    assert frame['count'].dtype == 'int64'
+    assert frame['active'].dtype == 'bool'
+
+
+def test_find_frame_is_faster_and_smaller_than_orm_instances(sqlite_connection):
+    rows = ', '.join(f"({index}, {index}, {'NULL' if index % 10 == 0 else index}, {index / 7}, 'label{index % 50}', "
+                     f"'2024-01-01 00:00:00', {index % 2})" for index in range(ROWS))
+    datasource = MySQLDataSource(sqlite_connection(METRICS_TABLE, f"INSERT INTO metrics VALUES {rows}"))
+    columns = list(datasource.find_frame('metrics', chunk_size=1000).columns)
+
+    frame_time, frame_peak = _measure(lambda: datasource.find_frame('metrics', chunk_size=1000))
+    old_time, old_peak = _measure(lambda: _old_frame(datasource, columns))
+
+    print(f"find_frame: {frame_time:.3f}s {frame_peak / 2 ** 20:.1f} MiB, "
+          f"find_all + __dict__: {old_time:.3f}s {old_peak / 2 ** 20:.1f} MiB")
+    assert frame_time < old_time
+    assert frame_peak * 2 < old_peak
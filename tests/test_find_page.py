@@ -0,0 +1,64 @@
+import pytest
+
+from datasources import codec
+from datasources.my_sql_datasource import MySQLDataSource
+
+
+@pytest.fixture
+def events(sqlite_connection):
+    rows = ', '.join(f"('2024-01-{day:02d}', {seq}, {(day * seq) % 4})" for day in range(1, 8) for seq in range(1, 9))
+    connection = sqlite_connection(
+        "CREATE TABLE events (day TEXT, seq INTEGER, score INTEGER, PRIMARY KEY (day, seq))",
+        f"INSERT INTO events (day, seq, score) VALUES {rows}",
+    )
+    return MySQLDataSource(connection)
+
+
+def walk(datasource, order_by, limit, condition=None):
+    pages, token = [], None
+    while True:
+        records, token = datasource.find_page('events', order_by, after=token, limit=limit, condition=condition)
+        pages.append([(record.day, record.seq, record.score) for record in records])
+        if token is None:
+            return pages
+
+
+@pytest.mark.parametrize('limit', [1, 7, 8, 100])
+def test_pages_cover_every_row_once(events, limit):
+    pages = walk(events, ['day', 'seq'], limit)
+    keys = [(day, seq) for page in pages for day, seq, _ in page]
+    assert keys == sorted((f"2024-01-{day:02d}", seq) for day in range(1, 8) for seq in range(1, 9))
+    assert all(len(page) <= limit for page in pages)
+
+
+def test_ties_are_broken_by_the_primary_key(events):
+    pages = walk(events, 'score', 5, condition="score < 3")
+    rows = [row for page in pages for row in page]
+    assert len(rows) == len(set(rows)) == events.count('events', "score < 3")
+    assert rows == sorted(rows, key=lambda row: (row[2], row[0], row[1]))
+
+
+def test_raw_keys_continue_a_walk(events):
+    records, _ = events.find_page('events', 'day', after=('2024-01-07', 6), limit=10)
+    assert [(record.day, record.seq) for record in records] == [('2024-01-07', 7), ('2024-01-07', 8)]
+
+
+def test_tampered_tokens_are_rejected(events):
+    _, token = events.find_page('events', ['day', 'seq'], limit=3)
+    payload = codec.decode_token(token)
+
+    tampered = [
+        'not a token!',
+        token[:len(token) // 2],
+        codec.encode_token({'order_by': ['seq', 'day'], 'after': payload['after']}),
+        codec.encode_token({'order_by': payload['order_by']}),
+        codec.encode_token({'order_by': payload['order_by'], 'after': ['2024-01-01']}),
+        codec.encode_token({'order_by': payload['order_by'], 'after': {'__type__': 'decimal', 'value': 'x'}}),
+        codec.encode_token(['day', 'seq']),
+    ]
+    for bad_token in tampered:
+        with pytest.raises(ValueError):
+            events.find_page('events', ['day', 'seq'], after=bad_token, limit=3)
+
+    with pytest.raises(ValueError):
+        events.find_page('events', 'score', after=token, limit=3)
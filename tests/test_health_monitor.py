@@ -0,0 +1,99 @@
+import threading
+import time
+
+from connections.connection import Connection
+from connections.health_monitor import HealthMonitor
+
+
+class ProbedConnection(Connection):
+    """
+    ProbedConnection is a Connection without a backend, whose health probe is scripted by the test.
+    """
+
+    def __init__(self, name, healthy=True, delay=0.0):
+        super().__init__(name, None, None, None, None)
+        self.healthy = healthy
+        self.delay = delay
+        self.probes = 0
+
+    def connect(self):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def probe_health(self):
+        self.probes += 1
+        time.sleep(self.delay)
+        return self.healthy
+
+    def create_connection_string(self):
+        return None
+
+
+def test_cached_status_is_used_while_fresh():
+    connection = ProbedConnection('db')
+    monitor = HealthMonitor(interval=60)
+    monitor.register(connection)
+    monitor.probe_all()
+
+    connection.healthy = False
+    assert connection.check_health()
+    assert connection.probes == 1
+
+
+def test_stopped_monitor_falls_back_to_live_probes():
+    connection = ProbedConnection('db')
+    monitor = HealthMonitor(interval=0.05)
+    monitor.register(connection)
+    with monitor:
+        while monitor.get_status('db') is None:
+            time.sleep(0.01)
+
+    connection.healthy = False
+    time.sleep(0.15)
+    assert not connection.check_health()
+
+
+def test_hung_probe_does_not_delay_the_others():
+    hung = ProbedConnection('hung', delay=1.0)
+    healthy = ProbedConnection('healthy')
+    monitor = HealthMonitor(interval=60, probe_timeout=0.2)
+    monitor.register(hung)
+    monitor.register(healthy)
+
+    start = time.perf_counter()
+    monitor.probe_all()
+    assert time.perf_counter() - start < 0.5
+    assert monitor.get_status('healthy').healthy
+    assert isinstance(monitor.get_status('hung').error, TimeoutError)
+
+    monitor.probe_all()
+    assert hung.probes == 1
+    assert monitor.get_status('hung').consecutive_failures == 2
+    monitor.stop()
+
+
+def test_unregister_during_a_probe_is_not_undone():
+    connection = ProbedConnection('db')
+    probing = threading.Event()
+    release = threading.Event()
+
+    def probe_health():
+        probing.set()
+        release.wait(1)
+        return True
+
+    connection.probe_health = probe_health
+    monitor = HealthMonitor(interval=60)
+    monitor.register(connection)
+
+    prober = threading.Thread(target=monitor.probe_all)
+    prober.start()
+    probing.wait(1)
+    monitor.unregister(connection)
+    release.set()
+    prober.join()
+
+    assert monitor.get_status('db') is None
+    monitor.stop()
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+# Driver modules importing the packages must not load: they're imported when a connection needs them.
+HEAVY_MODULES = ('sqlalchemy', 'redis', 'pymysql', 'pymongo')
+
+# The cumulative import time budget, in microseconds. Importing the packages takes a few milliseconds; importing
+# SQLAlchemy alone takes far more than the budget.
+IMPORT_TIME_BUDGET_US = 100_000
+
+
+def _import(module):
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Returns:
+    - A (loaded heavy modules, cumulative import time in microseconds) tuple.
+    """
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, capture_output=True,
+                            text=True, check=True)
+
+    cumulative = None
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.removeprefix('import time:').split('|')]
+        if len(fields) == 3 and fields[2] == module:
+            cumulative = int(fields[1])
+    assert cumulative is not None, result.stderr
+    return [name for name in result.stdout.strip().split(',') if name], cumulative
+
+
+@pytest.mark.parametrize('module', ['connections', 'datasources.redis_datasource'])
+def test_import_loads_no_driver(module):
+    loaded, _ = _import(module)
+    assert loaded == []
+
+
+@pytest.mark.parametrize('module', ['connections', 'datasources.redis_datasource'])
+def test_import_time_budget(module):
+    # The best of a few runs, so a busy machine doesn't fail the check.
+    cumulative = min(_import(module)[1] for _ in range(3))
+    assert cumulative < IMPORT_TIME_BUDGET_US, f"import {module} took {cumulative} us"
@@ -0,0 +1,32 @@
+import time
+
+from datasources.my_sql_datasource import MySQLDataSource
+
+ROWS = 500
+
+# insert_many sends one executemany INSERT per batch in one transaction, instead of one statement and one commit per
+# row, so it must be well ahead of a loop of inserts even on an in-process database.
+MIN_SPEEDUP = 5
+
+
+def _rows(first):
+    return [{'id': first + index, 'name': f"user{index}", 'score': index} for index in range(ROWS)]
+
+
+def test_insert_many_outpaces_per_row_inserts(sqlite_connection):
+    connection = sqlite_connection("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, score INTEGER)")
+    datasource = MySQLDataSource(connection)
+    datasource.insert('users', {'id': 0, 'name': 'warmup', 'score': 0})
+
+    start = time.perf_counter()
+    for row in _rows(1):
+        datasource.insert('users', row)
+    per_row = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert datasource.insert_many('users', _rows(ROWS + 1), batch_size=100) == ROWS
+    batched = time.perf_counter() - start
+
+    assert datasource.count('users') == 2 * ROWS + 1
+    print(f"insert: {ROWS / per_row:.0f} rows/s, insert_many: {ROWS / batched:.0f} rows/s")
+    assert per_row > MIN_SPEEDUP * batched, f"insert_many took {batched:.3f}s, per-row inserts {per_row:.3f}s"
@@ -0,0 +1,61 @@
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+TABLES = (
+    "CREATE TABLE owners (id INTEGER PRIMARY KEY, name TEXT)",
+    "CREATE TABLE cameras (id INTEGER PRIMARY KEY, owner_id INTEGER REFERENCES owners (id))",
+    "CREATE TABLE lenses (id INTEGER PRIMARY KEY, model TEXT)",
+)
+
+
+@pytest.fixture
+def connection(sqlite_connection, monkeypatch):
+    """Get a lazily reflecting connection counting the tables it reflects, with a slow reflection."""
+    connection = sqlite_connection(*TABLES, lazy_reflection=True)
+    connection.reflected = Counter()
+    reflect_model = connection._reflect_model
+
+    def counting_reflect_model(table_name, bind):
+        connection.reflected[table_name] += 1
+        time.sleep(0.05)
+        return reflect_model(table_name, bind)
+
+    monkeypatch.setattr(connection, '_reflect_model', counting_reflect_model)
+    return connection
+
+
+def test_tables_are_reflected_on_first_access_only(connection):
+    assert connection.reflected == {}
+    assert not connection._lazy_metadata.tables
+
+    model = connection.get_model('cameras')
+    assert model.__table__.name == 'cameras'
+    assert connection.get_model('cameras') is model
+    assert connection.reflected == {'cameras': 1}
+    # The foreign key target comes along, the unrelated table doesn't.
+    assert set(connection._lazy_metadata.tables) == {'cameras', 'owners'}
+
+    assert connection.get_model('missing') is None
+    assert connection.get_model('lenses') is not None
+    assert connection.reflected == {'cameras': 1, 'missing': 1, 'lenses': 1}
+
+
+def test_concurrent_first_access_reflects_once(connection):
+    barrier = threading.Barrier(8)
+    models = []
+
+    def access():
+        barrier.wait()
+        models.append(connection.get_model('lenses'))
+
+    threads = [threading.Thread(target=access) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert connection.reflected == {'lenses': 1}
+    assert len(models) == 8 and len(set(map(id, models))) == 1
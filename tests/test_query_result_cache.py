@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import event, text
+
+from datasources import query_result_cache
+from datasources.my_sql_datasource import MySQLDataSource
+
+
+class FakeClock:
+    """Stands in for the time module of datasources.query_result_cache."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(query_result_cache, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def datasource(sqlite_connection):
+    connection = sqlite_connection(
+        "CREATE TABLE owners (id INTEGER PRIMARY KEY, owner_id INTEGER, name TEXT)",
+        "CREATE TABLE cameras (id INTEGER PRIMARY KEY, owner_id INTEGER, model TEXT)",
+        "INSERT INTO owners (id, owner_id, name) VALUES (1, 1, 'ada'), (2, 2, 'bob')",
+        "INSERT INTO cameras (id, owner_id, model) VALUES (1, 1, 'Canon'), (2, 2, 'Nikon')",
+    )
+    datasource = MySQLDataSource(connection)
+    datasource.statements = []
+
+    @event.listens_for(connection.connection_engine, 'before_cursor_execute')
+    def record(conn, cursor, statement, parameters, context, executemany):
+        datasource.statements.append(statement)
+
+    return datasource
+
+
+def test_repeated_reads_are_served_from_the_cache(datasource, clock):
+    cache = datasource.enable_result_cache(ttl=60)
+
+    first = datasource.find_all('owners', "name = 'ada'")
+    executed = len(datasource.statements)
+    assert datasource.find_all('owners', "name = 'ada'") is first
+    assert datasource.count('owners') == 2
+    assert datasource.count('owners') == 2
+    assert len(datasource.statements) == executed + 1
+
+    assert first[0].name == 'ada'
+    assert datasource.find_all('owners', "name = 'bob'")[0].name == 'bob'
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (2, 3)
+
+
+def test_writes_invalidate_the_tables_they_write(datasource, clock):
+    cache = datasource.enable_result_cache(ttl=60)
+    assert [owner.name for owner in datasource.find_all('owners')] == ['ada', 'bob']
+    assert datasource.count('cameras') == 2
+    assert len(datasource.inner_join('cameras', 'owners', 'owner_id')) == 2
+
+    datasource.update('owners', 1, {'name': 'eve'})
+    assert cache.stats()['invalidations'] == 2
+    assert [owner.name for owner in datasource.find_all('owners')] == ['eve', 'bob']
+    assert [owner.name for _, owner in datasource.inner_join('cameras', 'owners', 'owner_id')] == ['eve', 'bob']
+
+    executed = len(datasource.statements)
+    assert datasource.count('cameras') == 2
+    assert len(datasource.statements) == executed
+
+
+def test_entries_expire_after_their_ttl(datasource, clock):
+    cache = datasource.enable_result_cache(ttl=60)
+    assert datasource.count('owners') == 2
+    # A write the datasource doesn't see, which only the TTL catches.
+    with datasource.connection_engine.begin() as connection:
+        connection.execute(text("INSERT INTO owners (id, owner_id, name) VALUES (3, 3, 'cy')"))
+
+    clock.now += 59
+    assert datasource.count('owners') == 2
+    clock.now += 1
+    assert datasource.count('owners') == 3
+    assert cache.stats()['expirations'] == 1
+
+
+def test_reads_in_a_transaction_bypass_the_cache(datasource, clock):
+    cache = datasource.enable_result_cache(ttl=60)
+    assert datasource.count('owners') == 2
+
+    with datasource.transaction():
+        datasource.insert('owners', {'id': 3, 'owner_id': 3, 'name': 'cy'})
+        assert datasource.count('owners') == 3
+    assert datasource.count('owners') == 3
+    assert cache.stats()['hits'] == 0
@@ -0,0 +1,22 @@
+from conftest import fake_redis_connection
+from datasources.redis_datasource import RedisDataSource
+from datasources.sharded_redis_datasource import ShardedRedisDataSource
+
+
+def test_set_operations_without_values_are_no_ops():
+    datasource = RedisDataSource(fake_redis_connection())
+    assert datasource.set_set_value('set') == 0
+    assert datasource.set_set_value('set', ttl=60) == 0
+    assert datasource.remove_set_value('set') == 0
+    assert not datasource.key_exists('set')
+
+    assert datasource.set_set_value('set', 'a', 'b', ttl=60) == 2
+    assert datasource.set_set_value('set', 'b') == 0
+    assert 0 < datasource.connection_engine.ttl('set') <= 60
+    assert datasource.get_set_values('set') == {b'a', b'b'}
+
+
+def test_sharded_set_operations_without_values_are_no_ops():
+    datasource = ShardedRedisDataSource([fake_redis_connection('shard0'), fake_redis_connection('shard1')])
+    assert datasource.set_set_value('set') == 0
+    assert datasource.remove_set_value('set') == 0
@@ -0,0 +1,70 @@
+import threading
+
+from sqlalchemy import Column, Integer, MetaData, Table
+
+from conftest import SQLiteConnection
+from connections.reflection_cache import ReflectionCache
+
+
+def _metadata():
+    metadata = MetaData()
+    Table('users', metadata, Column('id', Integer, primary_key=True))
+    return metadata
+
+
+class FingerprintedSQLiteConnection(SQLiteConnection):
+    """A SQLiteConnection with a fixed schema fingerprint, which enables the reflection cache."""
+
+    def _schema_fingerprint(self, connection):
+        return 'v1'
+
+
+def test_store_then_load_round_trips(tmp_path):
+    cache = ReflectionCache(str(tmp_path / 'cache'))
+    assert cache.store('primary db', 'v1', _metadata())
+
+    loaded = cache.load('primary db', 'v1')
+    assert list(loaded.tables) == ['users']
+    assert [path.name for path in (tmp_path / 'cache').iterdir()] == ['primary_db.reflection']
+
+
+def test_fingerprint_mismatch_is_a_miss(tmp_path):
+    cache = ReflectionCache(str(tmp_path))
+    cache.store('db', 'v1', _metadata())
+    assert cache.load('db', 'v2') is None
+    assert cache.load('other', 'v1') is None
+
+
+def test_corrupt_file_is_a_miss(tmp_path):
+    cache = ReflectionCache(str(tmp_path))
+    (tmp_path / 'db.reflection').write_bytes(b'\x80\x05not a pickle')
+    assert cache.load('db', 'v1') is None
+
+
+def test_unwritable_directory_is_ignored(tmp_path):
+    blocker = tmp_path / 'blocker'
+    blocker.write_text('a file, not a directory')
+    cache = ReflectionCache(str(blocker / 'cache'))
+    assert not cache.store('db', 'v1', _metadata())
+    assert cache.load('db', 'v1') is None
+
+
+def test_unpicklable_metadata_is_ignored(tmp_path):
+    cache = ReflectionCache(str(tmp_path))
+    assert not cache.store('db', 'v1', threading.Lock())
+    assert not cache.store('db', 'v1', lambda: None)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_connection_reflects_live_when_the_cache_is_unwritable(tmp_path, sqlite_connection):
+    path = sqlite_connection("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")._database
+    blocker = tmp_path / 'blocker'
+    blocker.write_text('a file, not a directory')
+
+    connection = FingerprintedSQLiteConnection('sqlite', None, None, path, None, None,
+                                               reflection_cache_directory=str(blocker / 'cache'))
+    connection.connect()
+    try:
+        assert connection.get_model('users') is not None
+    finally:
+        connection.disconnect()
@@ -0,0 +1,87 @@
+import sqlite3
+import threading
+from collections import Counter
+
+import pytest
+from sqlalchemy import text
+
+from connections import replica_router
+from connections.replica_router import ReplicaRouter
+
+NODE_TABLE = "CREATE TABLE node (id INTEGER PRIMARY KEY, name TEXT)"
+
+
+@pytest.fixture
+def replicated(sqlite_connection, tmp_path):
+    """
+    Get a factory of connections to a primary and two replicas. Each database file names its node, so a read tells
+    which node served it.
+    """
+    replicas = []
+    for name in ('replica1', 'replica2'):
+        path = str(tmp_path / f"{name}.sqlite")
+        with sqlite3.connect(path) as database:
+            database.execute(NODE_TABLE)
+            database.execute(f"INSERT INTO node (id, name) VALUES (1, '{name}')")
+        replicas.append((path, None))
+
+    def create(**kwargs):
+        return sqlite_connection(NODE_TABLE, "INSERT INTO node (id, name) VALUES (1, 'primary')", replicas=replicas,
+                                 **kwargs)
+
+    return create
+
+
+def read_node(session):
+    return session.execute(text("SELECT name FROM node")).scalar()
+
+
+def read(connection):
+    session = connection.get_new_session(read_only=True)
+    try:
+        return read_node(session)
+    finally:
+        session.close()
+
+
+def test_round_robin_alternates_between_replicas(replicated):
+    connection = replicated(read_routing=ReplicaRouter.ROUND_ROBIN)
+    nodes = [read(connection) for _ in range(6)]
+    assert nodes == ['replica1', 'replica2'] * 3
+
+
+def test_least_outstanding_avoids_busy_replicas(replicated):
+    connection = replicated(read_routing=ReplicaRouter.LEAST_OUTSTANDING)
+    assert Counter(read(connection) for _ in range(6)) == {'replica1': 3, 'replica2': 3}
+
+    # A session that has run a query holds its pool connection until it's closed.
+    busy = connection.get_new_session(read_only=True)
+    busy_node = read_node(busy)
+    try:
+        assert {read(connection) for _ in range(4)} == {'replica1', 'replica2'} - {busy_node}
+    finally:
+        busy.close()
+
+
+def test_reads_after_a_write_go_to_the_primary(replicated, monkeypatch):
+    connection = replicated(read_your_writes=5)
+    assert read(connection) != 'primary'
+
+    connection.get_new_session().close()
+    assert read(connection) == 'primary'
+
+    # The window belongs to the writing thread only.
+    other_thread_nodes = []
+    thread = threading.Thread(target=lambda: other_thread_nodes.append(read(connection)))
+    thread.start()
+    thread.join()
+    assert other_thread_nodes != ['primary']
+
+    now = replica_router.time.monotonic()
+    monkeypatch.setattr(replica_router.time, 'monotonic', lambda: now + 5)
+    assert read(connection) != 'primary'
+
+
+def test_reads_go_to_the_primary_without_replicas(sqlite_connection):
+    connection = sqlite_connection(NODE_TABLE, "INSERT INTO node (id, name) VALUES (1, 'primary')")
+    assert read(connection) == 'primary'
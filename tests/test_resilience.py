@@ -0,0 +1,178 @@
+import pytest
+
+from connections import resilience
+from connections.exceptions.connection import CircuitBreakerOpen
+from connections.resilience import CircuitBreaker, ResiliencePolicy, RetryPolicy, resilient
+
+
+class Transient(Exception):
+    pass
+
+
+class FakeClock:
+    """Stands in for the time module of connections.resilience: sleeping advances the monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class Flaky:
+    """A callable failing transiently a fixed number of times, then returning 'ok'."""
+
+    def __init__(self, failures, error=Transient):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error()
+        return 'ok'
+
+
+def is_transient(error):
+    return isinstance(error, Transient)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resilience, 'time', clock)
+    return clock
+
+
+def test_transient_errors_are_retried_until_success(clock):
+    policy = ResiliencePolicy(RetryPolicy(max_attempts=3))
+    operation = Flaky(2)
+    assert policy.execute(operation, is_transient, idempotent=True) == 'ok'
+    assert operation.calls == 3
+    assert len(clock.sleeps) == 2
+
+
+def test_retries_stop_after_max_attempts(clock):
+    policy = ResiliencePolicy(RetryPolicy(max_attempts=3))
+    operation = Flaky(5)
+    with pytest.raises(Transient):
+        policy.execute(operation, is_transient, idempotent=True)
+    assert operation.calls == 3
+    assert len(clock.sleeps) == 2
+
+
+@pytest.mark.parametrize('operation, idempotent', [(Flaky(1), False), (Flaky(1, ValueError), True)])
+def test_non_idempotent_operations_and_permanent_errors_are_not_retried(clock, operation, idempotent):
+    policy = ResiliencePolicy(RetryPolicy(max_attempts=5))
+    with pytest.raises(Exception):
+        policy.execute(operation, is_transient, idempotent=idempotent)
+    assert operation.calls == 1
+    assert clock.sleeps == []
+
+
+def test_backoff_is_jittered_under_an_exponential_bound(monkeypatch):
+    retry_policy = RetryPolicy(base_delay=0.1, max_delay=1.0, multiplier=2.0)
+    bounds = {1: 0.1, 2: 0.2, 3: 0.4, 4: 0.8, 5: 1.0, 10: 1.0}
+
+    for attempt, bound in bounds.items():
+        delays = [retry_policy.backoff(attempt) for _ in range(200)]
+        assert all(0 <= delay <= bound for delay in delays)
+        assert len(set(delays)) > 1
+
+    monkeypatch.setattr(resilience.random, 'uniform', lambda low, high: (low, high))
+    assert {attempt: retry_policy.backoff(attempt) for attempt in bounds} == \
+        {attempt: (0, pytest.approx(bound)) for attempt, bound in bounds.items()}
+
+
+def test_breaker_opens_half_opens_and_closes(clock):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30, half_open_max_calls=1)
+    policy = ResiliencePolicy(circuit_breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(Transient):
+            policy.execute(Flaky(1), is_transient, idempotent=True)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    operation = Flaky(0)
+    with pytest.raises(CircuitBreakerOpen):
+        policy.execute(operation, is_transient, idempotent=True)
+    assert operation.calls == 0
+
+    clock.now += 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(CircuitBreakerOpen):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now += 30
+    assert policy.execute(operation, is_transient, idempotent=True) == 'ok'
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_permanent_error_releases_the_half_open_slot(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+    policy = ResiliencePolicy(circuit_breaker=breaker)
+    with pytest.raises(Transient):
+        policy.execute(Flaky(1), is_transient, idempotent=True)
+
+    clock.now += 30
+    with pytest.raises(ValueError):
+        policy.execute(Flaky(1, ValueError), is_transient, idempotent=True)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert policy.execute(Flaky(0), is_transient, idempotent=True) == 'ok'
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+class FakeConnection:
+    def __init__(self, policy, in_transaction=False):
+        self.resilience_policy = policy
+        self.in_transaction = in_transaction
+
+
+class FakeDataSource:
+    def __init__(self, connection):
+        self._connection = connection
+        self.reads = Flaky(2)
+        self.writes = Flaky(2)
+
+    def _is_transient_error(self, error):
+        return is_transient(error)
+
+    @resilient(idempotent=True)
+    def read(self):
+        return self.reads()
+
+    @resilient(idempotent=False)
+    def write(self):
+        return self.writes()
+
+
+def test_resilient_methods_retry_only_idempotent_calls_outside_transactions(clock):
+    policy = ResiliencePolicy(RetryPolicy(max_attempts=3))
+
+    datasource = FakeDataSource(FakeConnection(policy))
+    assert datasource.read() == 'ok'
+    assert datasource.reads.calls == 3
+    with pytest.raises(Transient):
+        datasource.write()
+    assert datasource.writes.calls == 1
+
+    in_transaction = FakeDataSource(FakeConnection(policy, in_transaction=True))
+    with pytest.raises(Transient):
+        in_transaction.read()
+    assert in_transaction.reads.calls == 1
+
+
+def test_resilient_methods_without_a_policy_call_through(clock):
+    datasource = FakeDataSource(FakeConnection(None))
+    with pytest.raises(Transient):
+        datasource.read()
+    assert datasource.reads.calls == 1
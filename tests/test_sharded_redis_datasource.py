@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from conftest import fake_redis_connection
+from datasources.sharded_redis_datasource import ShardedRedisDataSource
+
+fakeredis = pytest.importorskip('fakeredis')
+
+
+def shard_connections(count, first=0):
+    return [fake_redis_connection(f"shard{index}", fakeredis.FakeServer()) for index in range(first, first + count)]
+
+
+def shard_name(datasource, key):
+    shard = datasource.shard_for(key)
+    return next(name for name, candidate in datasource.shards.items() if candidate is shard)
+
+
+def test_keys_live_on_their_shard():
+    datasource = ShardedRedisDataSource(shard_connections(3))
+
+    for index in range(30):
+        key = f"key{index}"
+        datasource.set_key(key, index)
+        assert [name for name, shard in datasource.shards.items() if shard.key_exists(key)] == \
+            [shard_name(datasource, key)]
+        assert datasource.get_key(key) == str(index).encode()
+
+
+def test_multi_key_operations_split_and_merge_in_order():
+    datasource = ShardedRedisDataSource(shard_connections(4))
+    mapping = {f"key{index}": index for index in range(200)}
+    assert datasource.set_keys(mapping)
+    assert {shard_name(datasource, key) for key in mapping} == set(datasource.shards)
+
+    keys = list(mapping) + ['missing']
+    random.Random(7).shuffle(keys)
+    assert datasource.get_keys(keys) == [None if key == 'missing' else str(mapping[key]).encode() for key in keys]
+    assert datasource.delete_keys(keys) == 200
+    assert datasource.get_keys(list(mapping)[:5]) == [None] * 5
+
+
+def test_adding_a_shard_remaps_a_fair_share_of_the_keys():
+    datasource = ShardedRedisDataSource(shard_connections(4))
+    keys = [f"key{index}" for index in range(10000)]
+    before = {key: shard_name(datasource, key) for key in keys}
+
+    datasource.add_shard(shard_connections(1, first=4)[0])
+    after = {key: shard_name(datasource, key) for key in keys}
+
+    remapped = [key for key in keys if before[key] != after[key]]
+    assert 0.12 < len(remapped) / len(keys) < 0.3
+    assert {after[key] for key in remapped} == {'shard4'}
+
+
+def test_thread_pool_follows_the_number_of_shards():
+    datasource = ShardedRedisDataSource(shard_connections(2))
+    keys = [f"key{index}" for index in range(50)]
+    datasource.get_keys(keys)
+    assert datasource._executor._max_workers == 2
+
+    datasource.add_shard(shard_connections(1, first=2)[0])
+    assert datasource.get_keys(keys) == [None] * 50
+    assert datasource._executor._max_workers == 3
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import exc
+
+from datasources.my_sql_datasource import MySQLDataSource
+from datasources.postgres_sql_datasource import PostgreSQLDataSource
+
+
+class Rollback(Exception):
+    pass
+
+
+@pytest.fixture
+def connection(sqlite_connection):
+    return sqlite_connection(
+        "CREATE TABLE accounts (id INTEGER PRIMARY KEY, owner TEXT NOT NULL, balance INTEGER)",
+        "INSERT INTO accounts (id, owner, balance) VALUES (1, 'ada', 100), (2, 'bob', 50)",
+    )
+
+
+@pytest.mark.parametrize('datasource_class', [MySQLDataSource, PostgreSQLDataSource])
+def test_raw_query_joins_the_transaction_scope(connection, datasource_class):
+    datasource = datasource_class(connection)
+
+    with pytest.raises(Rollback):
+        with datasource.transaction():
+            datasource.query("UPDATE accounts SET balance = 0 WHERE id = 1")
+            assert datasource.query("SELECT balance FROM accounts WHERE id = 1") is not None
+            raise Rollback()
+    assert datasource.find_by_id('accounts', 1).balance == 100
+
+
+def test_raw_query_commits_outside_a_scope(connection):
+    datasource = PostgreSQLDataSource(connection)
+    assert datasource.query("UPDATE accounts SET balance = 0 WHERE id = 1") is None
+    assert datasource.query("SELECT balance FROM accounts WHERE id = 1") == [(0,)]
+
+
+def test_prefetched_export_reads_inside_the_scope(connection, tmp_path):
+    pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+    datasource = MySQLDataSource(connection)
+    path = str(tmp_path / 'accounts.parquet')
+
+    with pytest.raises(Rollback):
+        with datasource.transaction():
+            datasource.insert('accounts', {'id': 3, 'owner': 'eve', 'balance': 10})
+            assert datasource.export_parquet('accounts', path, batch_rows=1, prefetch=2) == 3
+            raise Rollback()
+
+    assert pyarrow_parquet.read_table(path).column('owner').to_pylist() == ['ada', 'bob', 'eve']
+    assert datasource.count('accounts') == 2
+
+
+def test_writes_are_flushed_by_the_call_making_them(connection):
+    datasource = MySQLDataSource(connection)
+
+    with datasource.transaction():
+        datasource.update('accounts', 1, {'balance': 0})
+        datasource.remove('accounts', 2)
+        assert datasource.query("SELECT id, balance FROM accounts").fetchall() == [(1, 0)]
+
+        with pytest.raises(exc.IntegrityError):
+            with datasource.transaction():
+                datasource.update('accounts', 1, {'owner': None})
+
+    assert datasource.find_by_id('accounts', 1).balance == 0
+    assert not datasource.exists('accounts', 2)
@@ -0,0 +1,29 @@
+from sqlalchemy import event
+
+from datasources.filters import field
+from datasources.my_sql_datasource import MySQLDataSource
+
+
+class LimitedDataSource(MySQLDataSource):
+    _MAX_BIND_PARAMETERS = 8
+    _SUPPORTS_TUPLE_IN = False
+
+
+def test_chunked_writes_respect_the_bind_parameter_limit(sqlite_connection):
+    connection = sqlite_connection(
+        "CREATE TABLE readings (sensor INTEGER, taken INTEGER, value INTEGER, PRIMARY KEY (sensor, taken))",
+        "INSERT INTO readings (sensor, taken, value) VALUES "
+        + ', '.join(f"({sensor}, {taken}, 0)" for sensor in range(3) for taken in range(10)),
+    )
+    datasource = LimitedDataSource(connection)
+    parameter_counts = []
+
+    @event.listens_for(connection.connection_engine, 'before_cursor_execute')
+    def count_parameters(conn, cursor, statement, parameters, context, executemany):
+        parameter_counts.append(len(parameters))
+
+    assert datasource.update_where('readings', field('taken') >= 2, {'value': 1}, chunk_size=100) == 24
+    assert datasource.remove_where('readings', field('value') == 1, chunk_size=100) == 24
+    assert datasource.count('readings') == 6
+    # The UPDATE statements also bind their SET value.
+    assert max(parameter_counts) <= LimitedDataSource._MAX_BIND_PARAMETERS + 1